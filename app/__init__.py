@@ -1,23 +1,46 @@
 from flask import Flask
-from flask_login import LoginManager, current_user
+from flask_login import LoginManager
 from flask_principal import Principal
 from flask_sqlalchemy import SQLAlchemy
 
-from config import ConfigDevelopment
+from config import obtener_configuracion
 
-# from app.vehiculo_tipo_routes import VehiculoTipoRoutes
-# instancia = VehiculoTipoRoutes()
-# app.register_blueprint(instancia.blueprint, url_prefix='/api')
+db = SQLAlchemy()
 
-app = Flask(__name__)
-app.config.from_object(ConfigDevelopment)
+login = LoginManager()
+login.login_view = 'login'
+principal = Principal()
 
-db = SQLAlchemy(app)
 
-login = LoginManager(app)
-login.login_view = 'login'
-principal = Principal(app)
+def create_app(configuracion=None):
+    """
+    Construye y configura una instancia de la aplicación.
+
+    Importar el paquete solo crea las extensiones; las rutas y los comandos se registran aquí.
+    Las dependencias pesadas que solo usan los tickets (ReportLab, qrcode) se importan la primera
+    vez que se genera uno.
+
+    :param configuracion: Clase de configuración; por defecto, la indicada por `APP_CONFIG`.
+    :return: Aplicación de Flask.
+    """
+    app = Flask(__name__)
+    app.config.from_object(configuracion or obtener_configuracion())
+
+    db.init_app(app)
+
+    from app.util.base_datos import configurar_pragmas_sqlite
+
+    with app.app_context():
+        configurar_pragmas_sqlite(db.engine, app.config['SQLITE_PRAGMAS'])
+
+    login.init_app(app)
+    principal.init_app(app)
+
+    from app import models
+    from app.routes import registrar_rutas
+    from app.comandos import registrar_comandos
 
-from app import models
+    registrar_rutas(app)
+    registrar_comandos(app)
 
-from app import routes
+    return app
@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta
+
+from flask import Blueprint, jsonify, request
+from flask_login import current_user, login_required
+
+from app.models import MedioPago, Modulo, Periodicidad, Sede
+
+from app import db
+from app.routes import propietario_admin_permission
+from app.util.analitica import ingresos, leer_rango, ocupacion, rotacion_modulos
+from app.util.catalogos import catalogos
+from app.util.pronosticos import leer_horizonte, pronostico_vencimientos
+
+
+class AnaliticaRoutes:
+    """
+    Clase que gestiona las rutas de analítica del dashboard.
+    """
+    def __init__(self):
+        """
+        Constructor de la clase.
+        """
+        self.blueprint = Blueprint('analitica', __name__)
+        self.add_routes()
+
+    def add_routes(self):
+        def leer_periodo():
+            """
+            Lee el rango de fechas y la sede de la petición.
+
+            :return: Tupla con el periodo (inicio, fin exclusivo y sede) y una respuesta de error (o None).
+            """
+            try:
+                return leer_rango(request.args), None
+            except ValueError as e:
+                return None, (jsonify({'status': 'error', 'message': f'Rango de fechas inválido: {e}'}), 400)
+
+        def nombres_sedes():
+            """
+            Recupera los nombres de las sedes del parqueadero del usuario.
+
+            :return: Diccionario con el nombre de cada sede por su id.
+            """
+            return {
+                sede['id']: sede['nombre']
+                for sede in catalogos.obtener(Sede)
+                if sede['parqueadero_id'] == current_user.parqueadero_id
+            }
+
+
+        def datos_ingresos(periodo):
+            """
+            Construye la respuesta de ingresos con los nombres de las sedes y los medios de pago.
+
+            :param periodo: Tupla con el inicio, el fin exclusivo y la sede.
+            :return: Diccionario con los ingresos del rango.
+            """
+            resultado = ingresos(current_user.parqueadero_id, *periodo)
+            sedes = nombres_sedes()
+            medios_pago = {medio['id']: medio['nombre'] for medio in catalogos.obtener(MedioPago)}
+
+            return {
+                'total': resultado['total'],
+                'parqueos': resultado['parqueos'],
+                'porDia': resultado['porDia'],
+                'porSede': [
+                    {'id': sede_id, 'nombre': sedes.get(sede_id, str(sede_id)), 'total': total}
+                    for sede_id, total in sorted(resultado['porSede'].items())
+                ],
+                'porMedioPago': [
+                    {'id': medio_id or None, 'nombre': medios_pago.get(medio_id, 'Sin registrar'), 'total': total}
+                    for medio_id, total in sorted(resultado['porMedioPago'].items())
+                ],
+            }
+
+        def datos_ocupacion(periodo):
+            """
+            Construye la respuesta de ocupación por hora junto con la capacidad de las sedes.
+
+            :param periodo: Tupla con el inicio, el fin exclusivo y la sede.
+            :return: Diccionario con la ocupación del rango.
+            """
+            capacidad = (
+                db.session.query(db.func.count(Modulo.id))
+                .join(Sede, Modulo.sede_id == Sede.id)
+                .filter(Sede.parqueadero_id == current_user.parqueadero_id, Modulo.habilitado == True)
+            )
+            sede_id = periodo[2]
+            if sede_id is not None:
+                capacidad = capacidad.filter(Modulo.sede_id == sede_id)
+            capacidad = capacidad.scalar()
+
+            resultado = ocupacion(current_user.parqueadero_id, *periodo)
+
+            return {
+                'capacidad': capacidad,
+                'promedioPorHora': resultado['promedioPorHora'],
+                'picoPorHora': resultado['picoPorHora'],
+                'porcentajePorHora': [
+                    round(valor * 100 / capacidad, 1) if capacidad else 0 for valor in resultado['promedioPorHora']
+                ],
+            }
+
+        def datos_modulos(periodo):
+            """
+            Construye la respuesta de rotación por módulo con los nombres de módulos y sedes.
+
+            :param periodo: Tupla con el inicio, el fin exclusivo y la sede.
+            :return: Diccionario con la rotación y la estancia promedio.
+            """
+            resultado = rotacion_modulos(current_user.parqueadero_id, *periodo)
+            sedes = nombres_sedes()
+            modulos = {
+                modulo_id: (nombre, sede_id)
+                for modulo_id, nombre, sede_id in (
+                    db.session.query(Modulo.id, Modulo.nombre, Modulo.sede_id)
+                    .join(Sede, Modulo.sede_id == Sede.id)
+                    .filter(Sede.parqueadero_id == current_user.parqueadero_id)
+                    .all()
+                )
+            }
+
+            por_modulo = []
+            for modulo_id, metricas in sorted(resultado['porModulo'].items()):
+                nombre, sede_id = modulos.get(modulo_id, (str(modulo_id), None))
+                por_modulo.append({
+                    'id': modulo_id,
+                    'nombre': nombre,
+                    'sede': sedes.get(sede_id, ''),
+                    **metricas
+                })
+
+            return {
+                'estanciaPromedioMinutos': resultado['estanciaPromedioMinutos'],
+                'porModulo': por_modulo,
+            }
+
+
+        @self.blueprint.route('/analitica/resumen', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def analitica_resumen():
+            """
+            Calcula todas las métricas del dashboard a partir de los resúmenes de parqueos.
+
+            :return: Respuesta JSON.
+            """
+            periodo, error = leer_periodo()
+            if error:
+                return error
+
+            return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': {
+                'ingresos': datos_ingresos(periodo),
+                'ocupacion': datos_ocupacion(periodo),
+                'modulos': datos_modulos(periodo),
+            }}), 200
+
+
+        @self.blueprint.route('/analitica/ingresos', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def analitica_ingresos():
+            """
+            Calcula los ingresos del rango por día, por sede y por medio de pago.
+
+            :return: Respuesta JSON.
+            """
+            periodo, error = leer_periodo()
+            if error:
+                return error
+
+            return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': datos_ingresos(periodo)}), 200
+
+
+        @self.blueprint.route('/analitica/ocupacion', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def analitica_ocupacion():
+            """
+            Calcula los vehículos parqueados en promedio y en el pico de cada hora del día.
+
+            :return: Respuesta JSON.
+            """
+            periodo, error = leer_periodo()
+            if error:
+                return error
+
+            return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': datos_ocupacion(periodo)}), 200
+
+
+        @self.blueprint.route('/analitica/modulos', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def analitica_modulos():
+            """
+            Calcula la rotación diaria y la estancia promedio por módulo.
+
+            :return: Respuesta JSON.
+            """
+            periodo, error = leer_periodo()
+            if error:
+                return error
+
+            return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': datos_modulos(periodo)}), 200
+
+
+        @self.blueprint.route('/analitica/vencimientos', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def analitica_vencimientos():
+            """
+            Pronostica por día cuántos arrendamientos vencen y cuántas pausas terminan, por sede y periodicidad.
+
+            :return: Respuesta JSON.
+            """
+            try:
+                dias, sede_id = leer_horizonte(request.args)
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
+
+            hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            grupos = pronostico_vencimientos.pronosticar(current_user.parqueadero_id, hoy, dias, sede_id)
+            sedes = nombres_sedes()
+            periodicidades = {periodicidad['id']: periodicidad['nombre'] for periodicidad in catalogos.obtener(Periodicidad)}
+
+            return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': {
+                'fechas': [(hoy + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(dias)],
+                'vencen': [sum(valores) for valores in zip(*[grupo['vencen'] for grupo in grupos])] or [0] * dias,
+                'grupos': [
+                    {
+                        **grupo,
+                        'sede': sedes.get(grupo['sedeId'], 'Sin sede'),
+                        'periodicidad': periodicidades.get(grupo['periodicidadId'], str(grupo['periodicidadId'])),
+                        'total': sum(grupo['vencen'])
+                    }
+                    for grupo in grupos
+                ],
+            }}), 200
@@ -1,7 +1,8 @@
+import math
+
 from flask import Blueprint, g, jsonify, render_template, request, current_app, redirect, url_for, flash
 from flask_login import current_user, login_required, login_user, logout_user
 from flask_principal import Identity, AnonymousIdentity
-from werkzeug.security import generate_password_hash
 
 from app.forms import CambiarClaveForm, UsuarioForm
 from app.models import Pais, Rol, Usuario
@@ -9,6 +10,9 @@ from app.models import Pais, Rol, Usuario
 from app import db
 from app.routes import identity_changed, propietario_admin_permission, propietario_permission, todos_permiso
 from app.routes import tiene_rol
+from app.util.autenticacion import generar_hash, limitador_intentos, necesita_rehash
+from app.util.catalogos import catalogos
+from app.util.sesiones import cache_usuarios
 from app.util.roles_enum import Roles
 
 
@@ -32,7 +36,7 @@ class AuthRoutes:
             """
             g.template_name = 'base.html'
             
-            paises = Pais.query.all()
+            paises = catalogos.obtener(Pais)
             return render_template('registro.html', titulo='Registro', paises=paises)
 
 
@@ -46,7 +50,7 @@ class AuthRoutes:
             try:
                 data = request.get_json()
 
-                hashed_password = generate_password_hash(data.get('password'), method='pbkdf2:sha256')
+                hashed_password = generar_hash(data.get('password'))
 
                 entidad = Usuario(
                     documento=data.get('documento'),
@@ -100,11 +104,25 @@ class AuthRoutes:
             data = request.get_json()
             email = data.get('email')
 
+            espera = limitador_intentos.espera(request.remote_addr, email)
+            if espera:
+                respuesta = jsonify({"success": False, "message": "Demasiados intentos fallidos. Intente de nuevo más tarde."})
+                respuesta.headers['Retry-After'] = str(math.ceil(espera))
+                return respuesta, 429
+
             usuario = Usuario.query.filter_by(email=email).first()
 
             if usuario is None or not usuario.check_password(data.get('password')) or not usuario.activo:
+                limitador_intentos.registrar_fallo(request.remote_addr, email)
                 return jsonify({"success": False, "message": "Credenciales inválidas"}), 401
 
+            limitador_intentos.limpiar(email)
+
+            if necesita_rehash(usuario.password):
+                usuario.set_password(data.get('password'))
+                db.session.commit()
+                cache_usuarios.invalidar(usuario.id)
+
             login_user(usuario)
             identity_changed.send(current_app._get_current_object(), identity=Identity(usuario.id))
 
@@ -142,7 +160,7 @@ class AuthRoutes:
             """
             g.template_name = 'base.html'
             
-            entidades = Rol.query.all()
+            entidades = catalogos.obtener(Rol)
             return render_template('rol.html', titulo='Roles', entidades=entidades)
 
         @self.blueprint.route('/perfil', methods=['GET', 'POST'])
@@ -166,6 +184,7 @@ class AuthRoutes:
                 current_user.telefono = form.telefono.data
 
                 db.session.commit()
+                cache_usuarios.invalidar(current_user.id)
                 flash('Perfil actualizado correctamente.', 'perfil-success')
                 return redirect(url_for('auth.perfil'))
 
@@ -177,6 +196,7 @@ class AuthRoutes:
                 else:
                     current_user.set_password(cambiar_clave_form.clave_nueva.data)
                     db.session.commit()
+                    cache_usuarios.invalidar(current_user.id)
                     flash('Contraseña cambiada correctamente.', 'cambio-clave-success')
                     return redirect(url_for('auth.perfil'))
 
@@ -6,6 +6,11 @@ from app.models import Cliente, Vehiculo, VehiculoTipo
 from app import db
 from app.routes import propietario_admin_permission
 from app.routes import todos_permiso
+from app.util.catalogos import catalogos
+from app.util.paginacion import paginar
+from app.util.placas import indice_placas
+from app.util.puntos import redimir_puntos, saldo_puntos
+from app.util.utilitarios import normalizar_placa
 
 
 class ClienteRoutes:
@@ -28,10 +33,41 @@ class ClienteRoutes:
             Muestra la lista de tipos de tarifa.
             """
             g.template_name = 'base.html'
-            entidades = Cliente.query.all()
-            vehiculos_tipos = VehiculoTipo.query.all()
+            vehiculos_tipos = catalogos.obtener(VehiculoTipo)
 
-            return render_template('cliente.html', titulo='Clientes', entidades=entidades, vehiculos_tipos=vehiculos_tipos)
+            return render_template('cliente.html', titulo='Clientes', vehiculos_tipos=vehiculos_tipos)
+
+
+        @self.blueprint.route("/cliente/datos", methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def cliente_datos():
+            """
+            Recupera una página de los clientes del parqueadero del usuario con el protocolo de DataTables.
+
+            :return: Respuesta JSON.
+            """
+            consulta = Cliente.query.filter_by(parqueadero_id=current_user.parqueadero_id)
+            columnas = [
+                Cliente.documento,
+                Cliente.nombres + ' ' + Cliente.apellidos,
+                Cliente.telefono,
+                Cliente.email,
+                Cliente.direccion,
+                None,
+                None,
+                None
+            ]
+
+            return jsonify(paginar(consulta, Cliente.id, columnas, request.args, lambda e: [
+                e.documento,
+                f'{e.nombres} {e.apellidos}',
+                e.telefono,
+                e.email,
+                e.direccion,
+                e.activo,
+                '<span class="badge badge-success">Sí</span>' if e.activo else '<span class="badge badge-warning">No</span>'
+            ])), 200
 
 
         @self.blueprint.route('/cliente', methods=['POST'])
@@ -61,11 +97,13 @@ class ClienteRoutes:
                 db.session.commit()
 
                 if data.get('placa') is not None:
-                    vehiculo = Vehiculo.query.filter_by(placa=data.get('placa')).first()
+                    vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(data.get('placa'))).first()
                     print('id cliente', entidad.id)
                     vehiculo.cliente_id = entidad.id
                     db.session.commit()
 
+                    indice_placas.agregar(entidad.parqueadero_id, vehiculo)
+
                 return jsonify({'status': 'success', 'message': 'Cliente creado', 'data': {
                     'id': entidad.id,
                     'documento': entidad.documento,
@@ -164,21 +202,57 @@ class ClienteRoutes:
 
             :return: Respuesta JSON.
             """
-            cliente = Cliente.query.filter_by(documento=documento).first()
-            puntos = cliente.puntos
+            resultado = saldo_puntos(documento)
+            if resultado is None:
+                return jsonify({'status': 'error', 'message': 'Cliente no encontrado'}), 404
 
-            total_puntos = sum([punto.cantidad for punto in puntos])
-            
             puntos = {
                 'data': {
                     'documento': documento,
-                    'puntos': total_puntos,
+                    'puntos': resultado[1],
                 },
                 'status': 'success',
             }
 
             return jsonify(puntos)
 
+        @self.blueprint.route('/cliente/<string:documento>/puntos/redimir', methods=['POST'])
+        @login_required
+        @todos_permiso.require(http_exception=403)
+        def redimir_cliente_puntos(documento):
+            """
+            Redime puntos de un cliente y los descuenta de su saldo.
+
+            :param documento: Documento del cliente.
+
+            :return: Respuesta JSON con el saldo restante.
+            """
+            cantidad = (request.get_json() or {}).get('cantidad')
+            if isinstance(cantidad, bool) or not isinstance(cantidad, int) or cantidad <= 0:
+                return jsonify({'status': 'error', 'message': 'La cantidad debe ser un número de puntos mayor que cero'}), 400
+
+            resultado = saldo_puntos(documento)
+            if resultado is None:
+                return jsonify({'status': 'error', 'message': 'Cliente no encontrado'}), 404
+
+            try:
+                redencion = redimir_puntos(resultado[0], cantidad)
+                if redencion is None:
+                    db.session.rollback()
+                    return jsonify({'status': 'warning', 'message': 'El cliente no tiene puntos suficientes'}), 200
+
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return jsonify({'status': 'error', 'message': str(e)}), 500
+
+            return jsonify({'status': 'success', 'message': 'Puntos redimidos', 'data': {
+                'id': redencion.id,
+                'documento': documento,
+                'cantidad': cantidad,
+                'puntos': saldo_puntos(documento)[1]
+            }}), 200
+
         @self.blueprint.route('/cliente/activar-desactivar/<documento>', methods=['PUT'])
         @login_required
         @propietario_admin_permission.require(http_exception=403)
@@ -1,12 +1,16 @@
 from datetime import datetime, timedelta
 
 from flask import Blueprint, jsonify, request
-from flask_login import login_required
+from flask_login import current_user, login_required
 
-from app.models import Arrendamiento
+from app.models import Arrendamiento, Modulo, Parqueo, Sede, Vehiculo
 
 from app import db
-from app.routes import todos_permiso
+from app.routes import propietario_admin_permission, todos_permiso
+from app.util.arrendamientos import estado_arrendamientos
+from app.util.eventos import bus_eventos
+from app.util.pronosticos import pronostico_vencimientos
+from app.util.renovaciones import ACCIONES, ampliar, condiciones, contar, leer_seleccion, pausar, renovar
 
 
 class ClienteVehiculoArrendamientoRoutes:
@@ -59,6 +63,9 @@ class ClienteVehiculoArrendamientoRoutes:
                 db.session.add(entidad)
                 db.session.commit()
 
+                estado_arrendamientos.registrar(entidad)
+                pronostico_vencimientos.invalidar(current_user.parqueadero_id)
+
                 return jsonify({'status': 'success', 'message': 'Arrendamiento creado', 'data': {
                     'id': entidad.id,
                     'vehiculoId': entidad.vehiculo_id,
@@ -121,6 +128,9 @@ class ClienteVehiculoArrendamientoRoutes:
 
                 db.session.commit()
 
+                estado_arrendamientos.registrar(entidad)
+                pronostico_vencimientos.invalidar(current_user.parqueadero_id)
+
                 return jsonify({'status': 'success', 'message': 'Arrendamiento actualizado', 'data': {
                     'id': entidad.id,
                     'vehiculoId': entidad.vehiculo_id,
@@ -162,6 +172,9 @@ class ClienteVehiculoArrendamientoRoutes:
                 db.session.delete(entidad)
                 db.session.commit()
 
+                estado_arrendamientos.eliminar(id)
+                pronostico_vencimientos.invalidar(current_user.parqueadero_id)
+
                 return jsonify({'status': 'success', 'message': 'Arrendamiento eliminado'}), 200
 
             except Exception as e:
@@ -194,4 +207,110 @@ class ClienteVehiculoArrendamientoRoutes:
 
             db.session.commit()
 
+            estado_arrendamientos.registrar(arrendamiento)
+            pronostico_vencimientos.invalidar(current_user.parqueadero_id)
+            publicar_pausa(arrendamiento)
+
             return jsonify({'status': 'success', 'message': 'Estado de pausa cambiado exitosamente'}), 200
+
+        @self.blueprint.route('/cliente/vehiculo/arrendamiento/lote/<accion>', methods=['POST'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def arrendamientos_lote(accion):
+            """
+            Renueva, amplía o pausa en una sola operación los arrendamientos del parqueadero que cumplen unos criterios.
+
+            :param accion: `renovar`, `ampliar` o `pausar`.
+            :return: Respuesta JSON con la cantidad de arrendamientos seleccionados, actualizados y omitidos.
+            """
+            if accion not in ACCIONES:
+                return jsonify({'status': 'error', 'message': 'Acción no válida'}), 404
+
+            data = request.get_json() or {}
+
+            try:
+                filtros = condiciones(current_user.parqueadero_id, **leer_seleccion(data))
+            except (KeyError, TypeError, ValueError) as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 400
+
+            tiempo_pausa = data.get('tiempoPausa')
+            if accion == 'pausar' and (isinstance(tiempo_pausa, bool) or not isinstance(tiempo_pausa, int) or tiempo_pausa <= 0):
+                return jsonify({'status': 'error', 'message': 'tiempoPausa debe ser un número de días mayor que cero'}), 400
+
+            try:
+                seleccionados = contar(filtros)
+
+                if accion == 'renovar':
+                    filas = renovar(filtros, datetime.now())
+                elif accion == 'ampliar':
+                    filas = ampliar(filtros)
+                else:
+                    filas = pausar(filtros, tiempo_pausa, datetime.now())
+
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return jsonify({'status': 'error', 'message': str(e)}), 500
+
+            estado_arrendamientos.registrar_filas(filas)
+            pronostico_vencimientos.invalidar(current_user.parqueadero_id)
+            if accion == 'pausar':
+                publicar_pausas_parqueados(filas)
+
+            return jsonify({'status': 'success', 'message': 'Arrendamientos actualizados', 'data': {
+                'accion': accion,
+                'seleccionados': seleccionados,
+                'actualizados': len(filas),
+                'omitidos': seleccionados - len(filas)
+            }}), 200
+
+        def publicar_pausas_parqueados(filas):
+            """
+            Publica la pausa de los arrendamientos cuyos vehículos están parqueados, en la sede de cada uno.
+
+            :param filas: Filas de los arrendamientos pausados.
+            """
+            arrendamientos = {fila.vehiculo_id: fila for fila in filas}
+            if not arrendamientos:
+                return
+
+            parqueados = (
+                db.session.query(Parqueo.vehiculo_id, Modulo.sede_id, Vehiculo.placa)
+                .join(Modulo, Parqueo.modulo_id == Modulo.id)
+                .join(Vehiculo, Parqueo.vehiculo_id == Vehiculo.id)
+                .filter(Parqueo.vehiculo_id.in_(arrendamientos), Parqueo.fecha_hora_salida == None)
+            )
+
+            for vehiculo_id, sede_id, placa in parqueados:
+                fila = arrendamientos[vehiculo_id]
+                bus_eventos.publicar(sede_id, 'pausa', {
+                    'id': fila.id,
+                    'placa': placa,
+                    'haSidoPausado': fila.ha_sido_pausado,
+                    'fechaFin': fila.fecha_fin
+                })
+
+        def publicar_pausa(arrendamiento):
+            """
+            Publica el cambio de pausa de un arrendamiento en la sede donde está parqueado el vehículo
+            o, si no está parqueado, en todas las sedes del parqueadero.
+
+            :param arrendamiento: Arrendamiento pausado.
+            """
+            sede_id = (
+                db.session.query(Modulo.sede_id)
+                .join(Parqueo, Parqueo.modulo_id == Modulo.id)
+                .filter(Parqueo.vehiculo_id == arrendamiento.vehiculo_id, Parqueo.fecha_hora_salida == None)
+                .scalar()
+            )
+            sede_ids = [sede_id] if sede_id is not None else [
+                sede.id for sede in Sede.query.filter_by(parqueadero_id=current_user.parqueadero_id)
+            ]
+
+            for sede_id in sede_ids:
+                bus_eventos.publicar(sede_id, 'pausa', {
+                    'id': arrendamiento.id,
+                    'placa': arrendamiento.vehiculo.placa,
+                    'haSidoPausado': arrendamiento.ha_sido_pausado,
+                    'fechaFin': arrendamiento.fecha_fin
+                })
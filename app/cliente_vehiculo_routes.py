@@ -5,6 +5,7 @@ from app.models import Cliente, Vehiculo
 
 from app import db
 from app.routes import todos_permiso
+from app.util.placas import indice_placas
 
 
 class ClienteVehiculoRoutes:
@@ -68,6 +69,8 @@ class ClienteVehiculoRoutes:
                 db.session.add(entidad)
                 db.session.commit()
 
+                indice_placas.agregar(cliente.parqueadero_id, entidad)
+
                 return jsonify({'status': 'success', 'message': 'Vehículo creado', 'data': {
                     'id': entidad.id,
                     'placa': entidad.placa,
@@ -109,6 +112,8 @@ class ClienteVehiculoRoutes:
 
                 db.session.commit()
 
+                indice_placas.actualizar(vehiculo)
+
                 return jsonify({'status': 'success', 'message': 'Vehículo actualizado', 'data': {
                     'id': vehiculo.id,
                     'placa': vehiculo.placa,
@@ -143,6 +148,7 @@ class ClienteVehiculoRoutes:
                 vehiculo.disponible = not vehiculo.disponible
 
                 db.session.commit()
+                indice_placas.refrescar(vehiculo.id)
 
                 return jsonify({'status': 'success', 'message': 'Vehículo eliminado'}), 200
 
@@ -0,0 +1,288 @@
+from datetime import datetime, timedelta
+import time
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import insert, select
+
+from app import db
+from app.models import (Cliente, MedioPago, Modulo, Pais, Parqueadero, Periodicidad, Rol, Sede, SedeUsuario, Tarifa,
+                        TarifaTipo, Usuario, Vehiculo, VehiculoTipo, usuario_rol)
+from app.util.base_datos import insert_con_conflictos
+from app.util.importaciones import TABLAS_IMPORTABLES, TAMANO_LOTE, ErrorImportacion, importar_archivos
+from app.util.migraciones import ErrorMigracion, actualizar_esquema
+from app.util.resumenes import reconstruir_resumenes
+from app.util.utilitarios import normalizar_placa
+
+# Hash de la contraseña `usuario123`.
+PASSWORD_DEMO = 'scrypt:32768:8:1$tokZ3wGBv3RBPtZm$4c1794f554745d39c482c0299cba11429cd1b2456ae3170980c3133416f686e61133de12d00e55dd90592c154f853828a3a3f7978c586bc72932d9cff0132912'
+PASSWORD_DEMO_OPERARIO = 'scrypt:32768:8:1$wTvjmRz8VydEhUJP$079bf4fe8c6afb358c7b0a3497edc9db52c361ff4fe561a6be41a50b7d37f1d2f1689692e8fd343bae2cea0a0df4d50fb2881463f264aa0995a45e8162180e2d'
+
+
+def datos_iniciales():
+    """
+    Construye los datos iniciales de la aplicación en el orden en que deben insertarse.
+
+    Todas las filas llevan id explícito para que la siembra se pueda repetir sin duplicar datos.
+
+    :return: Lista de tuplas con la tabla y sus filas.
+    """
+    ahora = datetime.now()
+    fecha_base = datetime(2024, 4, 15)
+    fecha_paises = datetime(2024, 4, 16, 23, 34, 17)
+
+    medios_pago = ['Efectivo', 'Tarjeta de crédito', 'Tarjeta débito', 'Nequi', 'DaviPlata', 'Transferencia', 'Otro']
+
+    paises = ['Colombia', 'Argentina', 'Bolivia', 'Brasil', 'Chile', 'Costa Rica', 'Cuba', 'Ecuador', 'El Salvador',
+              'Guatemala', 'Honduras', 'México', 'Nicaragua', 'Panamá', 'Paraguay', 'Perú', 'Puerto Rico',
+              'República Dominicana', 'Uruguay', 'Venezuela', 'Canadá', 'Estados Unidos']
+
+    usuarios = [
+        (1, '2001', PASSWORD_DEMO, 'Pepé', 'Pérez', '3011001101', 'pepe.perez@superparking.co', 1, datetime(2024, 4, 15)),
+        (2, '2002', PASSWORD_DEMO, 'Laura', 'Gómez', '3202020100', 'laura@superparking.co', 1, datetime(2024, 4, 18)),
+        (3, '2003', PASSWORD_DEMO_OPERARIO, 'Bolívar', 'Rosero', '3011001102', 'bolivar.rosero@superparking.co', 1, datetime(2024, 4, 15)),
+        (4, '2004', PASSWORD_DEMO, 'Patricia', 'García', '3202020111', 'patricia.garcia@parqueaderolosautos.co', 2, datetime(2024, 4, 18)),
+    ]
+
+    clientes = [
+        ('123456789', 'Juan', 'Perez', '1234567890', 'juan.perez@example.com', 'Calle 123'),
+        ('987654321', 'Maria', 'Gonzalez', '9876543210', 'maria.gonzalez@example.com', 'Carrera 456'),
+        ('789012345', 'Pedro', 'Lopez', '7890123450', 'pedro.lopez@example.com', 'Avenida 789'),
+        ('567890123', 'Ana', 'Martin', '5678901230', 'ana.martin@example.com', 'Calle 567'),
+        ('345678901', 'Carlos', 'Gomez', '3456789010', 'carlos.gomez@example.com', 'Carrera 345'),
+        ('1234567890', 'Sofia', 'Garcia', '12345678901', 'sofia.garcia@example.com', 'Avenida 123'),
+        ('9876543210', 'David', 'Rodriguez', '98765432101', 'david.rodriguez@example.com', 'Carrera 987'),
+        ('7890123450', 'Laura', 'Flores', '78901234501', 'laura.flores@example.com', 'Avenida 789'),
+    ]
+
+    tipos_tarifa = ['Minutos', 'Horas', 'Días', 'Semanas', 'Meses', 'Años']
+
+    tarifas = [
+        ('Tarifa por minuto', 100), ('Tarifa por hora', 2000), ('Tarifa por día', 15000),
+        ('Tarifa por semana', 100000), ('Tarifa por mes', 300000), ('Tarifa por año', 2000000),
+    ]
+
+    tipos_vehiculo = ['Motocicleta', 'Automóvil', 'Camioneta', 'Camión', 'Bus', 'Bicicleta', 'Motocicleta Deportiva',
+                      'Automóvil Familiar', 'Camioneta SUV', 'Camión Articulado']
+
+    vehiculos = [
+        ('ABC123', 'Chevrolet', '2021'), ('DEF456', 'Renault', '2020'), ('GHI789', 'Mazda', '2019'),
+        ('JKL012', 'Toyota', '2018'), ('MNO345', 'Nissan', '2017'), ('PQR678', 'Ford', '2016'),
+        ('STU901', 'Kia', '2015'), ('VWX234', 'Hyundai', '2014'),
+    ]
+
+    periodicidades = [('Diario', 1), ('Semanal', 7), ('Mensual', 30), ('Trimestral', 365), ('Semestral', 365), ('Anual', 365)]
+
+    return [
+        (MedioPago.__table__, [
+            {'id': i, 'nombre': nombre, 'activo': True, 'created_at': fecha_base, 'updated_at': fecha_base}
+            for i, nombre in enumerate(medios_pago, 1)
+        ]),
+        (Pais.__table__, [
+            {'id': i, 'nombre': nombre, 'created_at': fecha_base if i == 1 else fecha_paises, 'updated_at': fecha_base if i == 1 else fecha_paises}
+            for i, nombre in enumerate(paises, 1)
+        ]),
+        (Rol.__table__, [
+            {'id': i, 'nombre': nombre, 'created_at': fecha_base, 'updated_at': fecha_base}
+            for i, nombre in enumerate(['Propietario', 'Administrador', 'Operario'], 1)
+        ]),
+        (Usuario.__table__, [
+            {'id': id, 'documento': documento, 'password': password, 'nombres': nombres, 'apellidos': apellidos,
+             'telefono': telefono, 'email': email, 'activo': True, 'parqueadero_id': parqueadero_id,
+             'created_at': fecha, 'updated_at': fecha}
+            for id, documento, password, nombres, apellidos, telefono, email, parqueadero_id, fecha in usuarios
+        ]),
+        (usuario_rol, [
+            {'id': i, 'usuario_id': usuario_id, 'rol_id': rol_id, 'created_at': ahora, 'updated_at': ahora}
+            for i, (usuario_id, rol_id) in enumerate([(1, 1), (2, 2), (3, 3), (4, 1)], 1)
+        ]),
+        (Parqueadero.__table__, [
+            {'id': 1, 'rut': '1001', 'nombre': 'SuperParking', 'direccion': 'Calle 1 # 3-45', 'telefono': '3011001123',
+             'email': 'principal@superparking.co', 'ciudad': 'Bogotá', 'usuario_id': 1, 'pais_id': 1,
+             'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
+            {'id': 2, 'rut': '1002', 'nombre': 'Parqueadero Los Autos', 'direccion': 'Carrera 9 # 4-29', 'telefono': '3021002789',
+             'email': 'contacto@parqueaderolosautos.co', 'ciudad': 'Neiva', 'usuario_id': 4, 'pais_id': 1,
+             'created_at': datetime(2024, 4, 18), 'updated_at': datetime(2024, 4, 18)},
+        ]),
+        (Sede.__table__, [
+            {'id': 1, 'nombre': 'SuperParking Sede Norte', 'direccion': 'Calle 170 # 20-13', 'telefono': '3011001123',
+             'email': 'norte@superparking.co', 'parqueadero_id': 1, 'created_at': fecha_base, 'updated_at': fecha_base},
+            {'id': 2, 'nombre': 'SuperParking Sede Centro', 'direccion': 'Calle 19 # 2-29', 'telefono': '30110001124',
+             'email': 'centro@superparking.co', 'parqueadero_id': 1, 'created_at': fecha_base, 'updated_at': fecha_base},
+        ]),
+        (Modulo.__table__, [
+            {'id': i, 'nombre': f'M{i}', 'habilitado': True, 'descripcion': f'Módulo {i}', 'sede_id': 1,
+             'created_at': fecha_base, 'updated_at': fecha_base}
+            for i in range(1, 41)
+        ]),
+        (Cliente.__table__, [
+            {'id': i, 'documento': documento, 'nombres': nombres, 'apellidos': apellidos, 'telefono': telefono,
+             'email': email, 'direccion': direccion, 'activo': True, 'parqueadero_id': 1, 'created_at': ahora, 'updated_at': ahora}
+            for i, (documento, nombres, apellidos, telefono, email, direccion) in enumerate(clientes, 1)
+        ]),
+        (TarifaTipo.__table__, [
+            {'id': i, 'nombre': nombre, 'unidad': i, 'created_at': fecha_base, 'updated_at': fecha_base}
+            for i, nombre in enumerate(tipos_tarifa, 1)
+        ]),
+        (Tarifa.__table__, [
+            {'id': i, 'nombre': nombre, 'costo': costo, 'tarifa_tipo_id': i, 'created_at': fecha_base, 'updated_at': fecha_base}
+            for i, (nombre, costo) in enumerate(tarifas, 1)
+        ]),
+        (VehiculoTipo.__table__, [
+            {'id': i, 'nombre': nombre, 'created_at': datetime(2024, 4, 17), 'updated_at': datetime(2024, 4, 17)}
+            for i, nombre in enumerate(tipos_vehiculo, 1)
+        ]),
+        (Vehiculo.__table__, [
+            {'id': i, 'placa': placa, 'placa_normalizada': normalizar_placa(placa), 'disponible': True, 'marca': marca,
+             'modelo': modelo, 'vehiculo_tipo_id': 2, 'cliente_id': i, 'tarifa_id': 1, 'created_at': ahora, 'updated_at': ahora}
+            for i, (placa, marca, modelo) in enumerate(vehiculos, 1)
+        ]),
+        (Periodicidad.__table__, [
+            {'id': i, 'nombre': nombre, 'dias': dias, 'parqueadero_id': 1, 'created_at': fecha_base, 'updated_at': fecha_base}
+            for i, (nombre, dias) in enumerate(periodicidades, 1)
+        ]),
+        (SedeUsuario.__table__, [
+            {'id': i, 'sede_id': sede_id, 'usuario_id': 3, 'habilitado': True, 'created_at': ahora, 'updated_at': ahora}
+            for i, sede_id in enumerate([1, 2], 1)
+        ]),
+    ]
+
+
+def insertar_faltantes(conexion, tabla, filas):
+    """
+    Inserta en bloque las filas cuyo id aún no existe en la tabla.
+
+    En SQLite y PostgreSQL se usa `INSERT ... ON CONFLICT DO NOTHING`; en otros motores se consultan
+    primero los ids existentes.
+
+    :param conexion: Conexión con una transacción abierta.
+    :param tabla: Tabla de destino.
+    :param filas: Filas a insertar.
+    :return: Cantidad de filas insertadas.
+    """
+    insertar = insert_con_conflictos(conexion)
+
+    if insertar is not None:
+        return conexion.execute(insertar(tabla).on_conflict_do_nothing(), filas).rowcount
+
+    existentes = set(conexion.execute(select(tabla.c.id).where(tabla.c.id.in_([fila['id'] for fila in filas]))).scalars())
+    faltantes = [fila for fila in filas if fila['id'] not in existentes]
+    if faltantes:
+        conexion.execute(insert(tabla), faltantes)
+
+    return len(faltantes)
+
+
+def sembrar_datos_iniciales():
+    """
+    Siembra los datos iniciales en una única transacción sin sobrescribir los existentes.
+
+    :return: Diccionario con la cantidad de filas insertadas por tabla.
+    """
+    insertadas = {}
+
+    with db.engine.begin() as conexion:
+        for tabla, filas in datos_iniciales():
+            insertadas[tabla.name] = insertar_faltantes(conexion, tabla, filas)
+
+    return insertadas
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db():
+    """
+    Crea las tablas y aplica los cambios de esquema pendientes.
+
+    Termina con error, listando las filas duplicadas, si un índice único no se puede crear.
+    """
+    inicio = time.perf_counter()
+    db.create_all()
+
+    try:
+        cambios = actualizar_esquema()
+    except ErrorMigracion as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f'Esquema actualizado en {time.perf_counter() - inicio:.2f} s.')
+    for nombre in cambios:
+        click.echo(f'  {nombre}')
+
+
+@click.command('seed')
+@with_appcontext
+def seed():
+    """
+    Siembra los datos iniciales; se puede ejecutar varias veces sin duplicar filas.
+    """
+    inicio = time.perf_counter()
+    insertadas = sembrar_datos_iniciales()
+
+    for tabla, cantidad in insertadas.items():
+        click.echo(f'{tabla}: {cantidad} filas nuevas')
+    click.echo(f'Siembra completada en {time.perf_counter() - inicio:.2f} s.')
+
+
+@click.command('backfill-resumenes')
+@click.option('--desde', type=click.DateTime(formats=['%Y-%m-%d']), help='Primer día a recalcular (AAAA-MM-DD).')
+@click.option('--hasta', type=click.DateTime(formats=['%Y-%m-%d']), help='Último día a recalcular (AAAA-MM-DD).')
+@with_appcontext
+def backfill_resumenes(desde, hasta):
+    """
+    Recalcula los resúmenes diarios y de ocupación horaria a partir de los parqueos cerrados.
+    """
+    inicio = time.perf_counter()
+    leidos, filas_diarias, filas_horarias = reconstruir_resumenes(desde, hasta + timedelta(days=1) if hasta else None)
+    duracion = time.perf_counter() - inicio
+
+    click.echo(f'{leidos} parqueos leídos en {duracion:.2f} s ({leidos / duracion:.0f} parqueos/s).')
+    click.echo(f'{filas_diarias} filas de resumen diario y {filas_horarias} de ocupación horaria.')
+
+
+@click.command('importar-csv')
+@click.argument('archivos', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--tabla', type=click.Choice(sorted(TABLAS_IMPORTABLES)), help='Tabla de destino; por defecto se deduce del nombre del archivo.')
+@click.option('--lote', default=TAMANO_LOTE, show_default=True, help='Filas por inserción en bloque.')
+@click.option('--simular', is_flag=True, help='Valida los archivos sin escribir en la base de datos.')
+@click.option('--omitir-invalidas', is_flag=True, help='Importa las filas válidas aunque haya filas inválidas.')
+@with_appcontext
+def importar_csv(archivos, tabla, lote, simular, omitir_invalidas):
+    """
+    Importa archivos CSV con el formato de `recursos/` (clientes, vehículos, módulos, parqueos y arrendamientos).
+
+    Los archivos se importan en el orden dado y en una sola transacción, así que un archivo puede
+    referenciar los ids de los anteriores. Si alguna fila es inválida no se escribe nada, salvo con
+    --omitir-invalidas.
+    """
+    try:
+        resultados = importar_archivos(db.engine, archivos, tabla, lote, simular, omitir_invalidas)
+    except ErrorImportacion as e:
+        raise click.ClickException(str(e))
+
+    invalidas = 0
+    for ruta, importador, duracion in resultados:
+        click.echo(f'{ruta} -> {importador.tabla.name}: {importador.leidas} filas leídas, '
+                   f'{importador.insertadas} válidas, {importador.invalidas} inválidas en {duracion:.2f} s '
+                   f'({importador.leidas / duracion if duracion else 0:.0f} filas/s).')
+        for error in importador.errores:
+            click.echo(f'  {error}')
+        invalidas += importador.invalidas
+
+    if simular:
+        click.echo('Simulación: no se escribió nada.')
+    elif invalidas and not omitir_invalidas:
+        raise click.ClickException(f'{invalidas} filas inválidas; no se importó nada. Use --omitir-invalidas para importar el resto.')
+    elif any(importador.tabla.name == 'parqueo' and importador.insertadas for _, importador, _ in resultados):
+        click.echo('Se importaron parqueos: ejecute `flask backfill-resumenes` para actualizar la analítica.')
+
+
+def registrar_comandos(app):
+    """
+    Registra los comandos de administración en la CLI de Flask.
+
+    :param app: Aplicación de Flask.
+    """
+    app.cli.add_command(init_db)
+    app.cli.add_command(seed)
+    app.cli.add_command(backfill_resumenes)
+    app.cli.add_command(importar_csv)
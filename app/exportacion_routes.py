@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request
+from flask_login import current_user, login_required
+
+from app import db
+from app.routes import propietario_admin_permission
+from app.util.exportaciones import (consulta_arrendamientos, consulta_clientes, consulta_parqueos, filas_csv,
+                                    leer_filtros)
+
+
+class ExportacionRoutes:
+    """
+    Clase que gestiona las rutas de exportación de datos a CSV.
+    """
+    def __init__(self):
+        """
+        Constructor de la clase.
+        """
+        self.blueprint = Blueprint('exportacion', __name__)
+        self.add_routes()
+
+    def add_routes(self):
+        def leer_peticion(admite_sede):
+            """
+            Lee los filtros de la petición.
+
+            :param admite_sede: Indica si la exportación se puede filtrar por sede.
+            :return: Tupla con los filtros y una respuesta de error (o None).
+            """
+            try:
+                desde, hasta, sede_id = leer_filtros(request.args)
+            except ValueError as e:
+                return None, (jsonify({'status': 'error', 'message': f'Rango de fechas inválido: {e}'}), 400)
+
+            if sede_id is not None and not admite_sede:
+                return None, (jsonify({'status': 'error', 'message': 'Esta exportación no se puede filtrar por sede'}), 400)
+
+            return (desde, hasta, sede_id), None
+
+        def transmitir(nombre, consulta):
+            """
+            Transmite una consulta como archivo CSV por bloques.
+
+            :param nombre: Prefijo del nombre del archivo.
+            :param consulta: Consulta a exportar.
+            :return: Respuesta con el flujo del archivo.
+            """
+            nombre_archivo = f'{nombre}-{datetime.now():%Y%m%d}.csv'
+
+            return Response(filas_csv(db.engine, consulta), mimetype='text/csv', headers={
+                'Content-Disposition': f'attachment; filename={nombre_archivo}',
+                'X-Accel-Buffering': 'no'
+            })
+
+
+        @self.blueprint.route('/exportar/parqueos', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def exportar_parqueos():
+            """
+            Exporta a CSV los parqueos que entraron en el rango, opcionalmente de una sola sede.
+
+            :return: Archivo CSV.
+            """
+            filtros, error = leer_peticion(admite_sede=True)
+            if error:
+                return error
+
+            return transmitir('parqueo', consulta_parqueos(current_user.parqueadero_id, *filtros))
+
+
+        @self.blueprint.route('/exportar/arrendamientos', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def exportar_arrendamientos():
+            """
+            Exporta a CSV los arrendamientos vigentes en algún momento del rango.
+
+            :return: Archivo CSV.
+            """
+            filtros, error = leer_peticion(admite_sede=False)
+            if error:
+                return error
+
+            desde, hasta, _ = filtros
+
+            return transmitir('arrendamientos', consulta_arrendamientos(current_user.parqueadero_id, desde, hasta))
+
+
+        @self.blueprint.route('/exportar/clientes', methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def exportar_clientes():
+            """
+            Exporta a CSV los clientes registrados en el rango.
+
+            :return: Archivo CSV.
+            """
+            filtros, error = leer_peticion(admite_sede=False)
+            if error:
+                return error
+
+            desde, hasta, _ = filtros
+
+            return transmitir('cliente', consulta_clientes(current_user.parqueadero_id, desde, hasta))
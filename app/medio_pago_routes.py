@@ -6,6 +6,7 @@ from app.models import MedioPago, Tarifa
 from app import db
 from app.routes import propietario_admin_permission
 from app.routes import todos_permiso
+from app.util.catalogos import catalogos
 
 
 class MedioPagoRoutes:
@@ -29,7 +30,7 @@ class MedioPagoRoutes:
             """
             g.template_name = 'base.html'
             
-            entidades = MedioPago.query.all()
+            entidades = catalogos.obtener(MedioPago)
             return render_template('medio-pago.html', titulo='Medios de Pago', entidades=entidades)
 
 
@@ -42,12 +43,12 @@ class MedioPagoRoutes:
 
             :return: Respuesta JSON.
             """
-            entidades = MedioPago.query.all()
+            entidades = catalogos.obtener(MedioPago)
             
             return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': [{
-                'id': entidad.id,
-                'nombre': entidad.nombre,
-                'activo': entidad.activo
+                'id': entidad['id'],
+                'nombre': entidad['nombre'],
+                'activo': entidad['activo']
             } for entidad in entidades]}), 200
 
 
@@ -66,6 +67,7 @@ class MedioPagoRoutes:
 
                 db.session.add(entidad)
                 db.session.commit()
+                catalogos.invalidar(MedioPago)
 
                 return jsonify({'status': 'success', 'message': 'Medio de pago creado', 'data': {
                     'id': entidad.id,
@@ -99,6 +101,7 @@ class MedioPagoRoutes:
                 entidad.updated_at = db.func.current_timestamp()
 
                 db.session.commit()
+                catalogos.invalidar(MedioPago)
 
                 return jsonify({'status': 'success', 'message': 'Medio de pago actualizado', 'data': {
                     'id': entidad.id,
@@ -128,6 +131,7 @@ class MedioPagoRoutes:
 
                 db.session.delete(entidad)
                 db.session.commit()
+                catalogos.invalidar(MedioPago)
 
                 return jsonify({'status': 'success', 'message': 'Medio de pago eliminado'}), 200
 
@@ -146,6 +150,7 @@ class MedioPagoRoutes:
             medio_pago.activo = not medio_pago.activo
 
             db.session.commit()
+            catalogos.invalidar(MedioPago)
 
             estado = 'activado' if medio_pago.activo else 'desactivado'
             return jsonify({'status': 'success', 'message': f'Medio de pago {estado} exitosamente'}), 200
@@ -159,10 +164,10 @@ class MedioPagoRoutes:
 
             :return: Respuesta JSON.
             """
-            entidades = Tarifa.query.all()
+            entidades = catalogos.obtener(Tarifa)
             
             return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': [{
-                'id': entidad.id,
-                'costo': entidad.costo,
-                'nombre': entidad.nombre,
+                'id': entidad['id'],
+                'costo': entidad['costo'],
+                'nombre': entidad['nombre'],
             } for entidad in entidades]}), 200
@@ -1,13 +1,15 @@
-from datetime import datetime
-
 from flask_login import UserMixin
 from sqlalchemy import event
-from werkzeug.security import check_password_hash, generate_password_hash
+from sqlalchemy.orm import selectinload, validates
+from werkzeug.security import check_password_hash
 from flask_principal import Principal, Permission, RoleNeed, UserNeed, Identity, AnonymousIdentity, identity_loaded, identity_changed
 
 from app import login
 
-from app import app, db
+from app import db
+from app.util.autenticacion import generar_hash
+from app.util.sesiones import cache_usuarios
+from app.util.utilitarios import normalizar_placa
 
 from flask_login import current_user
 
@@ -113,7 +115,7 @@ class Usuario(UserMixin, db.Model):
     nombres = db.Column(db.String(32), nullable=False)
     apellidos = db.Column(db.String(32), nullable=False)
     telefono = db.Column(db.String(16), nullable=False)
-    email = db.Column(db.String(64), nullable=False)
+    email = db.Column(db.String(64), nullable=False, index=True)
     activo = db.Column(db.Boolean, nullable=False, default=True)
 
     parqueadero_id = db.Column(db.Integer, db.ForeignKey('parqueadero.id'), nullable=True)
@@ -135,7 +137,7 @@ class Usuario(UserMixin, db.Model):
 
         :param password: Contraseña del usuario.
         """
-        self.password = generate_password_hash(password)
+        self.password = generar_hash(password)
     
     def check_password(self, password):
         """
@@ -158,6 +160,20 @@ class Usuario(UserMixin, db.Model):
         return False
 
 
+def cargar_usuario(sesion, id):
+    """
+    Carga un usuario con sus roles y sus sedes asignadas.
+
+    :param sesion: Sesión de SQLAlchemy con la que se realiza la consulta.
+    :param id: ID del usuario.
+    :return: Usuario con el ID especificado.
+    """
+    return sesion.get(Usuario, id, options=[
+        selectinload(Usuario.roles),
+        selectinload(Usuario.sedes).joinedload(SedeUsuario.sede)
+    ])
+
+
 @login.user_loader
 def load_user(id):
     """
@@ -166,7 +182,7 @@ def load_user(id):
     :param id: ID del usuario.
     :return: Usuario con el ID especificado.
     """
-    return Usuario.query.get(int(id))
+    return cache_usuarios.obtener(int(id), cargar_usuario)
 
 
 class Cliente(db.Model):
@@ -183,7 +199,9 @@ class Cliente(db.Model):
     email = db.Column(db.String(64), nullable=False)
     direccion = db.Column(db.String(255), nullable=False)
     activo = db.Column(db.Boolean, nullable=False, default=True)
-    parqueadero_id = db.Column(db.Integer, db.ForeignKey('parqueadero.id'), nullable=False)
+    parqueadero_id = db.Column(db.Integer, db.ForeignKey('parqueadero.id'), nullable=False, index=True)
+    # Suma de los movimientos de `punto`; se actualiza en la misma transacción que cada movimiento.
+    puntos_saldo = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
 
@@ -233,6 +251,8 @@ class Periodicidad(db.Model):
 class Redimir(db.Model):
     """
     Representa la acción de redimir puntos acumulados.
+
+    Cada redención apunta al movimiento negativo de `punto` con que se descontó del saldo.
     """
     __tablename__ = 'redimir'
 
@@ -250,13 +270,13 @@ class Redimir(db.Model):
 
 class Punto(db.Model):
     """
-    Representa los puntos acumulados por un cliente.
+    Representa un movimiento de puntos de un cliente: positivo al acumular y negativo al redimir.
     """
     __tablename__ = 'punto'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     cantidad = db.Column(db.Integer, default=0, nullable=False)
-    cliente_id = db.Column(db.Integer, db.ForeignKey('cliente.id'), nullable=False)
+    cliente_id = db.Column(db.Integer, db.ForeignKey('cliente.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
 
@@ -331,10 +351,74 @@ class Parqueo(db.Model):
     vehiculo = db.relationship("Vehiculo", back_populates="parqueos")
     medio_pago = db.relationship("MedioPago", back_populates="parqueos")
 
+    __table_args__ = (
+        db.Index('ix_parqueo_modulo_salida', 'modulo_id', 'fecha_hora_salida'),
+        db.Index('ix_parqueo_vehiculo_salida', 'vehiculo_id', 'fecha_hora_salida'),
+        db.Index('ix_parqueo_entrada', 'fecha_hora_entrada'),
+        # Un módulo y un vehículo solo pueden tener un parqueo abierto. Requieren índices parciales,
+        # por lo que solo se crean en SQLite y PostgreSQL.
+        db.Index('ux_parqueo_modulo_abierto', 'modulo_id', unique=True,
+                 sqlite_where=db.text('fecha_hora_salida IS NULL'),
+                 postgresql_where=db.text('fecha_hora_salida IS NULL')).ddl_if(dialect=('sqlite', 'postgresql')),
+        db.Index('ux_parqueo_vehiculo_abierto', 'vehiculo_id', unique=True,
+                 sqlite_where=db.text('fecha_hora_salida IS NULL'),
+                 postgresql_where=db.text('fecha_hora_salida IS NULL')).ddl_if(dialect=('sqlite', 'postgresql')),
+    )
+
     def __repr__(self):
         return f"<Parqueo(id={self.id}, fecha_hora_entrada='{self.fecha_hora_entrada}', fecha_hora_salida='{self.fecha_hora_salida}')>"
 
 
+class ParqueoResumenDiario(db.Model):
+    """
+    Resumen diario de los parqueos cerrados por sede, módulo, tipo de vehículo y medio de pago.
+
+    Cada parqueo se suma al día de su salida. `vehiculo_tipo_id` y `medio_pago_id` valen 0 cuando
+    no se registraron, para que formen parte de la llave única; por eso no tienen llave foránea.
+    """
+    __tablename__ = 'parqueo_resumen_diario'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    fecha = db.Column(db.Date, nullable=False)
+    sede_id = db.Column(db.Integer, db.ForeignKey('sede.id'), nullable=False)
+    modulo_id = db.Column(db.Integer, db.ForeignKey('modulo.id'), nullable=False)
+    vehiculo_tipo_id = db.Column(db.Integer, nullable=False, default=0)
+    medio_pago_id = db.Column(db.Integer, nullable=False, default=0)
+    parqueos = db.Column(db.Integer, nullable=False, default=0)
+    total_pagado = db.Column(db.BigInteger, nullable=False, default=0)
+    segundos_estancia = db.Column(db.BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('fecha', 'sede_id', 'modulo_id', 'vehiculo_tipo_id', 'medio_pago_id',
+                            name='ux_parqueo_resumen_diario'),
+    )
+
+    def __repr__(self):
+        return f"<ParqueoResumenDiario(fecha='{self.fecha}', modulo_id={self.modulo_id}, parqueos={self.parqueos})>"
+
+
+class ParqueoOcupacionHoraria(db.Model):
+    """
+    Segundos de ocupación de cada sede en cada hora, a partir de los parqueos cerrados.
+
+    La estancia de un parqueo se reparte entre las horas que abarca.
+    """
+    __tablename__ = 'parqueo_ocupacion_horaria'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    fecha = db.Column(db.Date, nullable=False)
+    hora = db.Column(db.SmallInteger, nullable=False)
+    sede_id = db.Column(db.Integer, db.ForeignKey('sede.id'), nullable=False)
+    segundos_ocupados = db.Column(db.BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('fecha', 'hora', 'sede_id', name='ux_parqueo_ocupacion_horaria'),
+    )
+
+    def __repr__(self):
+        return f"<ParqueoOcupacionHoraria(fecha='{self.fecha}', hora={self.hora}, sede_id={self.sede_id})>"
+
+
 class VehiculoTipo(db.Model):
     __tablename__ = 'vehiculo_tipo'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -351,7 +435,8 @@ class VehiculoTipo(db.Model):
 class Vehiculo(db.Model):
     __tablename__ = 'vehiculo'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    placa = db.Column(db.String(12))
+    placa = db.Column(db.String(12), index=True)
+    placa_normalizada = db.Column(db.String(12), index=True)
     disponible = db.Column(db.Boolean, nullable=False, default=True)
     marca = db.Column(db.String(32))
     modelo = db.Column(db.String(4))
@@ -367,6 +452,18 @@ class Vehiculo(db.Model):
     arrendamientos = db.relationship("Arrendamiento", back_populates="vehiculo")
     tarifa = db.relationship("Tarifa", back_populates="vehiculos")
 
+    @validates('placa')
+    def validar_placa(self, clave, placa):
+        """
+        Mantiene la placa normalizada al asignar la placa.
+
+        :param clave: Nombre del atributo.
+        :param placa: Placa asignada.
+        :return: Placa sin cambios.
+        """
+        self.placa_normalizada = normalizar_placa(placa)
+        return placa
+
     def __repr__(self):
         return f"<Vehiculo(placa='{self.placa}', marca='{self.marca}', modelo='{self.modelo}')>"
 
@@ -409,321 +506,9 @@ class Arrendamiento(db.Model):
     medio_pago = db.relationship('MedioPago', back_populates='arrendamientos')
     tarifa = db.relationship('Tarifa', back_populates='arrendamientos')
 
+    __table_args__ = (
+        db.Index('ix_arrendamiento_vehiculo_fin', 'vehiculo_id', 'fecha_fin'),
+    )
+
     def __repr__(self):
         return f"<Arrendamiento(id='{self.id}', descripcion='{self.descripcion}')>"
-
-
-def insert_initial_values():
-    if not MedioPago.query.first():
-        medios_pago = [
-            {'id': 1, 'nombre': 'Efectivo', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'id': 2, 'nombre': 'Tarjeta de crédito', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'id': 3, 'nombre': 'Tarjeta débito', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'id': 4, 'nombre': 'Nequi', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'id': 5, 'nombre': 'DaviPlata', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'id': 6, 'nombre': 'Transferencia', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'id': 7, 'nombre': 'Otro', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)}
-        ]
-
-        for medio in medios_pago:
-            mp = MedioPago(**medio)
-            db.session.add(mp)
-
-        db.session.commit()
-
-    if not Pais.query.first():
-        paises = [
-            {'nombre': 'Colombia', 'created_at': datetime(2024, 4, 15), 'updated_at': datetime(2024, 4, 15)},
-            {'nombre': 'Argentina', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Bolivia', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Brasil', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Chile', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Costa Rica', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Cuba', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Ecuador', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'El Salvador', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Guatemala', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Honduras', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'México', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Nicaragua', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Panamá', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Paraguay', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Perú', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Puerto Rico', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'República Dominicana', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Uruguay', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Venezuela', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Canadá', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)},
-            {'nombre': 'Estados Unidos', 'created_at': datetime(2024, 4, 16, 23, 34, 17), 'updated_at': datetime(2024, 4, 16, 23, 34, 17)}
-        ]
-
-        for pais_info in paises:
-            pais = Pais(**pais_info)
-            db.session.add(pais)
-        
-        db.session.commit()
-
-    if not Rol.query.first():
-        roles = [
-            Rol(id=1, nombre='Propietario', created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Rol(id=2, nombre='Administrador', created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Rol(id=3, nombre='Operario', created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15))
-        ]
-
-        for rol in roles:
-            db.session.add(rol)
-
-        db.session.commit()
-
-    if not Usuario.query.first():
-        usuarios = [
-            Usuario(
-                id=1,
-                documento='2001',
-                password='scrypt:32768:8:1$tokZ3wGBv3RBPtZm$4c1794f554745d39c482c0299cba11429cd1b2456ae3170980c3133416f686e61133de12d00e55dd90592c154f853828a3a3f7978c586bc72932d9cff0132912', # usuario123
-                nombres='Pepé',
-                apellidos='Pérez',
-                telefono='3011001101',
-                email='pepe.perez@superparking.co',
-                parqueadero_id=1,
-                created_at=datetime(2024, 4, 15),
-                updated_at=datetime(2024, 4, 15)
-            ),
-            Usuario(
-                id=2,
-                documento='2002',
-                password='scrypt:32768:8:1$tokZ3wGBv3RBPtZm$4c1794f554745d39c482c0299cba11429cd1b2456ae3170980c3133416f686e61133de12d00e55dd90592c154f853828a3a3f7978c586bc72932d9cff0132912', # usuario123
-                nombres='Laura',
-                apellidos='Gómez',
-                telefono='3202020100',
-                email='laura@superparking.co',
-                parqueadero_id=1,
-                created_at=datetime(2024, 4, 18),
-                updated_at=datetime(2024, 4, 18)
-            ),
-            Usuario(
-                id=3,
-                documento='2003',
-                password='scrypt:32768:8:1$wTvjmRz8VydEhUJP$079bf4fe8c6afb358c7b0a3497edc9db52c361ff4fe561a6be41a50b7d37f1d2f1689692e8fd343bae2cea0a0df4d50fb2881463f264aa0995a45e8162180e2d', # usuario123
-                nombres='Bolívar',
-                apellidos='Rosero',
-                telefono='3011001102',
-                email='bolivar.rosero@superparking.co',
-                parqueadero_id=1,
-                created_at=datetime(2024, 4, 15),
-                updated_at=datetime(2024, 4, 15)
-            ),
-            Usuario(
-                id=4,
-                documento='2004',
-                password='scrypt:32768:8:1$tokZ3wGBv3RBPtZm$4c1794f554745d39c482c0299cba11429cd1b2456ae3170980c3133416f686e61133de12d00e55dd90592c154f853828a3a3f7978c586bc72932d9cff0132912', # usuario123
-                nombres='Patricia',
-                apellidos='García',
-                telefono='3202020111',
-                email='patricia.garcia@parqueaderolosautos.co',
-                parqueadero_id=2,
-                created_at=datetime(2024, 4, 18),
-                updated_at=datetime(2024, 4, 18)
-            ),
-        ]
-
-        for usuario in usuarios:
-            db.session.add(usuario)
-
-    rol_propietario = Rol.query.filter_by(nombre='Propietario').first()
-    rol_administrador = Rol.query.filter_by(nombre='Administrador').first()
-    rol_operario = Rol.query.filter_by(nombre='Operario').first()
-
-    usuario_pepe_perez = Usuario.query.filter_by(documento='2001').first()
-    usuario_pepe_perez.roles.append(rol_propietario)
-    db.session.add(usuario_pepe_perez)
-
-    usuario_laura_gomez = Usuario.query.filter_by(documento='2002').first()
-    usuario_laura_gomez.roles.append(rol_administrador)
-    db.session.add(usuario_laura_gomez)
-
-    usuario_bolivar_rosero = Usuario.query.filter_by(documento='2003').first()
-    usuario_bolivar_rosero.roles.append(rol_operario)
-    db.session.add(usuario_bolivar_rosero)
-
-    usuario_patricia_garcia = Usuario.query.filter_by(documento='2004').first()
-    usuario_patricia_garcia.roles.append(rol_propietario)
-    db.session.add(usuario_patricia_garcia)
-
-    if not Parqueadero.query.first():
-        parqueaderos = [
-            Parqueadero(
-                id=1,
-                rut='1001',
-                nombre='SuperParking',
-                direccion='Calle 1 # 3-45',
-                telefono='3011001123',
-                email='principal@superparking.co',
-                ciudad='Bogotá',
-                usuario_id=1,
-                pais_id=1,
-                created_at=datetime(2024, 4, 15),
-                updated_at=datetime(2024, 4, 15)
-            ),
-            Parqueadero(
-                id=2,
-                rut='1002',
-                nombre='Parqueadero Los Autos',
-                direccion='Carrera 9 # 4-29',
-                telefono='3021002789',
-                email='contacto@parqueaderolosautos.co',
-                ciudad='Neiva',
-                usuario_id=4,
-                pais_id=1,
-                created_at=datetime(2024, 4, 18),
-                updated_at=datetime(2024, 4, 18)
-            )
-        ]
-
-        for parqueadero in parqueaderos:
-            db.session.add(parqueadero)
-        
-        db.session.commit()
-
-    if not Sede.query.first():
-        sedes = [
-            Sede(
-                id=1,
-                nombre='SuperParking Sede Norte',
-                direccion='Calle 170 # 20-13',
-                telefono='3011001123',
-                email='norte@superparking.co',
-                parqueadero_id=1,
-                created_at=datetime(2024, 4, 15),
-                updated_at=datetime(2024, 4, 15)
-            ),
-            Sede(
-                id=2,
-                nombre='SuperParking Sede Centro',
-                direccion='Calle 19 # 2-29',
-                telefono='30110001124',
-                email='centro@superparking.co',
-                parqueadero_id=1,
-                created_at=datetime(2024, 4, 15),
-                updated_at=datetime(2024, 4, 15)
-            )
-        ]
-
-        for sede in sedes:
-            db.session.add(sede)
-        
-        db.session.commit()
-
-    if not Modulo.query.first():
-        modulos = []
-
-        for i in range(1, 21):
-            modulos.append(Modulo(id=i, nombre=f'M{i}', habilitado=True, descripcion=f'Módulo {i}', sede_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)))
-        
-        for i in range(21, 41):
-            modulos.append(Modulo(id=i, nombre=f'M{i}', habilitado=True, descripcion=f'Módulo {i}', sede_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)))
-        
-        for m in modulos:
-            db.session.add(m)
-        
-        db.session.commit()
-    
-    if not Cliente.query.first():
-        clientes = [
-            Cliente(documento='123456789', nombres='Juan', apellidos='Perez', telefono='1234567890', email='juan.perez@example.com', direccion='Calle 123', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='987654321', nombres='Maria', apellidos='Gonzalez', telefono='9876543210', email='maria.gonzalez@example.com', direccion='Carrera 456', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='789012345', nombres='Pedro', apellidos='Lopez', telefono='7890123450', email='pedro.lopez@example.com', direccion='Avenida 789', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='567890123', nombres='Ana', apellidos='Martin', telefono='5678901230', email='ana.martin@example.com', direccion='Calle 567', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='345678901', nombres='Carlos', apellidos='Gomez', telefono='3456789010', email='carlos.gomez@example.com', direccion='Carrera 345', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='1234567890', nombres='Sofia', apellidos='Garcia', telefono='12345678901', email='sofia.garcia@example.com', direccion='Avenida 123', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='9876543210', nombres='David', apellidos='Rodriguez', telefono='98765432101', email='david.rodriguez@example.com', direccion='Carrera 987', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Cliente(documento='7890123450', nombres='Laura', apellidos='Flores', telefono='78901234501', email='laura.flores@example.com', direccion='Avenida 789', parqueadero_id=1, created_at=datetime.now(), updated_at=datetime.now())
-        ]
-
-        db.session.add_all(clientes)
-        db.session.commit()
-    
-    if not TarifaTipo.query.first():
-        tipos_tarifa = [
-            TarifaTipo(id=1, nombre='Minutos', unidad=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            TarifaTipo(id=2, nombre='Horas', unidad=2, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            TarifaTipo(id=3, nombre='Días', unidad=3, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            TarifaTipo(id=4, nombre='Semanas', unidad=4, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            TarifaTipo(id=5, nombre='Meses', unidad=5, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            TarifaTipo(id=6, nombre='Años', unidad=6, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15))
-        ]
-
-        db.session.add_all(tipos_tarifa)
-
-        db.session.commit()
-
-    if not Tarifa.query.first():
-        tarifas = [
-            Tarifa(id=1, nombre='Tarifa por minuto', costo=100, tarifa_tipo_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Tarifa(id=2, nombre='Tarifa por hora', costo=2000, tarifa_tipo_id=2, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Tarifa(id=3, nombre='Tarifa por día', costo=15000, tarifa_tipo_id=3, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Tarifa(id=4, nombre='Tarifa por semana', costo=100000, tarifa_tipo_id=4, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Tarifa(id=5, nombre='Tarifa por mes', costo=300000, tarifa_tipo_id=5, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Tarifa(id=6, nombre='Tarifa por año', costo=2000000, tarifa_tipo_id=6, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15))
-        ]
-
-        db.session.add_all(tarifas)
-
-        db.session.commit()
-
-    if not VehiculoTipo.query.first():
-        data = [
-            VehiculoTipo(id=1, nombre='Motocicleta', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=2, nombre='Automóvil', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=3, nombre='Camioneta', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=4, nombre='Camión', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=5, nombre='Bus', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=6, nombre='Bicicleta', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=7, nombre='Motocicleta Deportiva', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=8, nombre='Automóvil Familiar', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=9, nombre='Camioneta SUV', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17)),
-            VehiculoTipo(id=10, nombre='Camión Articulado', created_at=datetime(2024, 4, 17), updated_at=datetime(2024, 4, 17))
-        ]
-        
-        db.session.bulk_save_objects(data)
-        db.session.commit()
-
-    if not Vehiculo.query.first():
-        vehiculos = [
-            Vehiculo(placa='ABC123', disponible=True, marca='Chevrolet', modelo='2021', vehiculo_tipo_id=2, cliente_id=1, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='DEF456', disponible=True, marca='Renault', modelo='2020', vehiculo_tipo_id=2, cliente_id=2, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='GHI789', disponible=True, marca='Mazda', modelo='2019', vehiculo_tipo_id=2, cliente_id=3, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='JKL012', disponible=True, marca='Toyota', modelo='2018', vehiculo_tipo_id=2, cliente_id=4, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='MNO345', disponible=True, marca='Nissan', modelo='2017', vehiculo_tipo_id=2, cliente_id=5, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='PQR678', disponible=True, marca='Ford', modelo='2016', vehiculo_tipo_id=2, cliente_id=6, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='STU901', disponible=True, marca='Kia', modelo='2015', vehiculo_tipo_id=2, cliente_id=7, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now()),
-            Vehiculo(placa='VWX234', disponible=True, marca='Hyundai', modelo='2014', vehiculo_tipo_id=2, cliente_id=8, tarifa_id=1, created_at=datetime.now(), updated_at=datetime.now())
-        ]
-
-        db.session.add_all(vehiculos)
-        db.session.commit()
-
-    if not Periodicidad.query.first():
-        periodicidades = [
-            Periodicidad(id=1, nombre='Diario', dias=1, parqueadero_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Periodicidad(id=2, nombre='Semanal', dias=7, parqueadero_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Periodicidad(id=3, nombre='Mensual', dias=30, parqueadero_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Periodicidad(id=4, nombre='Trimestral', dias=365, parqueadero_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Periodicidad(id=5, nombre='Semestral', dias=365, parqueadero_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15)),
-            Periodicidad(id=6, nombre='Anual', dias=365, parqueadero_id=1, created_at=datetime(2024, 4, 15), updated_at=datetime(2024, 4, 15))
-        ]
-
-        db.session.add_all(periodicidades)
-        db.session.commit()
-
-    if not SedeUsuario.query.first():
-        sede_usuario = SedeUsuario(sede_id=1, usuario_id=3, created_at=datetime.now(), updated_at=datetime.now())
-        db.session.add(sede_usuario)
-        sede_usuario = SedeUsuario(sede_id=2, usuario_id=3, created_at=datetime.now(), updated_at=datetime.now())
-        db.session.add(sede_usuario)
-        db.session.commit()
-
-with app.app_context():
-    db.create_all()
-
-    insert_initial_values()
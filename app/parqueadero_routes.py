@@ -1,25 +1,29 @@
 from datetime import datetime
 import io
-import os
-import tempfile
 
-from flask import Blueprint, g, flash, jsonify, render_template, request, url_for, redirect, send_file
+from flask import Blueprint, current_app, g, flash, jsonify, render_template, request, url_for, redirect, send_file
 from flask_login import current_user, login_required
-
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import cm
-import qrcode
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 from app.forms import ParqueaderoInformacionForm
-from app.models import Arrendamiento, MedioPago, Modulo, Parqueadero, Parqueo, Periodicidad, Tarifa, Usuario, Vehiculo, VehiculoTipo
+from app.models import MedioPago, Modulo, Parqueadero, Parqueo, Periodicidad, Tarifa, Usuario, Vehiculo, VehiculoTipo
 
 from app import db
 from app.routes import propietario_admin_permission, operario_permission
 from app.routes import todos_permiso, propietario_permission
-from app.util.utilitarios import to_json
+from app.util.arrendamientos import PAUSADO, estado_arrendamientos
+from app.util.catalogos import catalogos
+from app.util.cobro import calcular_total
+from app.util.eventos import bus_eventos
+from app.util.ocupacion import ocupacion_modulos
+from app.util.placas import indice_placas
+from app.util.puntos import acumular_puntos
+from app.util.resumenes import registrar_cierre
+from app.util.sesiones import cache_usuarios
+from app.util.tickets import DatosTicket, generador_tickets
+from app.util.utilitarios import normalizar_placa
 
 
 class ParqueaderoRoutes:
@@ -107,13 +111,12 @@ class ParqueaderoRoutes:
             :return: Respuesta JSON.
             """
             parqueadero_id = current_user.parqueadero_id
-            parqueadero = Parqueadero.query.filter_by(id=parqueadero_id).first()
-            periodicidades = Periodicidad.query.filter_by(parqueadero_id=parqueadero.id).all()
+            periodicidades = [entidad for entidad in catalogos.obtener(Periodicidad) if entidad['parqueadero_id'] == parqueadero_id]
 
             return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': [{
-                'id': entidad.id,
-                'nombre': entidad.nombre,
-                'dias': entidad.dias
+                'id': entidad['id'],
+                'nombre': entidad['nombre'],
+                'dias': entidad['dias']
             } for entidad in periodicidades]}), 200
 
 
@@ -126,12 +129,9 @@ class ParqueaderoRoutes:
             """
             g.template_name = 'base.html'
             sedes = [sede.sede for sede in current_user.sedes]
-            tipos_vehiculos = VehiculoTipo.query.all()
-            tipos_vehiculos_json = [to_json(tipo_vehiculo) for tipo_vehiculo in tipos_vehiculos]
-            medios_pago = MedioPago.query.all()
-            medios_pago = [to_json(medio_pago) for medio_pago in medios_pago]
-            tarifas = Tarifa.query.all()
-            tarifas = [to_json(tarifa) for tarifa in tarifas]
+            tipos_vehiculos_json = catalogos.obtener(VehiculoTipo)
+            medios_pago = catalogos.obtener(MedioPago)
+            tarifas = catalogos.obtener(Tarifa)
 
             return render_template('parqueos.html', titulo='Parqueos', sedes=sedes, tipos_vehiculos=tipos_vehiculos_json, medios_pago=medios_pago, tarifas=tarifas)
 
@@ -146,7 +146,7 @@ class ParqueaderoRoutes:
 
             :return: Respuesta JSON.
             """
-            vehiculo = Vehiculo.query.filter_by(placa=placa).first()
+            vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
 
             if vehiculo is None:
                 return jsonify({'status': 'failure', 'message': 'No existe un vehículo con la placa indicada.'}), 200
@@ -165,6 +165,25 @@ class ParqueaderoRoutes:
             })
 
 
+        @self.blueprint.route('/vehiculo/sugerir/<prefijo>', methods=['GET'])
+        @login_required
+        def sugerir_vehiculo(prefijo):
+            """
+            Sugiere las placas de los vehículos del parqueadero que empiezan por un prefijo.
+
+            El prefijo se normaliza igual que las placas, así que "abc-1" encuentra "ABC123".
+
+            :param prefijo: Inicio de la placa.
+            :return: Respuesta JSON.
+            """
+            limite = min(request.args.get('limite', 10, type=int), 50)
+            sugerencias = indice_placas.sugerir(current_user.parqueadero_id, prefijo, limite)
+
+            return jsonify({'status': 'success', 'data': [
+                {'id': vehiculo_id, 'placa': placa} for vehiculo_id, placa in sugerencias
+            ]}), 200
+
+
         @self.blueprint.route('/parqueo/ingresar', methods=['POST'])
         @login_required
         @operario_permission.require(http_exception=403)
@@ -177,15 +196,10 @@ class ParqueaderoRoutes:
             try:
                 data = request.get_json()
                 modulo_id = data.get('moduloId')
-
-                modulo_ocupado = Parqueo.query.filter_by(modulo_id=modulo_id, fecha_hora_salida=None).first()
-
-                if modulo_ocupado is not None:
-                    return jsonify({'status': 'warning', 'message': 'El módulo seleccionado se encuentra ocupado'}), 200
-
                 modulo = Modulo.query.get(modulo_id)
+
                 placa = data.get('placa')
-                vehiculo = Vehiculo.query.filter_by(placa=placa).first()
+                vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
 
                 tipo_vehiculo = VehiculoTipo.query.get(data.get('vehiculoTipoId'))
                 tipo_vehiculo = {
@@ -193,71 +207,74 @@ class ParqueaderoRoutes:
                     'nombre': tipo_vehiculo.nombre
                 }
 
+                fecha_actual = datetime.now()
+                arrendamiento = None
                 if vehiculo is not None:
-
                     tarifa = Tarifa.query.get(vehiculo.tarifa_id)
-                    tipo_vehiculo['tarifa'] = {
-                        'id': tarifa.id,
-                        'nombre': tarifa.nombre,
-                        'costo': tarifa.costo
-                    }
 
-                    parqueo = Parqueo.query.filter_by(vehiculo_id=vehiculo.id, fecha_hora_salida=None).first()
+                    # Se decide con el mismo arrendamiento vigente que usa la liquidación al retirar el vehículo.
+                    arrendamiento = estado_arrendamientos.vigente(vehiculo.id, fecha_actual)
 
-                    if parqueo is not None:
-                        return jsonify({'status': 'warning', 'message': 'El vehículo ya se encuentra en el parqueadero'}), 200
-                    
-                if vehiculo is not None:
-                    fecha_actual = datetime.now()
-                    
-                    arrendamiento = Arrendamiento.query.filter_by(vehiculo_id=vehiculo.id).order_by(Arrendamiento.fecha_fin.desc()).first()
+                    if arrendamiento is None:
+                        ultimo = estado_arrendamientos.ultimo(vehiculo.id)
+                        if ultimo is not None:
+                            if ultimo.fecha_inicio > fecha_actual:
+                                return jsonify({'status': 'warning', 'message': 'El arrendamiento del vehículo aún no ha iniciado'}), 200
 
-                    if arrendamiento is not None:
-                        if fecha_actual > arrendamiento.fecha_fin:
                             return jsonify({'status': 'warning', 'message': 'El arrendamiento del vehículo ha finalizado'}), 200
-                        
-                        if arrendamiento.ha_sido_pausado:
+                    else:
+                        if arrendamiento.estado == PAUSADO:
                             return jsonify({'status': 'warning', 'message': 'El arrendamiento del vehículo se encuentra en pausa'}), 200
-                        
-                        parqueo = Parqueo(
-                            vehiculo_id=vehiculo.id,
-                            modulo_id=modulo.id,
-                        )
 
                         tarifa = Tarifa.query.get(arrendamiento.tarifa_id)
-
-                        db.session.add(parqueo)
-                        db.session.commit()
-
-                        return jsonify({'status': 'arrendamiento', 'message': 'El vehículo cuenta con un arrendamiento activo. Puede ingresar al parqueadero.', 'tipoVehiculo': tipo_vehiculo, 'tarifa': tarifa}), 200
-
-
-                if vehiculo is None:
-                    vehiculo_tipo_id = data.get('vehiculoTipoId')
+                else:
                     vehiculo = Vehiculo(
-                        placa=placa,
-                        vehiculo_tipo_id=vehiculo_tipo_id,
+                        placa=normalizar_placa(placa),
+                        vehiculo_tipo_id=data.get('vehiculoTipoId'),
                         tarifa_id=data.get('tarifaId'),
                     )
-
                     tarifa = Tarifa.query.get(data.get('tarifaId'))
-                    tipo_vehiculo['tarifa'] = {
-                        'id': tarifa.id,
-                        'nombre': tarifa.nombre,
-                        'costo': tarifa.costo
-                    }
 
                     db.session.add(vehiculo)
                     db.session.flush()
-                
+
+                tipo_vehiculo['tarifa'] = {
+                    'id': tarifa.id,
+                    'nombre': tarifa.nombre,
+                    'costo': tarifa.costo
+                }
+
+                # Los índices únicos sobre los parqueos abiertos rechazan el módulo ocupado o el vehículo
+                # ya parqueado aunque otro operario haya registrado el ingreso en paralelo.
                 parqueo = Parqueo(
                     vehiculo_id=vehiculo.id,
                     modulo_id=modulo.id,
+                    fecha_hora_entrada=fecha_actual,
                 )
 
                 db.session.add(parqueo)
 
-                db.session.commit()
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    db.session.rollback()
+                    return jsonify({'status': 'warning', 'message': mensaje_conflicto_ingreso(modulo, placa)}), 200
+
+                ocupacion_modulos.ocupar(modulo.sede_id, modulo.id)
+                indice_placas.agregar(modulo.sede.parqueadero_id, vehiculo)
+                bus_eventos.publicar(modulo.sede_id, 'ingreso', fila_parqueo(parqueo, vehiculo, modulo, tipo_vehiculo, tarifa, arrendamiento is not None))
+
+                if arrendamiento is not None:
+                    return jsonify({'status': 'arrendamiento', 'message': 'El vehículo cuenta con un arrendamiento activo. Puede ingresar al parqueadero.', 'tipoVehiculo': tipo_vehiculo, 'tarifa': tipo_vehiculo['tarifa']}), 200
+
+                if data.get('pregenerarTicket'):
+                    parqueadero = Parqueadero.query.filter_by(usuario_id=current_user.parqueadero_id).first()
+                    generador_tickets.encolar(
+                        parqueo.id,
+                        parqueadero,
+                        datos_ticket(vehiculo, tarifa, parqueo),
+                        current_app.config.get('TICKETS_HILOS', 2)
+                    )
 
                 return jsonify({'status': 'success', 'message': 'Vehículo ingresado al parqueadero', 'data': {
                     'tipoVehiculo': tipo_vehiculo
@@ -267,16 +284,93 @@ class ParqueaderoRoutes:
                 db.session.rollback()
                 return jsonify({'status': 'error', 'message': str(e)}), 500
 
+        def mensaje_conflicto_ingreso(modulo, placa):
+            """
+            Determina por qué fue rechazado el ingreso de un vehículo por los índices de parqueos abiertos.
+
+            :param modulo: Módulo solicitado.
+            :param placa: Placa del vehículo.
+            :return: Mensaje para el operario.
+            """
+            if Parqueo.query.filter_by(modulo_id=modulo.id, fecha_hora_salida=None).first() is not None:
+                ocupacion_modulos.ocupar(modulo.sede_id, modulo.id)
+                return 'El módulo seleccionado se encuentra ocupado'
+
+            return 'El vehículo ya se encuentra en el parqueadero'
+
+        def fila_parqueo(parqueo, vehiculo, modulo, tipo_vehiculo, tarifa, es_arrendamiento):
+            """
+            Construye la fila de un parqueo activo con el mismo formato de `/sede/<id>/parqueos-activos`.
+
+            :param parqueo: Parqueo recién registrado.
+            :param vehiculo: Vehículo parqueado.
+            :param modulo: Módulo ocupado.
+            :param tipo_vehiculo: Tipo del vehículo.
+            :param tarifa: Tarifa aplicada al parqueo.
+            :param es_arrendamiento: Indica si el vehículo ingresó con un arrendamiento.
+            :return: Diccionario con los datos del parqueo.
+            """
+            return {
+                'id': parqueo.id,
+                'vehiculo': {
+                    'id': vehiculo.id,
+                    'placa': vehiculo.placa,
+                    'marca': vehiculo.marca,
+                    'modelo': vehiculo.modelo,
+                    'tipo': tipo_vehiculo['nombre'],
+                    'tarifa': {
+                        'id': tarifa.id,
+                        'nombre': tarifa.nombre,
+                        'costo': tarifa.costo
+                    }
+                },
+                'modulo': {
+                    'id': modulo.id,
+                    'nombre': modulo.nombre,
+                    'habilitado': modulo.habilitado,
+                    'descripcion': modulo.descripcion
+                },
+                'fechaHoraEntrada': parqueo.fecha_hora_entrada,
+                'fechaHoraSalida': None,
+                'esArrendamiento': es_arrendamiento,
+                'total': None if es_arrendamiento else 0
+            }
+
+
+        @self.blueprint.route('/parqueo/vehiculo/<string:placa>/total', methods=['GET'])
+        @login_required
+        @operario_permission.require(http_exception=403)
+        def total_parqueo(placa):
+            """
+            Calcula el valor a cobrar por el parqueo activo de un vehículo.
+
+            :param placa: Placa del vehículo.
+            :return: Respuesta JSON.
+            """
+            vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
+            if not vehiculo:
+                return jsonify({'status': 'error', 'message': 'Vehículo no encontrado'}), 404
+
+            parqueo = Parqueo.query.filter_by(vehiculo_id=vehiculo.id, fecha_hora_salida=None).first()
+            if not parqueo:
+                return jsonify({'status': 'error', 'message': 'Parqueo no encontrado o ya retirado'}), 404
+
+            es_arrendamiento, total = liquidar_parqueo(vehiculo, parqueo, datetime.now())
+
+            return jsonify({'status': 'success', 'data': {
+                'placa': vehiculo.placa,
+                'esArrendamiento': es_arrendamiento,
+                'total': total
+            }}), 200
+
 
         @self.blueprint.route('/parqueo/vehiculo/retirar', methods=['POST'])
         def retirar_vehiculo():
             data = request.get_json()
             placa = data.get('placa')
-            total_pagado = data.get('totalPagado')
             medio_pago_id = data.get('metodoPagoId')
-            es_arrendamiento = data.get('esArrendamiento')
 
-            vehiculo = Vehiculo.query.filter_by(placa=placa).first()
+            vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
             if not vehiculo:
                 return jsonify({'status': 'error', 'message': 'Vehículo no encontrado'}), 404
 
@@ -284,14 +378,61 @@ class ParqueaderoRoutes:
             if not parqueo:
                 return jsonify({'status': 'error', 'message': 'Parqueo no encontrado o ya retirado'}), 404
 
-            parqueo.fecha_hora_salida = datetime.now()
+            salida = datetime.now()
+            es_arrendamiento, total = liquidar_parqueo(vehiculo, parqueo, salida)
+            valores = {'fecha_hora_salida': salida}
             if not es_arrendamiento:
-                parqueo.total_pagado = total_pagado
-                parqueo.metodo_pago_id = medio_pago_id
+                valores.update(total_pagado=total, medio_pago_id=medio_pago_id)
+
+            # El parqueo se cierra con un UPDATE condicionado a que siga abierto: si dos peticiones
+            # retiran el mismo vehículo a la vez, solo una actualiza la fila, la suma a los resúmenes
+            # y otorga los puntos.
+            resultado = db.session.execute(
+                update(Parqueo)
+                .where(Parqueo.id == parqueo.id, Parqueo.fecha_hora_salida.is_(None))
+                .values(**valores),
+                execution_options={'synchronize_session': 'evaluate'}
+            )
+            if resultado.rowcount != 1:
+                db.session.rollback()
+                return jsonify({'status': 'error', 'message': 'El parqueo ya fue retirado'}), 409
+
+            registrar_cierre(parqueo, parqueo.modulo.sede_id, vehiculo.vehiculo_tipo_id)
 
+            puntos = 0
+            if not es_arrendamiento:
+                puntos = acumular_puntos(vehiculo.cliente_id, total)
             db.session.commit()
 
-            return jsonify({'status': 'success', 'message': 'Vehículo retirado exitosamente'}), 200
+            ocupacion_modulos.liberar(parqueo.modulo.sede_id, parqueo.modulo_id)
+            bus_eventos.publicar(parqueo.modulo.sede_id, 'retiro', {
+                'id': parqueo.id,
+                'placa': vehiculo.placa,
+                'moduloId': parqueo.modulo_id
+            })
+
+            return jsonify({'status': 'success', 'message': 'Vehículo retirado exitosamente', 'data': {
+                'esArrendamiento': es_arrendamiento,
+                'totalPagado': total,
+                'puntos': puntos
+            }}), 200
+
+        def liquidar_parqueo(vehiculo, parqueo, salida):
+            """
+            Liquida el valor de un parqueo con la tarifa del vehículo. No se cobra si el vehículo tenía
+            un arrendamiento vigente cuando ingresó.
+
+            :param vehiculo: Vehículo parqueado.
+            :param parqueo: Parqueo activo del vehículo.
+            :param salida: Fecha y hora de salida.
+            :return: Tupla con el indicador de arrendamiento y el total a cobrar.
+            """
+            es_arrendamiento = estado_arrendamientos.vigente(vehiculo.id, parqueo.fecha_hora_entrada) is not None
+
+            if es_arrendamiento:
+                return True, 0
+
+            return False, calcular_total(vehiculo.tarifa, parqueo.fecha_hora_entrada, salida)
 
 
         @self.blueprint.route('/usuario/activar-desactivar/<documento>', methods=['PUT'])
@@ -311,6 +452,7 @@ class ParqueaderoRoutes:
             usuario.activo = not usuario.activo
 
             db.session.commit()
+            cache_usuarios.invalidar(usuario.id)
 
             estado = 'activado' if usuario.activo else 'desactivado'
             return jsonify({'status': 'success', 'message': f'Usuario {estado} exitosamente'}), 200
@@ -326,7 +468,7 @@ class ParqueaderoRoutes:
             :param placa: Placa del vehículo.
             :return: Respuesta JSON.
             """
-            vehiculo = Vehiculo.query.filter_by(placa=placa).first()
+            vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
             if not vehiculo:
                 return jsonify({'status': 'error', 'message': 'Vehículo no encontrado'}), 404
 
@@ -359,7 +501,7 @@ class ParqueaderoRoutes:
             :return: Respuesta JSON.
             """
             data = request.get_json()
-            vehiculo = Vehiculo.query.filter_by(placa=placa).first()
+            vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
             if not vehiculo:
                 return jsonify({'status': 'error', 'message': 'Vehículo no encontrado'}), 404
 
@@ -377,100 +519,77 @@ class ParqueaderoRoutes:
             """
             Genera un ticket de parqueadero.
             """
-            
             parqueadero = Parqueadero.query.filter_by(usuario_id=current_user.parqueadero_id).first()
-            vehiculo = Vehiculo.query.filter_by(placa=placa).first()
-
-            tarifa = vehiculo.tarifa
-            tarifa_costo = tarifa.costo
-            tarifa_unidad_tiempo = tarifa.tarifa_tipo.nombre
-
-            nombre_parqueadero = parqueadero.nombre
-            registro_comercial = f'Registro comercial: {parqueadero.rut}'
-            costo_servicio = f'{tarifa_costo} por {tarifa_unidad_tiempo}'
-            nombre_atendedor = f'{current_user.nombres} {current_user.apellidos}'
-            condiciones_servicio = "Este servicio no se hace responsable por objetos dejados dentro del vehículo."
-
-            ticket_width = 8 * cm
-            ticket_height = 12 * cm
-
-            pdf_buffer = io.BytesIO()
-            c = canvas.Canvas(pdf_buffer, pagesize=(ticket_width, ticket_height))
-            ancho, alto = ticket_width, ticket_height
+            vehiculo = Vehiculo.query.filter_by(placa_normalizada=normalizar_placa(placa)).first()
+            parqueo = Parqueo.query.filter_by(vehiculo_id=vehiculo.id, fecha_hora_salida=None).first()
 
-            logo_path = os.path.join('app', 'static', 'images', 'logo-generico.png')
-            c.drawImage(logo_path, (ancho - 64) / 2, alto - 64, width=64, height=64, mask='auto')
+            pdf = generador_tickets.obtener(parqueo.id) if parqueo is not None else None
 
-            c.setFont("Helvetica-Bold", 12)
-            c.drawCentredString(ancho / 2, alto - 85, nombre_parqueadero)
+            if pdf is None:
+                pdf = generador_tickets.generar(parqueadero, datos_ticket(vehiculo, vehiculo.tarifa, parqueo))
 
-            c.setFont("Helvetica", 9)
-            y_position = alto - 100
-            line_spacing = 12
+            fecha_hora = datetime.now().strftime('%Y%m%d_%H%M%S')
+            nombre_archivo = f"ticket_parqueadero_{fecha_hora}.pdf"
 
-            c.drawString(0.5 * cm, y_position, f"Registro Comercial: {registro_comercial}")
-            y_position -= line_spacing
-            c.drawString(0.5 * cm, y_position, f"Fecha/Hora de Ingreso: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            y_position -= line_spacing
-            c.drawString(0.5 * cm, y_position, f"Placa del Vehículo: {placa}")
+            return send_file(io.BytesIO(pdf), mimetype='application/pdf', as_attachment=True, download_name=nombre_archivo)
 
-            y_position -= line_spacing * 1.5
-            c.setFont("Helvetica-Bold", 9)
-            c.drawString(0.5 * cm, y_position, "Detalles del Servicio")
-            y_position -= line_spacing
-            c.setFont("Helvetica", 9)
-            c.drawString(0.5 * cm, y_position, f"Costo: ${costo_servicio}")
-            y_position -= line_spacing
-            c.drawString(0.5 * cm, y_position, f"Atendido por: {nombre_atendedor}")
 
-            qr_data = f"""
-            Nombre del Parqueadero: {nombre_parqueadero}
-            Registro Comercial: {registro_comercial}
-            Fecha/Hora de Ingreso: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            Placa del Vehículo: {placa}
-            Costo por unidad de tiempo: $ {costo_servicio}
-            Atendido por: {nombre_atendedor}
-            Condiciones: {condiciones_servicio}
+        @self.blueprint.route('/generar_tickets', methods=['POST'])
+        @login_required
+        @operario_permission.require(http_exception=403)
+        def generar_tickets():
             """
-            qr = qrcode.make(qr_data)
-
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_qr_file:
-                qr.save(temp_qr_file.name)
-                qr_path = temp_qr_file.name
+            Genera un único PDF con los tickets de varias placas, uno por página.
 
-            c.drawImage(qr_path, ancho - 2.5 * cm, alto - 11.5 * cm, width=2 * cm, height=2 * cm)
-
-            # Condiciones del servicio
-            y_position -= line_spacing * 2
-            c.setFont("Helvetica-Bold", 9)
-            c.drawString(0.5 * cm, y_position, "Condiciones del Servicio:")
-            y_position -= line_spacing
-
-            styles = getSampleStyleSheet()
-            style = styles['Normal']
-            style.fontName = 'Helvetica'
-            style.fontSize = 7
-            style.leading = 10
-
-            paragraph = Paragraph(condiciones_servicio, style)
-
-            width, height = paragraph.wrap(ticket_width - 20, 0)
+            :return: Archivo PDF.
+            """
+            placas = request.get_json().get('placas') or []
+
+            vehiculos = (
+                Vehiculo.query
+                .options(joinedload(Vehiculo.tarifa).joinedload(Tarifa.tarifa_tipo))
+                .filter(Vehiculo.placa_normalizada.in_([normalizar_placa(placa) for placa in placas]))
+                .all()
+            ) if placas else []
+
+            if not vehiculos:
+                return jsonify({'status': 'error', 'message': 'No se encontraron vehículos con las placas indicadas'}), 404
+
+            parqueos = {
+                int(parqueo.vehiculo_id): parqueo
+                for parqueo in Parqueo.query.filter(
+                    Parqueo.vehiculo_id.in_([vehiculo.id for vehiculo in vehiculos]),
+                    Parqueo.fecha_hora_salida == None
+                )
+            }
+            vehiculos = {vehiculo.placa_normalizada: vehiculo for vehiculo in vehiculos}
+            seleccionados = [vehiculos[placa] for placa in map(normalizar_placa, placas) if placa in vehiculos]
 
-            c.setFont("Helvetica", 7)
-            text = c.beginText(0.5 * cm, y_position)
-            text.setTextOrigin(0.5 * cm, y_position)
-            text.setLeading(10)
-            text.setFont("Helvetica", 7)
+            parqueadero = Parqueadero.query.filter_by(usuario_id=current_user.parqueadero_id).first()
+            lista_datos = [
+                datos_ticket(vehiculo, vehiculo.tarifa, parqueos.get(vehiculo.id))
+                for vehiculo in seleccionados
+            ]
 
-            paragraph.drawOn(c, 0.5 * cm, y_position - height)
+            pdf = generador_tickets.generar_lote(parqueadero, lista_datos)
 
-            c.showPage()
-            c.save()
+            fecha_hora = datetime.now().strftime('%Y%m%d_%H%M%S')
+            nombre_archivo = f"tickets_parqueadero_{fecha_hora}.pdf"
 
-            pdf_buffer.seek(0)
-            os.remove(qr_path)
+            return send_file(io.BytesIO(pdf), mimetype='application/pdf', as_attachment=True, download_name=nombre_archivo)
 
-            fecha_hora = datetime.now().strftime('%Y%m%d_%H%M%S')
-            nombre_archivo = f"ticket_parqueadero_{fecha_hora}.pdf"
+        def datos_ticket(vehiculo, tarifa, parqueo=None):
+            """
+            Reúne los campos variables del ticket de un vehículo.
 
-            return send_file(pdf_buffer, mimetype='application/pdf', as_attachment=True, download_name=nombre_archivo)
+            :param vehiculo: Vehículo parqueado.
+            :param tarifa: Tarifa aplicada al vehículo.
+            :param parqueo: Parqueo activo del vehículo, si existe.
+            :return: Campos variables del ticket.
+            """
+            return DatosTicket(
+                placa=vehiculo.placa,
+                fecha_ingreso=parqueo.fecha_hora_entrada if parqueo is not None else datetime.now(),
+                costo_servicio=f'{tarifa.costo} por {tarifa.tarifa_tipo.nombre}',
+                atendido_por=f'{current_user.nombres} {current_user.apellidos}'
+            )
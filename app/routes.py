@@ -3,10 +3,11 @@ from flask_login import current_user, login_user, logout_user, login_required
 from flask_principal import Permission, RoleNeed, UserNeed, identity_loaded, identity_changed, Identity, AnonymousIdentity
 from werkzeug.security import generate_password_hash
 
-from app import app, db
+from app import db
 
 from app.forms import CambiarClaveForm, ParqueaderoInformacionForm, UsuarioForm
 from app.models import Arrendamiento, Cliente, MedioPago, Modulo, Pais, Parqueadero, Parqueo, Periodicidad, Rol, Sede, SedeUsuario, Tarifa, TarifaTipo, Usuario, Vehiculo, VehiculoTipo, usuario_rol
+from app.util.catalogos import catalogos
 from app.util.roles_enum import Roles
 
 propietario_role = RoleNeed(Roles.PROPIETARIO.value)
@@ -32,7 +33,6 @@ def tiene_rol(roles_disponibles, roles_asignados):
     return set(roles_asignados).intersection(roles_disponibles)
 
 
-@identity_loaded.connect_via(app)
 def on_identity_loaded(sender, identity):
     identity.user = current_user
 
@@ -44,7 +44,6 @@ def on_identity_loaded(sender, identity):
             identity.provides.add(RoleNeed(role.nombre))
 
 
-@app.context_processor
 def inject_permissions():
     # Inyecta los permisos solo si base.html es la plantilla base
     if 'base.html' in g.get('template_name', ''):
@@ -57,7 +56,6 @@ def inject_permissions():
     return {}
 
 
-@app.route("/")
 def index():
     """
     Muestra la página de inicio de la aplicación.
@@ -67,7 +65,6 @@ def index():
     return render_template("login.html", titulo='Inicio', nombre='Alex')
 
 
-@app.route('/dashboard', methods=['GET'])
 @login_required
 @propietario_admin_permission.require(http_exception=403)
 def dashboard():
@@ -77,27 +74,46 @@ def dashboard():
     :return: Plantilla HTML.
     """
     g.template_name = 'base.html'
-    return render_template('dashboard.html', titulo='Dashboard')
-
-
-from app.auth_routes import AuthRoutes
-from app.cliente_vehiculo_routes import ClienteVehiculoRoutes
-from app.cliente_vehiculo_arrendamiento_routes import ClienteVehiculoArrendamientoRoutes
-from app.vehiculo_tipo_routes import VehiculoTipoRoutes
-from app.tarifa_tipo_routes import TarifaTipoRoutes
-from app.medio_pago_routes import MedioPagoRoutes
-from app.cliente_routes import ClienteRoutes
-from app.parqueadero_routes import ParqueaderoRoutes
-from app.sede_routes import SedeRoutes
-from app.usuario_routes import UsuarioRoutes
-
-app.register_blueprint(AuthRoutes().blueprint)
-app.register_blueprint(ClienteRoutes().blueprint)
-app.register_blueprint(ClienteVehiculoRoutes().blueprint)
-app.register_blueprint(ClienteVehiculoArrendamientoRoutes().blueprint)
-app.register_blueprint(MedioPagoRoutes().blueprint)
-app.register_blueprint(ParqueaderoRoutes().blueprint)
-app.register_blueprint(SedeRoutes().blueprint)
-app.register_blueprint(TarifaTipoRoutes().blueprint)
-app.register_blueprint(UsuarioRoutes().blueprint)
-app.register_blueprint(VehiculoTipoRoutes().blueprint)
+
+    sedes = [sede for sede in catalogos.obtener(Sede) if sede['parqueadero_id'] == current_user.parqueadero_id]
+
+    return render_template('dashboard.html', titulo='Dashboard', sedes=sedes)
+
+
+def registrar_rutas(app):
+    """
+    Registra en la aplicación las vistas generales, los blueprints y los manejadores de identidad.
+
+    :param app: Aplicación de Flask.
+    """
+    from app.analitica_routes import AnaliticaRoutes
+    from app.auth_routes import AuthRoutes
+    from app.cliente_vehiculo_routes import ClienteVehiculoRoutes
+    from app.cliente_vehiculo_arrendamiento_routes import ClienteVehiculoArrendamientoRoutes
+    from app.exportacion_routes import ExportacionRoutes
+    from app.vehiculo_tipo_routes import VehiculoTipoRoutes
+    from app.tarifa_tipo_routes import TarifaTipoRoutes
+    from app.medio_pago_routes import MedioPagoRoutes
+    from app.cliente_routes import ClienteRoutes
+    from app.parqueadero_routes import ParqueaderoRoutes
+    from app.sede_routes import SedeRoutes
+    from app.usuario_routes import UsuarioRoutes
+
+    identity_loaded.connect_via(app)(on_identity_loaded)
+    app.context_processor(inject_permissions)
+
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/dashboard', 'dashboard', dashboard, methods=['GET'])
+
+    app.register_blueprint(AnaliticaRoutes().blueprint)
+    app.register_blueprint(AuthRoutes().blueprint)
+    app.register_blueprint(ClienteRoutes().blueprint)
+    app.register_blueprint(ClienteVehiculoRoutes().blueprint)
+    app.register_blueprint(ClienteVehiculoArrendamientoRoutes().blueprint)
+    app.register_blueprint(ExportacionRoutes().blueprint)
+    app.register_blueprint(MedioPagoRoutes().blueprint)
+    app.register_blueprint(ParqueaderoRoutes().blueprint)
+    app.register_blueprint(SedeRoutes().blueprint)
+    app.register_blueprint(TarifaTipoRoutes().blueprint)
+    app.register_blueprint(UsuarioRoutes().blueprint)
+    app.register_blueprint(VehiculoTipoRoutes().blueprint)
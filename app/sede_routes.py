@@ -1,13 +1,20 @@
 from datetime import datetime
 
-from flask import Blueprint, g, jsonify, render_template, request
+from flask import Blueprint, Response, current_app, g, jsonify, render_template, request
 from flask_login import current_user, login_required
+from sqlalchemy.orm import contains_eager, joinedload
 
-from app.models import Arrendamiento, Modulo, Parqueadero, Parqueo, Sede, SedeUsuario, Usuario
+from app.models import Modulo, Parqueadero, Parqueo, Sede, SedeUsuario, Tarifa, Usuario, Vehiculo
 
 from app import db
 from app.routes import propietario_admin_permission
 from app.routes import todos_permiso, operario_permission
+from app.util.arrendamientos import estado_arrendamientos
+from app.util.catalogos import catalogos
+from app.util.cobro import calcular_totales
+from app.util.eventos import bus_eventos
+from app.util.ocupacion import ocupacion_modulos
+from app.util.sesiones import cache_usuarios
 
 
 class SedeRoutes:
@@ -59,6 +66,7 @@ class SedeRoutes:
 
                 db.session.add(entidad)
                 db.session.commit()
+                catalogos.invalidar(Sede)
 
                 return jsonify({'status': 'success', 'message': 'Sede creada', 'data': {
                     'id': entidad.id,
@@ -98,6 +106,7 @@ class SedeRoutes:
                 entidad.updated_at = db.func.current_timestamp()
 
                 db.session.commit()
+                catalogos.invalidar(Sede)
 
                 return jsonify({'status': 'success', 'message': 'Sede actualizada', 'data': {
                     'id': entidad.id,
@@ -131,6 +140,7 @@ class SedeRoutes:
 
                 db.session.delete(entidad)
                 db.session.commit()
+                catalogos.invalidar(Sede)
 
                 return jsonify({'status': 'success', 'message': 'Sede eliminada'}), 200
 
@@ -149,15 +159,15 @@ class SedeRoutes:
             :param id: Identificador de la sede.
             :return: Plantilla HTML.
             """
-            sede = Sede.query.get(id)
-            modulos = sede.modulos
+            modulos = Modulo.query.filter_by(sede_id=id).all()
+            ocupados = ocupacion_modulos.ocupados(id)
 
             return jsonify({'status': 'success', 'message': 'Consulta realizada de forma satisfactoria', 'data': [{
                 'id': modulo.id,
                 'nombre': modulo.nombre,
                 'habilitado': modulo.habilitado,
                 'descripcion': modulo.descripcion,
-                'disponible': not bool(Parqueo.query.filter_by(modulo_id=modulo.id, fecha_hora_salida=None).count())
+                'disponible': modulo.id not in ocupados
             } for modulo in modulos]}), 200
 
 
@@ -221,6 +231,14 @@ class SedeRoutes:
 
                 db.session.commit()
 
+                bus_eventos.publicar(entidad.sede_id, 'modulo', {
+                    'id': entidad.id,
+                    'nombre': entidad.nombre,
+                    'habilitado': entidad.habilitado,
+                    'descripcion': entidad.descripcion,
+                    'disponible': not ocupacion_modulos.esta_ocupado(entidad.sede_id, entidad.id)
+                })
+
                 return jsonify({'status': 'success', 'message': 'Módulo actualizado', 'data': {
                     'id': entidad.id,
                     'nombre': entidad.nombre,
@@ -254,6 +272,8 @@ class SedeRoutes:
                 db.session.delete(entidad)
                 db.session.commit()
 
+                ocupacion_modulos.liberar(id, modulo_id)
+
                 return jsonify({'status': 'success', 'message': 'Módulo eliminado'}), 200
 
             except Exception as e:
@@ -287,6 +307,7 @@ class SedeRoutes:
                 asignacion = SedeUsuario(sede_id=sede_id, usuario_id=usuario.id)
                 db.session.add(asignacion)
                 db.session.commit()
+                cache_usuarios.invalidar(usuario.id)
 
                 return jsonify({'status': 'success', 'message': 'Usuario asignado a la sede'}), 200
 
@@ -314,6 +335,23 @@ class SedeRoutes:
                 'usuario_id': asignacion.usuario_id
             } for asignacion in asignaciones]}), 200
         
+        @self.blueprint.route('/sede/<int:sede_id>/eventos', methods=['GET'])
+        @login_required
+        @operario_permission.require(http_exception=403)
+        def sede_eventos(sede_id):
+            """
+            Transmite como Server-Sent Events los ingresos, retiros, cambios de módulos y pausas de arrendamientos de una sede.
+
+            :param sede_id: Identificador de la sede.
+            :return: Flujo de eventos.
+            """
+            flujo = bus_eventos.flujo(sede_id, current_app.config.get('EVENTOS_LATIDO', 15))
+
+            return Response(flujo, mimetype='text/event-stream', headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            })
+
         @self.blueprint.route('/sede/<int:sede_id>/parqueos-activos', methods=['GET'])
         @login_required
         @operario_permission.require(http_exception=403)
@@ -328,10 +366,38 @@ class SedeRoutes:
             parqueos = (
                 Parqueo.query
                 .join(Modulo, Parqueo.modulo_id == Modulo.id)
+                .options(
+                    contains_eager(Parqueo.modulo),
+                    joinedload(Parqueo.vehiculo).joinedload(Vehiculo.vehiculo_tipo),
+                    joinedload(Parqueo.vehiculo).joinedload(Vehiculo.tarifa).joinedload(Tarifa.tarifa_tipo)
+                )
                 .filter(Modulo.sede_id == sede_id, Parqueo.fecha_hora_salida == None)
                 .all()
             )
 
+            fecha_actual = datetime.now()
+            arrendamientos_vigentes = {}
+            for parqueo in parqueos:
+                arrendamiento = estado_arrendamientos.vigente(parqueo.vehiculo.id, parqueo.fecha_hora_entrada)
+                if arrendamiento is not None:
+                    arrendamientos_vigentes[parqueo.vehiculo.id] = arrendamiento
+
+            tarifa_ids = {arrendamiento.tarifa_id for arrendamiento in arrendamientos_vigentes.values()}
+            tarifas = {
+                tarifa.id: tarifa for tarifa in Tarifa.query.filter(Tarifa.id.in_(tarifa_ids)).all()
+            } if tarifa_ids else {}
+
+            cobrables = [parqueo for parqueo in parqueos if parqueo.vehiculo.id not in arrendamientos_vigentes]
+            totales = dict(zip(
+                [parqueo.id for parqueo in cobrables],
+                calcular_totales(
+                    [parqueo.vehiculo.tarifa.costo for parqueo in cobrables],
+                    [parqueo.vehiculo.tarifa.tarifa_tipo.unidad for parqueo in cobrables],
+                    [parqueo.fecha_hora_entrada for parqueo in cobrables],
+                    fecha_actual
+                )
+            ))
+
             return jsonify({
                 'status': 'success',
                 'message': 'Consulta realizada de forma satisfactoria',
@@ -344,7 +410,7 @@ class SedeRoutes:
                             'marca': parqueo.vehiculo.marca,
                             'modelo': parqueo.vehiculo.modelo,
                             'tipo': parqueo.vehiculo.vehiculo_tipo.nombre,
-                            'tarifa': determinar_tarifa(parqueo)
+                            'tarifa': determinar_tarifa(parqueo, arrendamientos_vigentes.get(parqueo.vehiculo.id), tarifas)
                         },
                         'modulo': {
                             'id': parqueo.modulo_id,
@@ -354,36 +420,32 @@ class SedeRoutes:
                         },
                         'fechaHoraEntrada': parqueo.fecha_hora_entrada,
                         'fechaHoraSalida': parqueo.fecha_hora_salida,
-                        'esArrendamiento': Arrendamiento.query.filter_by(vehiculo_id=parqueo.vehiculo_id).first() is not None
+                        'esArrendamiento': parqueo.vehiculo.id in arrendamientos_vigentes,
+                        'total': totales.get(parqueo.id)
                     }
                     for parqueo in parqueos
                 ]
             }), 200
 
-        def determinar_tarifa(parqueo):
+        def determinar_tarifa(parqueo, arrendamiento, tarifas):
             """
             Determina la tarifa de un parqueo.
 
             :param parqueo: Parqueo.
+            :param arrendamiento: Arrendamiento vigente del vehículo o None.
+            :param tarifas: Tarifas de los arrendamientos vigentes por identificador.
             :return: Tarifa.
             """
-            fecha_actual = datetime.now()
-
-            arrendamiento = Arrendamiento.query.filter(
-                Arrendamiento.vehiculo_id == parqueo.vehiculo_id,
-                Arrendamiento.fecha_inicio <= fecha_actual,
-                Arrendamiento.fecha_fin >= fecha_actual
-            ).first()
-
             if arrendamiento:
+                tarifa = tarifas[arrendamiento.tarifa_id]
                 return {
-                    'id': arrendamiento.tarifa_id,
-                    'nombre': arrendamiento.tarifa.nombre,
-                    'costo': arrendamiento.tarifa.costo
+                    'id': tarifa.id,
+                    'nombre': tarifa.nombre,
+                    'costo': tarifa.costo
                 }
             
             return {
                 'id': parqueo.vehiculo.tarifa_id,
                 'nombre': parqueo.vehiculo.tarifa.nombre,
                 'costo': parqueo.vehiculo.tarifa.costo
-            }
\ No newline at end of file
+            }
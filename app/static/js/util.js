@@ -13,4 +13,41 @@ function formatearDinero(valor, cantidadDigitos) {
 
 
     return (amount / 100).toLocaleString('es-CO', { minimumFractionDigits: 0, maximumFractionDigits: 0 });
-}
\ No newline at end of file
+}
+
+/**
+ * Construye la configuración `ajax` de una tabla DataTables en modo `serverSide`.
+ *
+ * Cuando la tabla avanza a la página siguiente sin orden explícito ni cambios en la búsqueda,
+ * envía `despuesDe` con el id de la última fila recibida para que el servidor pagine por llave.
+ *
+ * @param {*} url URL del endpoint paginado.
+ * @returns Configuración para la opción `ajax` de DataTables.
+ */
+function ajaxPaginado(url) {
+    const estado = { inicio: null, longitud: null, busqueda: null, ultimoId: null };
+
+    return {
+        url: url,
+        data: function (d) {
+            const siguiente = estado.ultimoId !== null
+                && d.order.length == 0
+                && d.search.value === estado.busqueda
+                && d.length === estado.longitud
+                && d.start === estado.inicio + estado.longitud;
+
+            if (siguiente) {
+                d.despuesDe = estado.ultimoId;
+            }
+
+            estado.inicio = d.start;
+            estado.longitud = d.length;
+            estado.busqueda = d.search.value;
+            estado.ultimoId = null;
+        },
+        dataSrc: function (json) {
+            estado.ultimoId = json.ultimoId;
+            return json.data;
+        }
+    };
+}
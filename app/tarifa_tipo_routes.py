@@ -6,6 +6,7 @@ from app.models import TarifaTipo
 from app import db
 from app.routes import propietario_admin_permission
 from app.routes import todos_permiso
+from app.util.catalogos import catalogos
 
 
 class TarifaTipoRoutes:
@@ -32,7 +33,7 @@ class TarifaTipoRoutes:
             """
             g.template_name = 'base.html'
             
-            entidades = TarifaTipo.query.all()
+            entidades = catalogos.obtener(TarifaTipo)
             return render_template("tarifa-tipo.html", titulo='Tipo de Tarifa', entidades=entidades)
 
         @self.blueprint.route('/tarifa-tipo', methods=['POST'])
@@ -50,6 +51,7 @@ class TarifaTipoRoutes:
 
                 db.session.add(entidad)
                 db.session.commit()
+                catalogos.invalidar(TarifaTipo)
 
                 return jsonify({'status': 'success', 'message': 'Tipo de tarifa creado', 'data': {
                     'id': entidad.id,
@@ -84,6 +86,7 @@ class TarifaTipoRoutes:
                 entidad.updated_at = db.func.current_timestamp()
 
                 db.session.commit()
+                catalogos.invalidar(TarifaTipo)
 
                 return jsonify({'status': 'success', 'message': 'Tipo de tarifa actualizado', 'data': {
                     'id': entidad.id,
@@ -114,6 +117,7 @@ class TarifaTipoRoutes:
 
                 db.session.delete(entidad)
                 db.session.commit()
+                catalogos.invalidar(TarifaTipo)
 
                 return jsonify({'status': 'success', 'message': 'Tipo de tarifa eliminado'}), 200
 
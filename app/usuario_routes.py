@@ -1,12 +1,15 @@
 from flask import Blueprint, g, jsonify, render_template, request
 from flask_login import current_user, login_required
-from werkzeug.security import generate_password_hash
 
-from app.models import Parqueadero, Rol, Sede, SedeUsuario, Usuario
+from app.models import Rol, Sede, SedeUsuario, Usuario
 
 from app import db
 from app.routes import propietario_admin_permission, usuario_rol
 from app.routes import todos_permiso
+from app.util.autenticacion import generar_hash
+from app.util.catalogos import catalogos
+from app.util.paginacion import paginar
+from app.util.sesiones import cache_usuarios
 
 
 class UsuarioRoutes:
@@ -29,24 +32,47 @@ class UsuarioRoutes:
             Muestra la lista de usuarios.
             """
             g.template_name = 'base.html'
-            
-            entidades = Usuario.query.all()
-            for e in entidades:
-                print(e)
-
-            parqueadero = Parqueadero.query.filter_by(usuario_id=current_user.parqueadero_id).first()
-
-            if parqueadero is not None:
-                entidades = Usuario.query.filter_by(parqueadero_id=parqueadero.id).all()
 
-            roles = Rol.query.all()
-            sedes = Sede.query.all()
+            roles = catalogos.obtener(Rol)
+            sedes = catalogos.obtener(Sede)
 
             roles_nombres = [r.nombre for r in current_user.roles]
 
             es_propietario = 'Propietario' in roles_nombres
             
-            return render_template('usuario.html', titulo='Usuarios', entidades=entidades, roles=roles, sedes=sedes, es_propietario=es_propietario)
+            return render_template('usuario.html', titulo='Usuarios', roles=roles, sedes=sedes, es_propietario=es_propietario)
+
+
+        @self.blueprint.route("/usuario/datos", methods=['GET'])
+        @login_required
+        @propietario_admin_permission.require(http_exception=403)
+        def usuario_datos():
+            """
+            Recupera una página de los usuarios del parqueadero del usuario con el protocolo de DataTables.
+
+            :return: Respuesta JSON.
+            """
+            consulta = Usuario.query.filter_by(parqueadero_id=current_user.parqueadero_id)
+            columnas = [
+                Usuario.documento,
+                Usuario.nombres + ' ' + Usuario.apellidos,
+                Usuario.telefono,
+                Usuario.email,
+                None,
+                None,
+                None,
+                None
+            ]
+
+            return jsonify(paginar(consulta, Usuario.id, columnas, request.args, lambda e: [
+                e.documento,
+                f'{e.nombres} {e.apellidos}',
+                e.telefono,
+                e.email,
+                ', '.join(rol.nombre for rol in e.roles),
+                e.activo,
+                '<span class="badge badge-success">Sí</span>' if e.activo else '<span class="badge badge-warning">No</span>'
+            ])), 200
 
 
         @self.blueprint.route('/usuario', methods=['POST'])
@@ -66,7 +92,7 @@ class UsuarioRoutes:
                 if entidad is not None:
                     return jsonify({'status': 'existente', 'message': 'Ya existe un usuario con el documento dado.'}), 200
 
-                hashed_password = generate_password_hash(data.get('password'), method='pbkdf2:sha256')
+                hashed_password = generar_hash(data.get('password'))
 
                 entidad = Usuario(
                     documento=data.get('documento'),
@@ -127,6 +153,7 @@ class UsuarioRoutes:
                 entidad.updated_at = db.func.current_timestamp()
 
                 db.session.commit()
+                cache_usuarios.invalidar(entidad.id)
 
                 return jsonify({'status': 'success', 'message': 'Usuario actualizado', 'data': {
                     'id': entidad.id,
@@ -168,6 +195,7 @@ class UsuarioRoutes:
 
                 db.session.delete(entidad)
                 db.session.commit()
+                cache_usuarios.invalidar(entidad.id)
 
                 return jsonify({'status': 'success', 'message': 'Usuario eliminado'}), 200
 
@@ -192,12 +220,13 @@ class UsuarioRoutes:
                 if entidad is None:
                     return jsonify({'status': 'failure', 'message': 'Usuario no encontrado'}), 404
 
-                hashed_password = generate_password_hash(data.get('password'), method='pbkdf2:sha256')
+                hashed_password = generar_hash(data.get('password'))
 
                 entidad.password = hashed_password
                 entidad.updated_at = db.func.current_timestamp()
 
                 db.session.commit()
+                cache_usuarios.invalidar(entidad.id)
 
                 return jsonify({'status': 'success', 'message': 'Contraseña actualizada'}), 200
 
@@ -0,0 +1,196 @@
+from array import array
+from datetime import datetime, timedelta
+import math
+
+from sqlalchemy import BigInteger, cast, func, select
+
+from app import db
+from app.models import ParqueoOcupacionHoraria, ParqueoResumenDiario, Sede
+from app.util.resumenes import SEGUNDOS_HORA, a_segundos
+
+# Un año completo más un margen; limita el tamaño de las series que se devuelven.
+DIAS_MAXIMOS = 400
+
+
+def leer_rango(args):
+    """
+    Lee el rango de fechas y la sede de los parámetros de una petición de analítica.
+
+    `desde` y `hasta` tienen el formato `AAAA-MM-DD` y ambos días se incluyen; por defecto se toman
+    los últimos 30 días.
+
+    :param args: Parámetros de la petición.
+    :return: Tupla con el inicio, el fin exclusivo y el identificador de la sede (o None).
+    :raises ValueError: Si las fechas no son válidas o el rango excede `DIAS_MAXIMOS`.
+    """
+    hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    hasta = datetime.strptime(args['hasta'], '%Y-%m-%d') if args.get('hasta') else hoy
+    desde = datetime.strptime(args['desde'], '%Y-%m-%d') if args.get('desde') else hasta - timedelta(days=29)
+    hasta += timedelta(days=1)
+
+    if desde >= hasta:
+        raise ValueError('La fecha inicial debe ser anterior a la final')
+
+    if (hasta - desde).days > DIAS_MAXIMOS:
+        raise ValueError(f'El rango no puede superar {DIAS_MAXIMOS} días')
+
+    sede_id = args.get('sedeId', type=int)
+
+    return desde, hasta, sede_id
+
+
+def filtrar(consulta, resumen, parqueadero_id, desde, hasta, sede_id=None):
+    """
+    Restringe una consulta sobre una tabla de resumen al parqueadero, al rango y opcionalmente a una sede.
+
+    :param consulta: Consulta sobre la tabla de resumen.
+    :param resumen: Modelo de la tabla de resumen.
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango.
+    :param hasta: Fin exclusivo del rango.
+    :param sede_id: Identificador de una sede para restringir la consulta.
+    :return: Consulta filtrada.
+    """
+    consulta = (
+        consulta
+        .join(Sede, resumen.sede_id == Sede.id)
+        .where(Sede.parqueadero_id == parqueadero_id, resumen.fecha >= desde.date(), resumen.fecha < hasta.date())
+    )
+
+    if sede_id is not None:
+        consulta = consulta.where(resumen.sede_id == sede_id)
+
+    return consulta
+
+
+def sumar(columna):
+    """
+    Suma una columna entera de los resúmenes y convierte el resultado a entero.
+
+    En PostgreSQL `SUM` sobre una columna entera devuelve `numeric`, que llega como `Decimal` y no
+    puede acumularse en un `array('q')` ni serializarse como número.
+
+    :param columna: Columna a sumar.
+    :return: Expresión de la suma.
+    """
+    return cast(func.sum(columna), BigInteger)
+
+
+def ingresos(parqueadero_id, desde, hasta, sede_id=None):
+    """
+    Suma el valor pagado por los parqueos que salieron dentro del rango.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango.
+    :param hasta: Fin exclusivo del rango.
+    :param sede_id: Identificador de una sede para restringir la consulta.
+    :return: Diccionario con el total, el total por día, por sede y por medio de pago.
+    """
+    resumen = ParqueoResumenDiario
+    consulta = filtrar(
+        select(resumen.fecha, resumen.sede_id, resumen.medio_pago_id,
+               sumar(resumen.total_pagado), sumar(resumen.parqueos)),
+        resumen, parqueadero_id, desde, hasta, sede_id
+    ).group_by(resumen.fecha, resumen.sede_id, resumen.medio_pago_id)
+
+    por_dia = array('q', bytes(8 * (hasta - desde).days))
+    por_sede = {}
+    por_medio_pago = {}
+    cantidad = 0
+
+    for fecha, sede, medio_pago, total, parqueos in db.session.execute(consulta):
+        por_dia[(fecha - desde.date()).days] += total
+        por_sede[sede] = por_sede.get(sede, 0) + total
+        por_medio_pago[medio_pago] = por_medio_pago.get(medio_pago, 0) + total
+        cantidad += parqueos
+
+    return {
+        'total': sum(por_dia),
+        'parqueos': cantidad,
+        'porDia': [
+            {'fecha': (desde + timedelta(days=i)).strftime('%Y-%m-%d'), 'total': valor}
+            for i, valor in enumerate(por_dia)
+        ],
+        'porSede': por_sede,
+        'porMedioPago': por_medio_pago,
+    }
+
+
+def ocupacion(parqueadero_id, desde, hasta, sede_id=None, ahora=None):
+    """
+    Calcula cuántos vehículos estuvieron parqueados en cada hora del día.
+
+    Los segundos ocupados de una hora entre 3600 son los vehículos presentes en promedio durante
+    esa hora. El promedio por hora del día solo cuenta las horas ya transcurridas del rango y el
+    pico es la hora más concurrida entre todos los días.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango.
+    :param hasta: Fin exclusivo del rango.
+    :param sede_id: Identificador de una sede para restringir la consulta.
+    :param ahora: Fecha y hora hasta la que se consideran transcurridas las horas.
+    :return: Diccionario con el promedio y el pico de vehículos para cada hora del día.
+    """
+    horaria = ParqueoOcupacionHoraria
+    consulta = filtrar(
+        select(horaria.hora, sumar(horaria.segundos_ocupados)),
+        horaria, parqueadero_id, desde, hasta, sede_id
+    ).group_by(horaria.fecha, horaria.hora)
+
+    suma = [0] * 24
+    pico = [0] * 24
+    for hora, segundos in db.session.execute(consulta):
+        suma[hora] += segundos
+        if segundos > pico[hora]:
+            pico[hora] = segundos
+
+    inicio = a_segundos(desde)
+    fin = min(a_segundos(hasta), a_segundos(ahora or datetime.now()))
+    transcurridas = max(0, math.ceil((fin - inicio) / SEGUNDOS_HORA))
+    conteo = [transcurridas // 24 + (hora < transcurridas % 24) for hora in range(24)]
+
+    return {
+        'promedioPorHora': [
+            round(valor / SEGUNDOS_HORA / cantidad, 2) if cantidad else 0 for valor, cantidad in zip(suma, conteo)
+        ],
+        'picoPorHora': [round(valor / SEGUNDOS_HORA, 2) for valor in pico],
+    }
+
+
+def rotacion_modulos(parqueadero_id, desde, hasta, sede_id=None):
+    """
+    Calcula la rotación diaria y la estancia promedio de cada módulo.
+
+    Se consideran los parqueos que salieron dentro del rango.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango.
+    :param hasta: Fin exclusivo del rango.
+    :param sede_id: Identificador de una sede para restringir la consulta.
+    :return: Diccionario con la estancia promedio global y las métricas por módulo.
+    """
+    resumen = ParqueoResumenDiario
+    consulta = filtrar(
+        select(resumen.modulo_id, sumar(resumen.parqueos), sumar(resumen.segundos_estancia)),
+        resumen, parqueadero_id, desde, hasta, sede_id
+    ).group_by(resumen.modulo_id)
+
+    dias = (hasta - desde).days
+    por_modulo = {}
+    total_parqueos = 0
+    total_segundos = 0
+
+    for modulo, parqueos, segundos in db.session.execute(consulta):
+        por_modulo[modulo] = {
+            'parqueos': parqueos,
+            'rotacionDiaria': round(parqueos / dias, 2),
+            'estanciaPromedioMinutos': round(segundos / parqueos / 60, 1) if parqueos else None,
+        }
+        total_parqueos += parqueos
+        total_segundos += segundos
+
+    return {
+        'estanciaPromedioMinutos': round(total_segundos / total_parqueos / 60, 1) if total_parqueos else None,
+        'porModulo': por_modulo,
+    }
@@ -0,0 +1,270 @@
+from bisect import insort
+from datetime import datetime
+import heapq
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models import Arrendamiento
+
+ACTIVO = 'activo'
+PAUSADO = 'pausado'
+VENCIDO = 'vencido'
+
+# Columnas con que se construye cada registro del índice, en el orden de `RegistroArrendamiento`.
+COLUMNAS = (
+    Arrendamiento.id, Arrendamiento.vehiculo_id, Arrendamiento.tarifa_id, Arrendamiento.fecha_inicio,
+    Arrendamiento.fecha_fin, Arrendamiento.ha_sido_pausado
+)
+
+
+def es_ultimo_periodo():
+    """
+    Condición que cumplen los arrendamientos sin un periodo posterior del mismo vehículo, es decir,
+    los que no han sido renovados.
+
+    :return: Expresión para un `WHERE` sobre `Arrendamiento`.
+    """
+    posteriores = aliased(Arrendamiento)
+    return ~(
+        select(posteriores.id)
+        .where(posteriores.vehiculo_id == Arrendamiento.vehiculo_id, posteriores.fecha_fin > Arrendamiento.fecha_fin)
+        .exists()
+    )
+
+
+class RegistroArrendamiento:
+    """
+    Datos de un arrendamiento que se necesitan para decidir el ingreso y el cobro de un vehículo.
+    """
+    __slots__ = ('id', 'vehiculo_id', 'tarifa_id', 'fecha_inicio', 'fecha_fin', 'pausado', 'estado')
+
+    def __init__(self, id, vehiculo_id, tarifa_id, fecha_inicio, fecha_fin, pausado, ahora):
+        """
+        Constructor de la clase.
+
+        :param ahora: Fecha y hora con la que se determina si ya venció.
+        """
+        self.id = id
+        self.vehiculo_id = vehiculo_id
+        self.tarifa_id = tarifa_id
+        self.fecha_inicio = fecha_inicio
+        self.fecha_fin = fecha_fin
+        self.pausado = pausado
+        self.estado = VENCIDO if ahora > fecha_fin else PAUSADO if pausado else ACTIVO
+
+    def __lt__(self, otro):
+        return (self.fecha_fin, self.id) < (otro.fecha_fin, otro.id)
+
+
+class EstadoArrendamientos:
+    """
+    Índice en memoria del estado de los arrendamientos de cada vehículo.
+
+    Por cada vehículo se guardan sus arrendamientos ordenados por fecha de fin, así que el más
+    reciente es el último de la lista. El ingreso y la liquidación usan el arrendamiento vigente, cuyo
+    periodo incluye la fecha consultada. Un hilo en segundo plano
+    duerme hasta el siguiente vencimiento y marca como vencidos los arrendamientos cuya fecha de
+    fin ya pasó; también recarga el índice cada `ARRENDAMIENTOS_RECARGA` segundos para que los
+    cambios hechos por otros procesos terminen por verse.
+
+    Se construye la primera vez que se consulta en el proceso y las rutas que crean, modifican,
+    pausan o eliminan arrendamientos lo actualizan.
+    """
+    def __init__(self, recarga=300):
+        """
+        Constructor de la clase.
+
+        :param recarga: Segundos entre recargas completas por defecto.
+        """
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._por_vehiculo = {}
+        self._por_id = {}
+        self._vencimientos = []
+        self._cargado = False
+        self._hilo = None
+        self._recarga = recarga
+
+    def cargar(self):
+        """
+        Reconstruye el índice a partir de la tabla de arrendamientos e inicia el hilo de vencimientos.
+        """
+        ahora = datetime.now()
+        filas = db.session.execute(select(*COLUMNAS))
+
+        por_vehiculo = {}
+        por_id = {}
+        for fila in filas:
+            registro = RegistroArrendamiento(*fila, ahora)
+            por_vehiculo.setdefault(registro.vehiculo_id, []).append(registro)
+            por_id[registro.id] = registro
+
+        for registros in por_vehiculo.values():
+            registros.sort()
+
+        vencimientos = [(registro.fecha_fin, registro.id) for registro in por_id.values() if registro.estado != VENCIDO]
+        heapq.heapify(vencimientos)
+
+        with self._lock:
+            self._por_vehiculo = por_vehiculo
+            self._por_id = por_id
+            self._vencimientos = vencimientos
+            self._cargado = True
+
+            if self._hilo is None:
+                recarga = current_app.config.get('ARRENDAMIENTOS_RECARGA', self._recarga)
+                self._hilo = threading.Thread(
+                    target=self._programar_vencimientos, args=(current_app._get_current_object(), recarga),
+                    name='vencimiento-arrendamientos', daemon=True
+                )
+                self._hilo.start()
+
+        self._despertar.set()
+
+    def _asegurar_cargado(self):
+        """
+        Carga el índice si aún no se ha construido en este proceso.
+        """
+        if not self._cargado:
+            self.cargar()
+
+    def _programar_vencimientos(self, app, recarga):
+        """
+        Ciclo del hilo en segundo plano: vence los arrendamientos a su fecha de fin y recarga el índice periódicamente.
+
+        :param app: Aplicación de Flask, para recargar el índice con su contexto.
+        :param recarga: Segundos entre recargas completas.
+        """
+        siguiente_recarga = time.monotonic() + recarga
+
+        while True:
+            with self._lock:
+                proximo = self._vencimientos[0][0] if self._vencimientos else None
+
+            espera = siguiente_recarga - time.monotonic()
+            if proximo is not None:
+                espera = min(espera, (proximo - datetime.now()).total_seconds())
+
+            self._despertar.wait(max(espera, 0))
+            self._despertar.clear()
+
+            self.vencer(datetime.now())
+
+            if time.monotonic() >= siguiente_recarga:
+                siguiente_recarga = time.monotonic() + recarga
+                try:
+                    with app.app_context():
+                        self.cargar()
+                except Exception:
+                    app.logger.exception('No fue posible recargar el estado de los arrendamientos')
+
+    def vencer(self, ahora):
+        """
+        Marca como vencidos los arrendamientos cuya fecha de fin ya pasó.
+
+        :param ahora: Fecha y hora actual.
+        :return: Cantidad de arrendamientos vencidos.
+        """
+        vencidos = 0
+
+        with self._lock:
+            while self._vencimientos and self._vencimientos[0][0] < ahora:
+                fecha_fin, arrendamiento_id = heapq.heappop(self._vencimientos)
+                registro = self._por_id.get(arrendamiento_id)
+
+                # Las entradas de arrendamientos eliminados o cuya fecha de fin cambió se descartan.
+                if registro is not None and registro.fecha_fin == fecha_fin and registro.estado != VENCIDO:
+                    registro.estado = VENCIDO
+                    vencidos += 1
+
+        return vencidos
+
+    def registrar(self, arrendamiento):
+        """
+        Agrega o reemplaza un arrendamiento después de crearlo, modificarlo o pausarlo.
+
+        :param arrendamiento: Arrendamiento guardado.
+        """
+        self.registrar_filas([tuple(getattr(arrendamiento, columna.key) for columna in COLUMNAS)])
+
+    def registrar_filas(self, filas):
+        """
+        Agrega o reemplaza varios arrendamientos a partir de filas con las columnas de `COLUMNAS`.
+
+        :param filas: Filas de los arrendamientos guardados, por ejemplo las devueltas por un `UPDATE ... RETURNING`.
+        """
+        self._asegurar_cargado()
+
+        ahora = datetime.now()
+        registros = [RegistroArrendamiento(*fila, ahora) for fila in filas]
+
+        with self._lock:
+            for registro in registros:
+                self._quitar(registro.id)
+                self._por_id[registro.id] = registro
+                insort(self._por_vehiculo.setdefault(registro.vehiculo_id, []), registro)
+
+                if registro.estado != VENCIDO:
+                    heapq.heappush(self._vencimientos, (registro.fecha_fin, registro.id))
+
+        self._despertar.set()
+
+    def eliminar(self, arrendamiento_id):
+        """
+        Quita un arrendamiento eliminado.
+
+        :param arrendamiento_id: Identificador del arrendamiento.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            self._quitar(arrendamiento_id)
+
+    def _quitar(self, arrendamiento_id):
+        registro = self._por_id.pop(arrendamiento_id, None)
+        if registro is None:
+            return
+
+        registros = self._por_vehiculo[registro.vehiculo_id]
+        registros.remove(registro)
+        if not registros:
+            del self._por_vehiculo[registro.vehiculo_id]
+
+    def ultimo(self, vehiculo_id):
+        """
+        Recupera el arrendamiento de un vehículo con la fecha de fin más reciente.
+
+        :param vehiculo_id: Identificador del vehículo.
+        :return: Registro del arrendamiento o None si el vehículo no tiene.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            registros = self._por_vehiculo.get(vehiculo_id)
+            return registros[-1] if registros else None
+
+    def vigente(self, vehiculo_id, ahora):
+        """
+        Recupera el arrendamiento de un vehículo cuyo periodo incluye una fecha, el más antiguo si hay varios.
+
+        :param vehiculo_id: Identificador del vehículo.
+        :param ahora: Fecha y hora.
+        :return: Registro del arrendamiento o None.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            vigentes = [
+                registro for registro in self._por_vehiculo.get(vehiculo_id, ())
+                if registro.fecha_inicio <= ahora <= registro.fecha_fin
+            ]
+
+        return min(vigentes, key=lambda registro: registro.id) if vigentes else None
+
+
+estado_arrendamientos = EstadoArrendamientos()
@@ -0,0 +1,154 @@
+from collections import deque
+import threading
+import time
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash
+
+# Parámetros que Werkzeug usa cuando el método no los indica.
+PARAMETROS_POR_DEFECTO = {
+    'scrypt': ('32768', '8', '1'),
+    'pbkdf2': ('sha256', str(DEFAULT_PBKDF2_ITERATIONS)),
+}
+
+
+def normalizar_metodo(metodo):
+    """
+    Completa un método de hash de Werkzeug con los parámetros por defecto que omite.
+
+    Así `scrypt` y `scrypt:32768:8:1` se reconocen como el mismo método, igual que el prefijo que
+    Werkzeug guarda antes del primer `$` del hash.
+
+    :param metodo: Método, por ejemplo `scrypt:16384:8:1` o `pbkdf2:sha256`.
+    :return: Método con todos sus parámetros.
+    """
+    partes = metodo.split(':')
+    por_defecto = PARAMETROS_POR_DEFECTO.get(partes[0], ())
+
+    return ':'.join([partes[0], *partes[1:], *por_defecto[len(partes) - 1:]])
+
+
+def metodo_hash():
+    """
+    Obtiene el método de hash de contraseñas configurado en `PASSWORD_METODO`.
+
+    :return: Método con todos sus parámetros.
+    """
+    return normalizar_metodo(current_app.config.get('PASSWORD_METODO', 'scrypt:16384:8:1'))
+
+
+def generar_hash(password):
+    """
+    Calcula el hash de una contraseña con el método configurado.
+
+    :param password: Contraseña en texto plano.
+    :return: Hash en el formato de Werkzeug.
+    """
+    return generate_password_hash(password, method=metodo_hash())
+
+
+def necesita_rehash(hash_guardado):
+    """
+    Indica si un hash se calculó con un método distinto del configurado.
+
+    :param hash_guardado: Hash almacenado del usuario.
+    :return: True si conviene volver a calcularlo.
+    """
+    return hash_guardado.split('$', 1)[0] != metodo_hash()
+
+
+class LimitadorIntentos:
+    """
+    Limitador en memoria de los intentos fallidos de inicio de sesión por IP y por cuenta.
+
+    Por cada clave se guardan las horas de los fallos dentro de la ventana `LOGIN_VENTANA`. Una
+    clave que alcanza su límite (`LOGIN_INTENTOS_IP` o `LOGIN_INTENTOS_CUENTA`) se rechaza sin
+    consultar la base de datos ni verificar la contraseña hasta que su fallo más antiguo sale de
+    la ventana, de modo que un ataque de fuerza bruta no consume la CPU de los workers. Cada
+    proceso lleva su propia cuenta.
+    """
+    def __init__(self, ventana=300, purga=1000):
+        """
+        Constructor de la clase.
+
+        :param ventana: Segundos de la ventana por defecto.
+        :param purga: Cantidad de fallos registrados entre cada limpieza de claves vencidas.
+        """
+        self._lock = threading.Lock()
+        self._fallos = {}
+        self._ventana = ventana
+        self._purga = purga
+        self._registrados = 0
+
+    def _limites(self, ip, cuenta):
+        """
+        Construye las claves de un intento con sus límites.
+
+        :param ip: Dirección IP del cliente.
+        :param cuenta: Email con que se intenta ingresar.
+        :return: Lista de tuplas con la clave y su límite.
+        """
+        config = current_app.config
+        return [
+            (('ip', ip), config.get('LOGIN_INTENTOS_IP', 30)),
+            (('cuenta', (cuenta or '').strip().lower()), config.get('LOGIN_INTENTOS_CUENTA', 10)),
+        ]
+
+    def espera(self, ip, cuenta):
+        """
+        Calcula cuánto debe esperar un intento antes de poder verificarse.
+
+        :param ip: Dirección IP del cliente.
+        :param cuenta: Email con que se intenta ingresar.
+        :return: Segundos de espera, o 0 si el intento está permitido.
+        """
+        ahora = time.monotonic()
+        ventana = current_app.config.get('LOGIN_VENTANA', self._ventana)
+        espera = 0
+
+        with self._lock:
+            for clave, limite in self._limites(ip, cuenta):
+                fallos = self._fallos.get(clave)
+                if not fallos:
+                    continue
+
+                while fallos and fallos[0] <= ahora - ventana:
+                    fallos.popleft()
+
+                if len(fallos) >= limite:
+                    espera = max(espera, fallos[0] + ventana - ahora)
+
+        return espera
+
+    def registrar_fallo(self, ip, cuenta):
+        """
+        Registra un intento fallido para la IP y la cuenta.
+
+        :param ip: Dirección IP del cliente.
+        :param cuenta: Email con que se intentó ingresar.
+        """
+        ahora = time.monotonic()
+        ventana = current_app.config.get('LOGIN_VENTANA', self._ventana)
+
+        with self._lock:
+            for clave, limite in self._limites(ip, cuenta):
+                self._fallos.setdefault(clave, deque(maxlen=limite)).append(ahora)
+
+            self._registrados += 1
+            if self._registrados >= self._purga:
+                self._registrados = 0
+                self._fallos = {
+                    clave: fallos for clave, fallos in self._fallos.items() if fallos and fallos[-1] > ahora - ventana
+                }
+
+    def limpiar(self, cuenta):
+        """
+        Descarta los fallos de una cuenta después de un inicio de sesión correcto.
+
+        :param cuenta: Email de la cuenta.
+        """
+        with self._lock:
+            self._fallos.pop(('cuenta', (cuenta or '').strip().lower()), None)
+
+
+limitador_intentos = LimitadorIntentos()
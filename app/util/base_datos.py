@@ -0,0 +1,131 @@
+from sqlalchemy import DateTime, Float, String, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+def configurar_pragmas_sqlite(engine, pragmas):
+    """
+    Registra los PRAGMA que se ejecutan en cada conexión nueva de un motor SQLite.
+
+    Opciones como `busy_timeout` y `synchronous` son por conexión, así que deben aplicarse a cada
+    conexión que abre el pool y no una sola vez al arrancar.
+
+    :param engine: Motor de SQLAlchemy.
+    :param pragmas: Diccionario con el nombre y el valor de cada PRAGMA.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def aplicar_pragmas(conexion_dbapi, registro_conexion):
+        cursor = conexion_dbapi.cursor()
+        for nombre, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nombre}={valor}')
+        cursor.close()
+
+
+def insert_con_conflictos(conexion):
+    """
+    Obtiene la construcción `insert` del dialecto de la conexión si admite `ON CONFLICT`.
+
+    :param conexion: Conexión de SQLAlchemy.
+    :return: Función `insert` de SQLite o PostgreSQL, o None para otros motores.
+    """
+    if conexion.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+
+    if conexion.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+
+    return None
+
+
+class segundos_epoca(FunctionElement):
+    """
+    Segundos desde la época de una columna de fecha y hora, calculados en la base de datos.
+
+    Traer números en lugar de fechas evita convertir cada valor a `datetime` en Python, que es la
+    parte más costosa de cargar muchos parqueos.
+    """
+    type = Float()
+    name = 'segundos_epoca'
+    inherit_cache = True
+
+
+@compiles(segundos_epoca)
+def compilar_segundos_epoca(elemento, compilador, **kw):
+    return f'CAST(EXTRACT(EPOCH FROM {compilador.process(elemento.clauses, **kw)}) AS DOUBLE PRECISION)'
+
+
+@compiles(segundos_epoca, 'sqlite')
+def compilar_segundos_epoca_sqlite(elemento, compilador, **kw):
+    return f'ROUND((julianday({compilador.process(elemento.clauses, **kw)}) - 2440587.5) * 86400.0)'
+
+
+class fecha_texto(FunctionElement):
+    """
+    Fecha y hora formateada como `AAAA-MM-DD HH:MM:SS` por la base de datos.
+
+    Sirve para escribir fechas en archivos sin convertirlas a `datetime` y de vuelta a texto en Python.
+    """
+    type = String()
+    name = 'fecha_texto'
+    inherit_cache = True
+
+
+@compiles(fecha_texto)
+def compilar_fecha_texto(elemento, compilador, **kw):
+    return f"to_char({compilador.process(elemento.clauses, **kw)}, 'YYYY-MM-DD HH24:MI:SS')"
+
+
+@compiles(fecha_texto, 'sqlite')
+def compilar_fecha_texto_sqlite(elemento, compilador, **kw):
+    return f"strftime('%Y-%m-%d %H:%M:%S', {compilador.process(elemento.clauses, **kw)})"
+
+
+class sumar_dias(FunctionElement):
+    """
+    Fecha y hora de una columna más una cantidad de días, calculada en la base de datos.
+
+    Permite mover las fechas de muchas filas con un solo `UPDATE`, incluso cuando la cantidad de
+    días sale de otra columna o de una subconsulta.
+    """
+    type = DateTime()
+    name = 'sumar_dias'
+    inherit_cache = True
+
+
+@compiles(sumar_dias)
+def compilar_sumar_dias(elemento, compilador, **kw):
+    fecha, dias = [compilador.process(clausula, **kw) for clausula in elemento.clauses]
+    return f"({fecha} + ({dias}) * INTERVAL '1 day')"
+
+
+@compiles(sumar_dias, 'sqlite')
+def compilar_sumar_dias_sqlite(elemento, compilador, **kw):
+    # datetime() descarta los microsegundos; se conservan los del valor original para mantener el
+    # formato con que SQLAlchemy guarda las fechas y que las comparaciones de texto sigan siendo válidas.
+    fecha, dias = [compilador.process(clausula, **kw) for clausula in elemento.clauses]
+    return f"(datetime({fecha}, ({dias}) || ' days') || substr({fecha}, 20))"
+
+
+class fecha_mayor(FunctionElement):
+    """
+    La mayor de dos fechas y horas, calculada en la base de datos.
+    """
+    type = DateTime()
+    name = 'fecha_mayor'
+    inherit_cache = True
+
+
+@compiles(fecha_mayor)
+def compilar_fecha_mayor(elemento, compilador, **kw):
+    return f'GREATEST({compilador.process(elemento.clauses, **kw)})'
+
+
+@compiles(fecha_mayor, 'sqlite')
+def compilar_fecha_mayor_sqlite(elemento, compilador, **kw):
+    # Las fechas se guardan como texto con el mismo formato, así que el orden del texto es el de las fechas.
+    return f'max({compilador.process(elemento.clauses, **kw)})'
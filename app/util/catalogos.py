@@ -0,0 +1,61 @@
+import threading
+import time
+
+from flask import current_app
+
+from app.util.utilitarios import to_json
+
+
+class CacheCatalogos:
+    """
+    Caché en memoria de las tablas de referencia (tipos de vehículo, medios de pago, tarifas, etc.).
+
+    Cada catálogo se guarda como una lista de diccionarios de solo lectura. Las rutas que modifican
+    un catálogo lo invalidan explícitamente; además, cada entrada expira tras `CATALOGOS_TTL`
+    segundos para que los cambios hechos por otros procesos terminen por verse.
+    """
+    def __init__(self, ttl=300):
+        """
+        Constructor de la clase.
+
+        :param ttl: Segundos de vigencia por defecto de cada catálogo.
+        """
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self._ttl = ttl
+
+    def obtener(self, modelo):
+        """
+        Recupera todas las filas de un catálogo ordenadas por id.
+
+        :param modelo: Clase del modelo del catálogo.
+        :return: Lista de diccionarios con las columnas de cada fila.
+        """
+        ahora = time.monotonic()
+
+        with self._lock:
+            entrada = self._entradas.get(modelo.__name__)
+
+        if entrada is not None and entrada[0] > ahora:
+            return entrada[1]
+
+        filas = [to_json(entidad) for entidad in modelo.query.order_by(modelo.id).all()]
+        ttl = current_app.config.get('CATALOGOS_TTL', self._ttl)
+
+        with self._lock:
+            self._entradas[modelo.__name__] = (ahora + ttl, filas)
+
+        return filas
+
+    def invalidar(self, *modelos):
+        """
+        Descarta uno o varios catálogos para que se recarguen en la siguiente consulta.
+
+        :param modelos: Clases de los modelos a invalidar.
+        """
+        with self._lock:
+            for modelo in modelos:
+                self._entradas.pop(modelo.__name__, None)
+
+
+catalogos = CacheCatalogos()
@@ -0,0 +1,69 @@
+import math
+from datetime import datetime
+
+# Duración en segundos de cada `TarifaTipo.unidad`: minutos, horas, días, semanas, meses y años.
+SEGUNDOS_POR_UNIDAD = {
+    1: 60,
+    2: 60 * 60,
+    3: 24 * 60 * 60,
+    4: 7 * 24 * 60 * 60,
+    5: 30 * 24 * 60 * 60,
+    6: 365 * 24 * 60 * 60,
+}
+
+
+def redondear_cobro(valor, costo):
+    """
+    Redondea hacia arriba un valor a la cifra más significativa del costo de la tarifa.
+
+    Replica el redondeo que la vista de parqueos aplicaba en el navegador: una tarifa de 100
+    redondea a la centena y una de 2000 al millar.
+
+    :param valor: Valor a redondear.
+    :param costo: Costo de la tarifa.
+    :return: Valor redondeado como entero.
+    """
+    escala = 10 ** (len(str(int(costo))) - 1)
+    return int(math.ceil(valor / escala) * escala)
+
+
+def calcular_totales(costos, unidades, entradas, salida=None):
+    """
+    Calcula en una sola pasada el valor a cobrar de un conjunto de parqueos.
+
+    Los datos se reciben por columnas: la posición `i` de cada secuencia corresponde al mismo parqueo.
+
+    :param costos: Costos de las tarifas.
+    :param unidades: Unidades de tiempo de las tarifas (`TarifaTipo.unidad`).
+    :param entradas: Fechas y horas de entrada.
+    :param salida: Fecha y hora de salida común a todos los parqueos; por defecto, la actual.
+    :return: Lista con el total a cobrar de cada parqueo.
+    """
+    salida = salida or datetime.now()
+
+    factores = {}
+    totales = []
+    for costo, unidad, entrada in zip(costos, unidades, entradas):
+        clave = (costo, unidad)
+        factor = factores.get(clave)
+        if factor is None:
+            segundos_unidad = SEGUNDOS_POR_UNIDAD.get(unidad)
+            factor = costo / segundos_unidad if segundos_unidad else 0
+            factores[clave] = factor
+
+        segundos = max((salida - entrada).total_seconds(), 0)
+        totales.append(redondear_cobro(segundos * factor, costo) if factor else 0)
+
+    return totales
+
+
+def calcular_total(tarifa, entrada, salida=None):
+    """
+    Calcula el valor a cobrar de un parqueo.
+
+    :param tarifa: Tarifa aplicada al vehículo.
+    :param entrada: Fecha y hora de entrada.
+    :param salida: Fecha y hora de salida; por defecto, la actual.
+    :return: Total a cobrar.
+    """
+    return calcular_totales([tarifa.costo], [tarifa.tarifa_tipo.unidad], [entrada], salida)[0]
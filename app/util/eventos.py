@@ -0,0 +1,173 @@
+import queue
+import threading
+
+from flask import current_app
+from werkzeug.utils import import_string
+
+
+class Suscripcion:
+    """
+    Cola de mensajes de un suscriptor a un canal.
+    """
+    def __init__(self, backend, canal, capacidad):
+        """
+        Constructor de la clase.
+
+        :param backend: Backend que entrega los mensajes.
+        :param canal: Canal suscrito.
+        :param capacidad: Cantidad máxima de mensajes pendientes.
+        """
+        self.backend = backend
+        self.canal = canal
+        self.cola = queue.Queue(maxsize=capacidad)
+
+    def obtener(self, timeout):
+        """
+        Espera el siguiente mensaje del canal.
+
+        :param timeout: Segundos máximos de espera.
+        :return: Mensaje o None si no llegó ninguno en el tiempo dado.
+        """
+        try:
+            return self.cola.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def cerrar(self):
+        """
+        Cancela la suscripción.
+        """
+        self.backend.cancelar(self)
+
+
+class BackendMemoria:
+    """
+    Backend de publicación/suscripción en memoria del proceso.
+
+    Solo reparte los mensajes entre los suscriptores del mismo proceso; con varios workers se
+    reemplaza por otro backend con la misma interfaz mediante `EVENTOS_BACKEND`.
+    """
+    def __init__(self, capacidad=100):
+        """
+        Constructor de la clase.
+
+        :param capacidad: Cantidad máxima de mensajes pendientes por suscriptor.
+        """
+        self._lock = threading.Lock()
+        self._suscripciones = {}
+        self._capacidad = capacidad
+
+    def publicar(self, canal, mensaje):
+        """
+        Entrega un mensaje a todos los suscriptores de un canal.
+
+        Si la cola de un suscriptor está llena el mensaje se descarta para ese suscriptor, de modo
+        que un cliente lento no bloquea a quien publica.
+
+        :param canal: Canal de destino.
+        :param mensaje: Mensaje ya serializado.
+        """
+        with self._lock:
+            suscripciones = list(self._suscripciones.get(canal, ()))
+
+        for suscripcion in suscripciones:
+            try:
+                suscripcion.cola.put_nowait(mensaje)
+            except queue.Full:
+                pass
+
+    def suscribir(self, canal):
+        """
+        Crea una suscripción a un canal.
+
+        :param canal: Canal a suscribir.
+        :return: Suscripción.
+        """
+        suscripcion = Suscripcion(self, canal, self._capacidad)
+
+        with self._lock:
+            self._suscripciones.setdefault(canal, set()).add(suscripcion)
+
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        """
+        Elimina una suscripción.
+
+        :param suscripcion: Suscripción a eliminar.
+        """
+        with self._lock:
+            suscripciones = self._suscripciones.get(suscripcion.canal)
+            if suscripciones is not None:
+                suscripciones.discard(suscripcion)
+                if not suscripciones:
+                    del self._suscripciones[suscripcion.canal]
+
+
+class BusEventos:
+    """
+    Publica los eventos de parqueo de cada sede y los entrega como un flujo Server-Sent Events.
+
+    El backend se crea en el primer uso a partir de `EVENTOS_BACKEND`, la ruta de importación de
+    una clase con los métodos `publicar`, `suscribir` y `cancelar`; por defecto, `BackendMemoria`.
+    """
+    def __init__(self):
+        """
+        Constructor de la clase.
+        """
+        self._lock = threading.Lock()
+        self._backend = None
+
+    def backend(self):
+        """
+        Obtiene el backend de publicación/suscripción, creándolo si no existe.
+
+        :return: Backend.
+        """
+        with self._lock:
+            if self._backend is None:
+                ruta = current_app.config.get('EVENTOS_BACKEND')
+                clase = import_string(ruta) if ruta else BackendMemoria
+                self._backend = clase()
+
+            return self._backend
+
+    def publicar(self, sede_id, tipo, datos):
+        """
+        Publica un evento en el canal de una sede.
+
+        :param sede_id: Identificador de la sede.
+        :param tipo: Tipo del evento (ingreso, retiro, modulo, pausa).
+        :param datos: Datos del evento serializables a JSON.
+        """
+        mensaje = f'event: {tipo}\ndata: {current_app.json.dumps(datos)}\n\n'
+        self.backend().publicar(f'sede:{sede_id}', mensaje)
+
+    def flujo(self, sede_id, latido=15):
+        """
+        Genera el flujo Server-Sent Events de una sede.
+
+        Cuando no hay eventos se envía un comentario cada `latido` segundos para mantener viva la
+        conexión y detectar clientes desconectados.
+
+        :param sede_id: Identificador de la sede.
+        :param latido: Segundos entre comentarios de mantenimiento.
+        :return: Generador con los fragmentos del flujo.
+        """
+        backend = self.backend()
+
+        def generar():
+            suscripcion = backend.suscribir(f'sede:{sede_id}')
+            try:
+                yield 'retry: 3000\n\n'
+
+                while True:
+                    mensaje = suscripcion.obtener(latido)
+                    yield mensaje if mensaje is not None else ': latido\n\n'
+            finally:
+                suscripcion.cerrar()
+
+        return generar()
+
+
+bus_eventos = BusEventos()
@@ -0,0 +1,171 @@
+import csv
+from datetime import datetime, timedelta
+import io
+
+from sqlalchemy import Boolean, DateTime, Integer, cast, select
+
+from app.models import Arrendamiento, Cliente, Modulo, Parqueo, Sede, Vehiculo
+from app.util.base_datos import fecha_texto
+
+SEPARADOR = ';'
+TAMANO_LOTE = 2000
+
+# Columnas y orden de los archivos que se entregaban a contabilidad (ver `recursos/`).
+COLUMNAS_PARQUEO = ('id', 'fecha_hora_entrada', 'fecha_hora_salida', 'total_pagado', 'modulo_id', 'vehiculo_id',
+                    'medio_pago_id', 'created_at', 'updated_at')
+COLUMNAS_ARRENDAMIENTO = ('id', 'descripcion', 'fecha_inicio', 'fecha_fin', 'ha_sido_pausado', 'tiempo_pausa',
+                          'vehiculo_id', 'periodicidad_id', 'medio_pago_id', 'tarifa_id', 'created_at', 'updated_at')
+COLUMNAS_CLIENTE = ('id', 'documento', 'nombres', 'apellidos', 'telefono', 'email', 'direccion', 'activo',
+                    'created_at', 'updated_at', 'parqueadero_id')
+
+
+def leer_filtros(args):
+    """
+    Lee los filtros de una exportación: rango de fechas opcional y sede.
+
+    `desde` y `hasta` tienen el formato `AAAA-MM-DD` y ambos días se incluyen.
+
+    :param args: Parámetros de la petición.
+    :return: Tupla con el inicio (o None), el fin exclusivo (o None) y el identificador de la sede (o None).
+    :raises ValueError: Si las fechas no son válidas o el rango está invertido.
+    """
+    desde = datetime.strptime(args['desde'], '%Y-%m-%d') if args.get('desde') else None
+    hasta = datetime.strptime(args['hasta'], '%Y-%m-%d') + timedelta(days=1) if args.get('hasta') else None
+
+    if desde and hasta and desde >= hasta:
+        raise ValueError('La fecha inicial debe ser anterior a la final')
+
+    return desde, hasta, args.get('sedeId', type=int)
+
+
+def columnas(modelo, nombres):
+    """
+    Obtiene las columnas de la tabla de un modelo en el orden indicado, listas para escribirse en el CSV.
+
+    Las fechas se formatean sin microsegundos y los booleanos se convierten en 0 o 1 en la propia
+    consulta, igual que en las exportaciones hechas a mano desde SQLite; así las filas se escriben
+    tal como llegan, sin convertir cada valor en Python.
+
+    :param modelo: Modelo de SQLAlchemy.
+    :param nombres: Nombres de las columnas.
+    :return: Lista de expresiones etiquetadas con el nombre de cada columna.
+    """
+    resultado = []
+
+    for nombre in nombres:
+        columna = modelo.__table__.c[nombre]
+
+        if isinstance(columna.type, DateTime):
+            columna = fecha_texto(columna).label(nombre)
+        elif isinstance(columna.type, Boolean):
+            columna = cast(columna, Integer).label(nombre)
+
+        resultado.append(columna)
+
+    return resultado
+
+
+def consulta_parqueos(parqueadero_id, desde=None, hasta=None, sede_id=None):
+    """
+    Construye la consulta de los parqueos de un parqueadero que entraron dentro del rango.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango (opcional).
+    :param hasta: Fin exclusivo del rango (opcional).
+    :param sede_id: Identificador de una sede (opcional).
+    :return: Consulta ordenada por identificador.
+    """
+    consulta = (
+        select(*columnas(Parqueo, COLUMNAS_PARQUEO))
+        .join(Modulo, Parqueo.modulo_id == Modulo.id)
+        .join(Sede, Modulo.sede_id == Sede.id)
+        .where(Sede.parqueadero_id == parqueadero_id)
+        .order_by(Parqueo.id)
+    )
+
+    if desde is not None:
+        consulta = consulta.where(Parqueo.fecha_hora_entrada >= desde)
+    if hasta is not None:
+        consulta = consulta.where(Parqueo.fecha_hora_entrada < hasta)
+    if sede_id is not None:
+        consulta = consulta.where(Modulo.sede_id == sede_id)
+
+    return consulta
+
+
+def consulta_arrendamientos(parqueadero_id, desde=None, hasta=None):
+    """
+    Construye la consulta de los arrendamientos de los clientes de un parqueadero vigentes en algún momento del rango.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango (opcional).
+    :param hasta: Fin exclusivo del rango (opcional).
+    :return: Consulta ordenada por identificador.
+    """
+    consulta = (
+        select(*columnas(Arrendamiento, COLUMNAS_ARRENDAMIENTO))
+        .join(Vehiculo, Arrendamiento.vehiculo_id == Vehiculo.id)
+        .join(Cliente, Vehiculo.cliente_id == Cliente.id)
+        .where(Cliente.parqueadero_id == parqueadero_id)
+        .order_by(Arrendamiento.id)
+    )
+
+    if desde is not None:
+        consulta = consulta.where(Arrendamiento.fecha_fin >= desde)
+    if hasta is not None:
+        consulta = consulta.where(Arrendamiento.fecha_inicio < hasta)
+
+    return consulta
+
+
+def consulta_clientes(parqueadero_id, desde=None, hasta=None):
+    """
+    Construye la consulta de los clientes de un parqueadero registrados dentro del rango.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param desde: Inicio del rango (opcional).
+    :param hasta: Fin exclusivo del rango (opcional).
+    :return: Consulta ordenada por identificador.
+    """
+    consulta = (
+        select(*columnas(Cliente, COLUMNAS_CLIENTE))
+        .where(Cliente.parqueadero_id == parqueadero_id)
+        .order_by(Cliente.id)
+    )
+
+    if desde is not None:
+        consulta = consulta.where(Cliente.created_at >= desde)
+    if hasta is not None:
+        consulta = consulta.where(Cliente.created_at < hasta)
+
+    return consulta
+
+
+def filas_csv(motor, consulta, tamano_lote=TAMANO_LOTE):
+    """
+    Genera el contenido CSV de una consulta por bloques, leyendo las filas por lotes.
+
+    La consulta se ejecuta con `yield_per`, que en PostgreSQL usa un cursor del lado del servidor
+    y en SQLite lee del cursor a medida que se avanza, así que la memoria usada depende del tamaño
+    del lote y no de la cantidad de filas. La conexión se abre al empezar a transmitir y se cierra
+    al terminar o si el cliente corta la descarga.
+
+    :param motor: Engine de SQLAlchemy.
+    :param consulta: Consulta a exportar.
+    :param tamano_lote: Filas leídas y escritas por bloque.
+    :return: Generador de bloques de texto.
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=SEPARADOR, lineterminator='\n')
+
+    escritor.writerow([columna.name for columna in consulta.selected_columns])
+    yield buffer.getvalue()
+
+    with motor.connect() as conexion:
+        resultado = conexion.execution_options(yield_per=tamano_lote).execute(consulta)
+
+        for lote in resultado.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            escritor.writerows(lote)
+            yield buffer.getvalue()
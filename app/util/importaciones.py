@@ -0,0 +1,431 @@
+import csv
+from datetime import datetime
+import os
+import time
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, insert, select, text
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Arrendamiento, Cliente, Modulo, Parqueo, Vehiculo
+from app.util.utilitarios import normalizar_placa
+
+TAMANO_LOTE = 5000
+ERRORES_MOSTRADOS = 20
+
+# Prefijo del nombre del archivo (como en `recursos/parqueo-20240823.csv`) y modelo de destino.
+TABLAS_IMPORTABLES = {
+    'cliente': Cliente,
+    'vehiculo': Vehiculo,
+    'modulo': Modulo,
+    'parqueo': Parqueo,
+    'arrendamiento': Arrendamiento,
+    'arrendamientos': Arrendamiento,
+}
+
+# Columnas que se calculan a partir de otra del archivo: tabla -> [(destino, origen, función)].
+COLUMNAS_DERIVADAS = {
+    'vehiculo': [('placa_normalizada', 'placa', normalizar_placa)],
+}
+
+# Llaves únicas que se validan por fila: tabla -> [(columna, columna que debe ser nula o None)]. La
+# segunda columna corresponde a un índice único parcial, como el de un parqueo abierto por módulo y
+# por vehículo, que solo aplica a las filas donde es nula.
+LLAVES_UNICAS = {
+    'cliente': [('documento', None)],
+    'parqueo': [('modulo_id', 'fecha_hora_salida'), ('vehiculo_id', 'fecha_hora_salida')],
+}
+
+
+class ErrorImportacion(Exception):
+    """
+    Error que impide importar un archivo completo (tabla desconocida, columnas inválidas, etc.).
+    """
+
+
+def modelo_de_archivo(ruta):
+    """
+    Determina el modelo de destino a partir del nombre del archivo.
+
+    :param ruta: Ruta del archivo CSV.
+    :return: Modelo de SQLAlchemy.
+    :raises ErrorImportacion: Si el prefijo del archivo no corresponde a una tabla importable.
+    """
+    prefijo = os.path.basename(ruta).split('-')[0].strip().lower()
+
+    if prefijo not in TABLAS_IMPORTABLES:
+        raise ErrorImportacion(f'No se reconoce la tabla del archivo {ruta}; use --tabla')
+
+    return TABLAS_IMPORTABLES[prefijo]
+
+
+def a_entero(valor):
+    return int(valor) if valor.lstrip('-').isdigit() else int(float(valor))
+
+
+def a_booleano(valor):
+    if valor.lower() in ('1', 'true', 't', 'si', 'sí'):
+        return True
+    if valor.lower() in ('0', 'false', 'f', 'no'):
+        return False
+    raise ValueError(f"'{valor}' no es un booleano")
+
+
+def convertidor(columna):
+    """
+    Obtiene la función que convierte el texto de una celda al tipo de una columna.
+
+    :param columna: Columna de la tabla.
+    :return: Función de conversión.
+    """
+    if isinstance(columna.type, Boolean):
+        return a_booleano
+    if isinstance(columna.type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(columna.type, Date):
+        return lambda valor: datetime.fromisoformat(valor).date()
+    if isinstance(columna.type, Integer):
+        return a_entero
+    if isinstance(columna.type, Float):
+        return float
+    return str
+
+
+def valor_por_defecto(columna, ahora):
+    """
+    Obtiene el valor con el que se llena una celda vacía de una columna que tiene valor por defecto.
+
+    :param columna: Columna de la tabla.
+    :param ahora: Fecha y hora de la importación, para las columnas de auditoría.
+    :return: Valor por defecto, o None si la columna no tiene.
+    """
+    if columna.default is not None and columna.default.is_scalar:
+        return columna.default.arg
+    if columna.server_default is not None and isinstance(columna.type, DateTime):
+        return ahora
+    return None
+
+
+class ValidadorLlaves:
+    """
+    Caché de los ids existentes de las tablas referenciadas y de la tabla de destino, y de los
+    valores de sus llaves únicas.
+
+    Cada tabla se consulta una sola vez por importación; los ids y valores insertados se agregan al
+    conjunto para que los archivos siguientes de la misma ejecución puedan referenciarlos o los
+    detecten repetidos. Se guardan como texto porque algunas llaves foráneas no tienen el mismo
+    tipo que la llave primaria (por ejemplo `parqueo.vehiculo_id`).
+    """
+    def __init__(self, conexion):
+        """
+        Constructor de la clase.
+
+        :param conexion: Conexión de SQLAlchemy.
+        """
+        self.conexion = conexion
+        self.ids = {}
+        self.unicos = {}
+
+    def de_tabla(self, tabla):
+        """
+        Recupera el conjunto de ids de una tabla, consultándolo la primera vez.
+
+        :param tabla: Tabla de SQLAlchemy.
+        :return: Conjunto de ids como texto.
+        """
+        if tabla.name not in self.ids:
+            self.ids[tabla.name] = {str(valor) for valor in self.conexion.execute(select(tabla.c.id)).scalars()}
+
+        return self.ids[tabla.name]
+
+    def de_llave_unica(self, tabla, columna, nula=None):
+        """
+        Recupera el conjunto de valores de una llave única, consultándolo la primera vez.
+
+        :param tabla: Tabla de SQLAlchemy.
+        :param columna: Nombre de la columna única.
+        :param nula: Columna que debe ser nula para que la llave aplique (opcional).
+        :return: Conjunto de valores como texto.
+        """
+        clave = (tabla.name, columna, nula)
+        if clave not in self.unicos:
+            consulta = select(tabla.c[columna])
+            if nula is not None:
+                consulta = consulta.where(tabla.c[nula].is_(None))
+            self.unicos[clave] = {str(valor) for valor in self.conexion.execute(consulta).scalars()}
+
+        return self.unicos[clave]
+
+
+class ImportadorCsv:
+    """
+    Importa un archivo CSV a una tabla en lotes con inserciones en bloque (`executemany`).
+
+    El archivo se lee fila por fila y se escribe cada `tamano_lote` filas, de modo que la memoria
+    depende del lote y de los ids en caché, no del tamaño del archivo. Cada fila se convierte al
+    tipo de su columna y se valida contra las columnas obligatorias, los ids existentes de la
+    tabla, las llaves únicas y las llaves foráneas. Las filas inválidas se omiten y se reportan.
+    """
+    def __init__(self, conexion, modelo, validador, tamano_lote=TAMANO_LOTE, simular=False):
+        """
+        Constructor de la clase.
+
+        :param conexion: Conexión con una transacción abierta.
+        :param modelo: Modelo de destino.
+        :param validador: Caché de ids compartida entre los archivos de una importación.
+        :param tamano_lote: Filas por inserción en bloque.
+        :param simular: Si es verdadero se valida sin escribir.
+        """
+        self.conexion = conexion
+        self.tabla = modelo.__table__
+        self.validador = validador
+        self.tamano_lote = tamano_lote
+        self.simular = simular
+        self.leidas = 0
+        self.insertadas = 0
+        self.invalidas = 0
+        self.errores = []
+
+    def preparar_columnas(self, encabezado):
+        """
+        Relaciona el encabezado del archivo con las columnas de la tabla.
+
+        :param encabezado: Nombres de las columnas del archivo.
+        :return: Lista de tuplas con el nombre, la función de conversión, el valor por defecto y si es obligatoria.
+        :raises ErrorImportacion: Si el archivo tiene columnas que no existen o le falta alguna obligatoria.
+        """
+        desconocidas = [nombre for nombre in encabezado if nombre not in self.tabla.c]
+        if desconocidas:
+            raise ErrorImportacion(f'Columnas desconocidas para {self.tabla.name}: {", ".join(desconocidas)}')
+
+        faltantes = [
+            columna.name for columna in self.tabla.c
+            if not columna.nullable and not columna.primary_key and columna.name not in encabezado
+            and columna.default is None and columna.server_default is None
+        ]
+        if faltantes:
+            raise ErrorImportacion(f'Faltan columnas obligatorias de {self.tabla.name}: {", ".join(faltantes)}')
+
+        ahora = datetime.now().replace(microsecond=0)
+
+        return [
+            (nombre, convertidor(self.tabla.c[nombre]), valor_por_defecto(self.tabla.c[nombre], ahora),
+             not self.tabla.c[nombre].nullable and not self.tabla.c[nombre].primary_key)
+            for nombre in encabezado
+        ]
+
+    def registrar_error(self, linea, mensaje):
+        self.invalidas += 1
+        if len(self.errores) < ERRORES_MOSTRADOS:
+            self.errores.append(f'línea {linea}: {mensaje}')
+
+    def convertir_fila(self, columnas, celdas):
+        """
+        Convierte las celdas de una fila a un diccionario con los valores de cada columna.
+
+        :param columnas: Columnas preparadas con `preparar_columnas`.
+        :param celdas: Celdas de la fila.
+        :return: Diccionario con los valores.
+        :raises ValueError: Si una celda no se puede convertir o falta un valor obligatorio.
+        """
+        if len(celdas) != len(columnas):
+            raise ValueError(f'se esperaban {len(columnas)} columnas y hay {len(celdas)}')
+
+        fila = {}
+        for (nombre, convertir, por_defecto, obligatoria), celda in zip(columnas, celdas):
+            if celda == '':
+                if por_defecto is None and obligatoria:
+                    raise ValueError(f'{nombre} es obligatorio')
+                valor = por_defecto
+            else:
+                try:
+                    valor = convertir(celda)
+                except ValueError:
+                    raise ValueError(f"{nombre} tiene un valor inválido: '{celda}'")
+
+            if valor is not None or nombre != 'id':
+                fila[nombre] = valor
+
+        return fila
+
+    def validar_llaves(self, fila, llaves, ids_tabla):
+        """
+        Verifica que el id de la fila sea nuevo y que sus llaves foráneas existan.
+
+        :param fila: Valores de la fila.
+        :param llaves: Lista de tuplas con la columna y el conjunto de ids referenciados.
+        :param ids_tabla: Conjunto de ids de la tabla de destino.
+        :raises ValueError: Si el id ya existe o una llave foránea no existe.
+        """
+        if 'id' in fila and str(fila['id']) in ids_tabla:
+            raise ValueError(f"el id {fila['id']} ya existe")
+
+        for nombre, ids in llaves:
+            valor = fila.get(nombre)
+            if valor is not None and str(valor) not in ids:
+                raise ValueError(f'{nombre} = {valor} no existe')
+
+    def validar_unicas(self, fila, unicas):
+        """
+        Verifica que la fila no repita el valor de una llave única de la tabla o del propio archivo.
+
+        :param fila: Valores de la fila.
+        :param unicas: Lista de tuplas con la columna, la columna que debe ser nula y el conjunto de valores usados.
+        :raises ValueError: Si algún valor ya está en uso.
+        """
+        for nombre, nula, valores in unicas:
+            valor = fila.get(nombre)
+            if valor is None or (nula is not None and fila.get(nula) is not None):
+                continue
+
+            if str(valor) in valores:
+                if nula is not None:
+                    raise ValueError(f'ya hay un {self.tabla.name} sin {nula} con {nombre} = {valor}')
+                raise ValueError(f'{nombre} = {valor} ya existe')
+
+    def escribir(self, lote, desde, hasta):
+        """
+        Inserta un lote de filas, separando las que traen id de las que lo generan en la base de datos.
+
+        :param lote: Lista de filas.
+        :param desde: Línea del archivo de la primera fila del lote.
+        :param hasta: Línea del archivo de la última fila del lote.
+        :raises ErrorImportacion: Si la base de datos rechaza el lote por una restricción.
+        """
+        if not self.simular:
+            con_id = [fila for fila in lote if 'id' in fila]
+            sin_id = [fila for fila in lote if 'id' not in fila]
+
+            try:
+                for filas in (con_id, sin_id):
+                    if filas:
+                        self.conexion.execute(insert(self.tabla), filas)
+            except IntegrityError as e:
+                raise ErrorImportacion(
+                    f'La base de datos rechazó las líneas {desde} a {hasta} de {self.tabla.name}: {e.orig}'
+                )
+
+        self.insertadas += len(lote)
+
+    def importar(self, archivo):
+        """
+        Importa las filas de un archivo CSV abierto.
+
+        El separador (`;` o `,`) se detecta en el encabezado.
+
+        :param archivo: Archivo de texto.
+        :return: El propio importador, con los contadores y errores.
+        """
+        primera = archivo.readline()
+        separador = ';' if ';' in primera else ','
+        encabezado = [nombre.strip() for nombre in next(csv.reader([primera], delimiter=separador))]
+        columnas = self.preparar_columnas(encabezado)
+
+        ids_tabla = self.validador.de_tabla(self.tabla)
+        llaves = [
+            (columna.name, self.validador.de_tabla(next(iter(columna.foreign_keys)).column.table))
+            for columna in self.tabla.c
+            if columna.foreign_keys and columna.name in encabezado
+        ]
+        unicas = [
+            (nombre, nula, self.validador.de_llave_unica(self.tabla, nombre, nula))
+            for nombre, nula in LLAVES_UNICAS.get(self.tabla.name, [])
+            if nombre in encabezado
+        ]
+
+        derivadas = [
+            (destino, origen, calcular)
+            for destino, origen, calcular in COLUMNAS_DERIVADAS.get(self.tabla.name, [])
+            if origen in encabezado and destino not in encabezado
+        ]
+
+        lote = []
+        inicio_lote = None
+        for linea, celdas in enumerate(csv.reader(archivo, delimiter=separador), 2):
+            if not celdas:
+                continue
+
+            self.leidas += 1
+
+            try:
+                fila = self.convertir_fila(columnas, celdas)
+                self.validar_llaves(fila, llaves, ids_tabla)
+                self.validar_unicas(fila, unicas)
+            except ValueError as e:
+                self.registrar_error(linea, str(e))
+                continue
+
+            for destino, origen, calcular in derivadas:
+                fila[destino] = calcular(fila[origen])
+
+            if 'id' in fila:
+                ids_tabla.add(str(fila['id']))
+
+            for nombre, nula, valores in unicas:
+                if fila.get(nombre) is not None and (nula is None or fila.get(nula) is None):
+                    valores.add(str(fila[nombre]))
+
+            if not lote:
+                inicio_lote = linea
+            lote.append(fila)
+            if len(lote) >= self.tamano_lote:
+                self.escribir(lote, inicio_lote, linea)
+                lote = []
+
+        if lote:
+            self.escribir(lote, inicio_lote, linea)
+
+        if not self.simular and self.conexion.dialect.name == 'postgresql':
+            # Las filas con id explícito no avanzan la secuencia de la llave primaria.
+            self.conexion.execute(
+                text(f"SELECT setval(pg_get_serial_sequence('{self.tabla.name}', 'id'), "
+                     f"GREATEST((SELECT MAX(id) FROM {self.tabla.name}), 1))")
+            )
+
+        return self
+
+
+def importar_archivos(motor, rutas, tabla=None, tamano_lote=TAMANO_LOTE, simular=False, omitir_invalidas=False):
+    """
+    Importa varios archivos CSV en orden, en una sola transacción.
+
+    Si algún archivo tiene filas inválidas y no se pidió omitirlas, o si es una simulación, la
+    transacción se revierte al final.
+
+    :param motor: Engine de SQLAlchemy.
+    :param rutas: Rutas de los archivos, en el orden en que se deben importar.
+    :param tabla: Nombre de la tabla de destino para todos los archivos (opcional).
+    :param tamano_lote: Filas por inserción en bloque.
+    :param simular: Si es verdadero solo se valida.
+    :param omitir_invalidas: Si es verdadero se confirman las filas válidas aunque haya inválidas.
+    :return: Lista de tuplas con la ruta, el importador y los segundos que tomó cada archivo.
+    :raises ErrorImportacion: Si la tabla o las columnas de un archivo no son válidas.
+    """
+    if tabla is not None and tabla not in TABLAS_IMPORTABLES:
+        raise ErrorImportacion(f'La tabla {tabla} no se puede importar')
+
+    resultados = []
+
+    with motor.connect() as conexion:
+        transaccion = conexion.begin()
+        validador = ValidadorLlaves(conexion)
+
+        try:
+            for ruta in rutas:
+                modelo = TABLAS_IMPORTABLES[tabla] if tabla else modelo_de_archivo(ruta)
+                inicio = time.perf_counter()
+
+                with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+                    importador = ImportadorCsv(conexion, modelo, validador, tamano_lote, simular).importar(archivo)
+
+                resultados.append((ruta, importador, time.perf_counter() - inicio))
+        except Exception:
+            transaccion.rollback()
+            raise
+
+        if simular or (not omitir_invalidas and any(importador.invalidas for _, importador, _ in resultados)):
+            transaccion.rollback()
+        else:
+            transaccion.commit()
+
+    return resultados
+
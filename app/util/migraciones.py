@@ -0,0 +1,199 @@
+from sqlalchemy import bindparam, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Cliente, Punto, Redimir, Vehiculo
+from app.util.utilitarios import normalizar_placa
+
+# Cantidad máxima de grupos de filas duplicadas que se reportan por índice.
+DUPLICADOS_MOSTRADOS = 20
+
+
+class ErrorMigracion(Exception):
+    """
+    Error que impide completar la actualización del esquema (por ejemplo, datos que violan un índice único).
+    """
+
+
+# Columnas agregadas a tablas existentes; deben admitir nulos porque las filas previas no tienen valor.
+COLUMNAS_NUEVAS = {
+    'vehiculo': ['placa_normalizada'],
+    'cliente': ['puntos_saldo'],
+}
+
+
+def agregar_columnas_faltantes():
+    """
+    Agrega a las tablas existentes las columnas de `COLUMNAS_NUEVAS` que aún no tienen.
+
+    :return: Nombres de las columnas agregadas, como `tabla.columna`.
+    """
+    inspector = db.inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    agregadas = []
+
+    for tabla, nombres in COLUMNAS_NUEVAS.items():
+        if tabla not in tablas:
+            continue
+
+        existentes = {columna['name'] for columna in inspector.get_columns(tabla)}
+        for nombre in nombres:
+            if nombre in existentes:
+                continue
+
+            columna = db.metadata.tables[tabla].c[nombre]
+            tipo = columna.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as conexion:
+                conexion.execute(db.text(f'ALTER TABLE {tabla} ADD COLUMN {nombre} {tipo}'))
+            agregadas.append(f'{tabla}.{nombre}')
+
+    return agregadas
+
+
+def normalizar_placas_pendientes(tamano_lote=5000):
+    """
+    Calcula la placa normalizada de los vehículos que aún no la tienen.
+
+    :param tamano_lote: Filas actualizadas por sentencia.
+    :return: Lista con una descripción de la actualización, o vacía si no había placas pendientes.
+    """
+    consulta = select(Vehiculo.id, Vehiculo.placa).where(Vehiculo.placa_normalizada == None, Vehiculo.placa != None)
+    sentencia = (
+        update(Vehiculo.__table__)
+        .where(Vehiculo.__table__.c.id == bindparam('vehiculo_id'))
+        .values(placa_normalizada=bindparam('normalizada'))
+    )
+    actualizadas = 0
+
+    with db.engine.begin() as conexion:
+        pendientes = conexion.execute(consulta).all()
+
+        for inicio in range(0, len(pendientes), tamano_lote):
+            lote = pendientes[inicio:inicio + tamano_lote]
+            conexion.execute(sentencia, [
+                {'vehiculo_id': vehiculo_id, 'normalizada': normalizar_placa(placa)} for vehiculo_id, placa in lote
+            ])
+            actualizadas += len(lote)
+
+    return [f'vehiculo.placa_normalizada ({actualizadas} filas)'] if actualizadas else []
+
+
+def calcular_saldos_pendientes():
+    """
+    Calcula el saldo de puntos de los clientes que aún no lo tienen.
+
+    El saldo es la suma de los movimientos de `punto`. Las redenciones registradas antes de que
+    existiera el saldo apuntan a un movimiento positivo en lugar de a uno negativo propio, así que
+    también se descuentan.
+
+    :return: Lista con una descripción de la actualización, o vacía si no había saldos pendientes.
+    """
+    movimientos = (
+        select(func.coalesce(func.sum(Punto.cantidad), 0))
+        .where(Punto.cliente_id == Cliente.id)
+        .scalar_subquery()
+    )
+    redenciones_previas = (
+        select(func.coalesce(func.sum(Redimir.cantidad), 0))
+        .join(Punto, Redimir.puntos_id == Punto.id)
+        .where(Punto.cliente_id == Cliente.id, Punto.cantidad > 0)
+        .scalar_subquery()
+    )
+    sentencia = (
+        update(Cliente)
+        .where(Cliente.puntos_saldo == None)
+        .values(puntos_saldo=movimientos - redenciones_previas)
+        .execution_options(synchronize_session=False)
+    )
+
+    with db.engine.begin() as conexion:
+        actualizadas = conexion.execute(sentencia).rowcount
+
+    return [f'cliente.puntos_saldo ({actualizadas} filas)'] if actualizadas else []
+
+
+def crear_indices_faltantes():
+    """
+    Crea los índices declarados en los modelos que aún no existen en la base de datos.
+
+    `db.create_all()` no modifica tablas existentes, así que las bases creadas antes de declarar
+    un índice no lo tendrían. Los demás índices se crean aunque alguno único no se pueda crear
+    porque los datos existentes lo violan; al final se reportan las filas duplicadas, ya que rutas
+    como el ingreso de vehículos dependen de esos índices para rechazar los duplicados.
+
+    :return: Nombres de los índices creados.
+    :raises ErrorMigracion: Si algún índice único no se pudo crear.
+    """
+    inspector = db.inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    creados = []
+    fallidos = []
+
+    for tabla in db.metadata.tables.values():
+        if tabla.name not in tablas:
+            continue
+
+        existentes = {indice['name'] for indice in inspector.get_indexes(tabla.name)}
+        for indice in tabla.indexes:
+            if indice.name in existentes:
+                continue
+
+            try:
+                indice.create(db.engine)
+            except IntegrityError:
+                fallidos.append(describir_duplicados(indice))
+                continue
+
+            creados.append(indice.name)
+
+    if fallidos:
+        raise ErrorMigracion('\n'.join(fallidos))
+
+    return creados
+
+
+def describir_duplicados(indice):
+    """
+    Describe las filas que impiden crear un índice único.
+
+    :param indice: Índice único de SQLAlchemy.
+    :return: Texto con el índice y los ids de las filas de cada valor repetido.
+    """
+    tabla = indice.table
+    columnas = list(indice.columns)
+    # Los índices parciales solo aplican a las filas que cumplen su condición, como los parqueos abiertos.
+    condicion = indice.dialect_kwargs.get(f'{db.engine.dialect.name}_where')
+
+    repetidos = select(*columnas).group_by(*columnas).having(func.count() > 1).limit(DUPLICADOS_MOSTRADOS)
+    if condicion is not None:
+        repetidos = repetidos.where(condicion)
+
+    consulta = select(tabla.c.id, *columnas).where(tuple_(*columnas).in_(repetidos)).order_by(*columnas, tabla.c.id)
+    if condicion is not None:
+        consulta = consulta.where(condicion)
+
+    grupos = {}
+    with db.engine.connect() as conexion:
+        for fila_id, *valores in conexion.execute(consulta):
+            grupos.setdefault(tuple(valores), []).append(str(fila_id))
+
+    lineas = [f'No se creó el índice único {indice.name}: la tabla {tabla.name} tiene filas duplicadas que deben corregirse.']
+    for valores, ids in grupos.items():
+        llave = ', '.join(f'{columna.name} = {valor}' for columna, valor in zip(columnas, valores))
+        lineas.append(f'  {llave}: ids {", ".join(ids)}')
+
+    return '\n'.join(lineas)
+
+
+def actualizar_esquema():
+    """
+    Aplica sobre una base de datos existente los cambios de esquema que `db.create_all()` no cubre.
+
+    :return: Nombres de los objetos creados.
+    """
+    return (
+        agregar_columnas_faltantes()
+        + normalizar_placas_pendientes()
+        + calcular_saldos_pendientes()
+        + crear_indices_faltantes()
+    )
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from flask import current_app
+
+from app import db
+from app.models import Modulo, Parqueo
+
+
+class OcupacionModulos:
+    """
+    Mapa en memoria de los módulos ocupados de cada sede.
+
+    Se reconstruye a partir de la tabla parqueo la primera vez que se consulta en el proceso
+    y luego se mantiene al día con los ingresos y retiros de vehículos, de modo que la
+    disponibilidad de los módulos se responde sin consultar la base de datos. Como cada proceso
+    solo ve sus propios ingresos y retiros, el mapa se reconstruye de nuevo cuando han pasado
+    `OCUPACION_TTL` segundos desde la última carga.
+    """
+    def __init__(self, ttl=30):
+        """
+        Constructor de la clase.
+
+        :param ttl: Segundos de vigencia por defecto del mapa.
+        """
+        self._lock = threading.Lock()
+        self._ocupados = {}
+        self._expira = 0
+        self._ttl = ttl
+
+    def cargar(self):
+        """
+        Reconstruye el mapa de ocupación a partir de los parqueos activos.
+        """
+        ahora = time.monotonic()
+        filas = (
+            db.session.query(Modulo.sede_id, Parqueo.modulo_id)
+            .join(Modulo, Parqueo.modulo_id == Modulo.id)
+            .filter(Parqueo.fecha_hora_salida == None)
+            .all()
+        )
+
+        ocupados = {}
+        for sede_id, modulo_id in filas:
+            ocupados.setdefault(sede_id, set()).add(modulo_id)
+
+        ttl = current_app.config.get('OCUPACION_TTL', self._ttl)
+
+        with self._lock:
+            self._ocupados = ocupados
+            self._expira = ahora + ttl
+
+    def _asegurar_cargado(self):
+        """
+        Carga el mapa si aún no se ha construido en este proceso o si ya expiró.
+        """
+        if self._expira <= time.monotonic():
+            self.cargar()
+
+    def ocupar(self, sede_id, modulo_id):
+        """
+        Marca un módulo como ocupado.
+
+        :param sede_id: Identificador de la sede.
+        :param modulo_id: Identificador del módulo.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            self._ocupados.setdefault(sede_id, set()).add(modulo_id)
+
+    def liberar(self, sede_id, modulo_id):
+        """
+        Marca un módulo como disponible.
+
+        :param sede_id: Identificador de la sede.
+        :param modulo_id: Identificador del módulo.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            self._ocupados.get(sede_id, set()).discard(modulo_id)
+
+    def esta_ocupado(self, sede_id, modulo_id):
+        """
+        Indica si un módulo se encuentra ocupado.
+
+        :param sede_id: Identificador de la sede.
+        :param modulo_id: Identificador del módulo.
+        :return: True si el módulo está ocupado, False en caso contrario.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            return modulo_id in self._ocupados.get(sede_id, ())
+
+    def ocupados(self, sede_id):
+        """
+        Recupera los módulos ocupados de una sede.
+
+        :param sede_id: Identificador de la sede.
+        :return: Conjunto inmutable con los identificadores de los módulos ocupados.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            return frozenset(self._ocupados.get(sede_id, ()))
+
+
+ocupacion_modulos = OcupacionModulos()
@@ -0,0 +1,94 @@
+from sqlalchemy import or_
+
+LONGITUD_MAXIMA = 100
+
+
+def leer_parametros(args):
+    """
+    Lee los parámetros que envía DataTables en modo `serverSide`.
+
+    Además de los parámetros del protocolo se acepta `despuesDe`, el id de la última fila de la
+    página anterior, para paginar por llave (keyset) en lugar de por desplazamiento.
+
+    :param args: Parámetros de la petición (`request.args`).
+    :return: Diccionario con los parámetros normalizados.
+    """
+    orden = []
+    i = 0
+    while f'order[{i}][column]' in args:
+        columna = args.get(f'order[{i}][column]', type=int)
+        direccion = args.get(f'order[{i}][dir]', 'asc')
+        if columna is not None:
+            orden.append((columna, direccion == 'desc'))
+        i += 1
+
+    longitud = args.get('length', 10, type=int)
+    if longitud is None or longitud < 1:
+        longitud = LONGITUD_MAXIMA
+
+    return {
+        'draw': args.get('draw', 0, type=int),
+        'inicio': max(args.get('start', 0, type=int) or 0, 0),
+        'longitud': min(longitud, LONGITUD_MAXIMA),
+        'busqueda': (args.get('search[value]') or '').strip(),
+        'orden': orden,
+        'despues_de': args.get('despuesDe', type=int),
+    }
+
+
+def escapar_like(texto):
+    """
+    Escapa los comodines de LIKE de un texto de búsqueda.
+
+    :param texto: Texto a escapar.
+    :return: Texto escapado con `\\` como carácter de escape.
+    """
+    return texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def paginar(consulta, columna_id, columnas, args, serializar):
+    """
+    Pagina, filtra y ordena en la base de datos una consulta para una tabla DataTables.
+
+    Si la tabla no pide un orden explícito, las filas se ordenan por id y, cuando el cliente envía
+    `despuesDe`, la página se obtiene con `id > despuesDe` en lugar de `OFFSET`, de modo que el
+    costo de cada página no crece con la posición.
+
+    :param consulta: Consulta base, ya restringida al alcance del usuario.
+    :param columna_id: Columna de llave primaria del modelo.
+    :param columnas: Columnas de la tabla en el orden en que se muestran; None para las que no se pueden ordenar ni buscar.
+    :param args: Parámetros de la petición (`request.args`).
+    :param serializar: Función que convierte una fila en la lista de celdas de la tabla.
+    :return: Diccionario con la respuesta del protocolo de DataTables.
+    """
+    parametros = leer_parametros(args)
+
+    total = consulta.order_by(None).count()
+    filtrados = total
+
+    if parametros['busqueda']:
+        patron = f"%{escapar_like(parametros['busqueda'])}%"
+        consulta = consulta.filter(or_(*[columna.ilike(patron, escape='\\') for columna in columnas if columna is not None]))
+        filtrados = consulta.order_by(None).count()
+
+    orden = [(columnas[i], descendente) for i, descendente in parametros['orden'] if 0 <= i < len(columnas) and columnas[i] is not None]
+
+    if orden:
+        consulta = consulta.order_by(*[columna.desc() if descendente else columna.asc() for columna, descendente in orden], columna_id)
+        consulta = consulta.offset(parametros['inicio'])
+    elif parametros['despues_de'] is not None:
+        consulta = consulta.filter(columna_id > parametros['despues_de']).order_by(columna_id)
+    else:
+        consulta = consulta.order_by(columna_id).offset(parametros['inicio'])
+
+    filas = consulta.limit(parametros['longitud']).all()
+
+    return {
+        'status': 'success',
+        'message': 'Consulta realizada de forma satisfactoria',
+        'draw': parametros['draw'],
+        'recordsTotal': total,
+        'recordsFiltered': filtrados,
+        'ultimoId': filas[-1].id if filas else None,
+        'data': [serializar(fila) for fila in filas],
+    }
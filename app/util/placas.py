@@ -0,0 +1,174 @@
+from bisect import bisect_left, insort
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select, union
+
+from app import db
+from app.models import Cliente, Modulo, Parqueo, Sede, Vehiculo
+from app.util.utilitarios import normalizar_placa
+
+
+class IndicePlacas:
+    """
+    Índice en memoria de las placas de los vehículos activos de cada parqueadero para autocompletar.
+
+    Por cada parqueadero se guarda una lista ordenada de tuplas `(placa normalizada, id, placa)`;
+    las placas que empiezan por un prefijo forman un tramo contiguo de la lista que se ubica con
+    búsqueda binaria. Un vehículo pertenece a un parqueadero si su cliente es de ese parqueadero o
+    si ha tenido algún parqueo en sus sedes.
+
+    Se construye la primera vez que se consulta en el proceso y luego se mantiene al día con los
+    vehículos que se crean, cambian de placa o se activan y desactivan. Como los vehículos creados
+    por otros procesos (otros workers o `flask importar-csv`) no se ven, el índice se reconstruye
+    cuando han pasado `PLACAS_TTL` segundos desde la última carga.
+    """
+    def __init__(self, ttl=60):
+        """
+        Constructor de la clase.
+
+        :param ttl: Segundos de vigencia por defecto del índice.
+        """
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self._vehiculos = {}
+        self._expira = 0
+        self._ttl = ttl
+
+    def _consulta(self, *condiciones):
+        """
+        Construye la consulta de los vehículos activos de cada parqueadero, por sus clientes y sus parqueos.
+
+        :param condiciones: Condiciones adicionales sobre los vehículos.
+        :return: Consulta con el parqueadero, el id, la placa normalizada y la placa.
+        """
+        por_cliente = (
+            select(Cliente.parqueadero_id, Vehiculo.id, Vehiculo.placa_normalizada, Vehiculo.placa)
+            .join(Cliente, Vehiculo.cliente_id == Cliente.id)
+            .where(Vehiculo.disponible == True, *condiciones)
+        )
+        por_parqueo = (
+            select(Sede.parqueadero_id, Vehiculo.id, Vehiculo.placa_normalizada, Vehiculo.placa)
+            .join(Parqueo, Parqueo.vehiculo_id == Vehiculo.id)
+            .join(Modulo, Parqueo.modulo_id == Modulo.id)
+            .join(Sede, Modulo.sede_id == Sede.id)
+            .where(Vehiculo.disponible == True, *condiciones)
+        )
+
+        return union(por_cliente, por_parqueo)
+
+    def cargar(self):
+        """
+        Reconstruye el índice a partir de los clientes y los parqueos de cada parqueadero.
+        """
+        ahora = time.monotonic()
+        entradas = {}
+        vehiculos = {}
+        for parqueadero_id, vehiculo_id, normalizada, placa in db.session.execute(self._consulta()):
+            if not normalizada:
+                continue
+
+            entradas.setdefault(parqueadero_id, []).append((normalizada, vehiculo_id, placa))
+            vehiculos.setdefault(vehiculo_id, set()).add(parqueadero_id)
+
+        for lista in entradas.values():
+            lista.sort()
+
+        ttl = current_app.config.get('PLACAS_TTL', self._ttl)
+
+        with self._lock:
+            self._entradas = entradas
+            self._vehiculos = vehiculos
+            self._expira = ahora + ttl
+
+    def _asegurar_cargado(self):
+        """
+        Carga el índice si aún no se ha construido en este proceso o si ya expiró.
+        """
+        if self._expira <= time.monotonic():
+            self.cargar()
+
+    def agregar(self, parqueadero_id, vehiculo):
+        """
+        Agrega un vehículo al índice de un parqueadero si aún no está.
+
+        :param parqueadero_id: Identificador del parqueadero.
+        :param vehiculo: Vehículo con placa.
+        """
+        self._asegurar_cargado()
+
+        if not vehiculo.placa_normalizada or vehiculo.disponible is False:
+            return
+
+        with self._lock:
+            parqueaderos = self._vehiculos.setdefault(vehiculo.id, set())
+            if parqueadero_id in parqueaderos:
+                return
+
+            parqueaderos.add(parqueadero_id)
+            insort(self._entradas.setdefault(parqueadero_id, []), (vehiculo.placa_normalizada, vehiculo.id, vehiculo.placa))
+
+    def actualizar(self, vehiculo):
+        """
+        Actualiza la placa de un vehículo en los parqueaderos donde está indexado.
+
+        :param vehiculo: Vehículo con la placa nueva.
+        """
+        self._asegurar_cargado()
+
+        with self._lock:
+            for parqueadero_id in self._vehiculos.get(vehiculo.id, ()):
+                lista = self._entradas[parqueadero_id]
+                lista[:] = [entrada for entrada in lista if entrada[1] != vehiculo.id]
+                if vehiculo.placa_normalizada:
+                    insort(lista, (vehiculo.placa_normalizada, vehiculo.id, vehiculo.placa))
+
+    def refrescar(self, vehiculo_id):
+        """
+        Vuelve a consultar los parqueaderos de un vehículo, por ejemplo después de activarlo o desactivarlo.
+
+        :param vehiculo_id: Identificador del vehículo.
+        """
+        self._asegurar_cargado()
+
+        filas = db.session.execute(self._consulta(Vehiculo.id == vehiculo_id)).all()
+
+        with self._lock:
+            for parqueadero_id in self._vehiculos.pop(vehiculo_id, ()):
+                lista = self._entradas[parqueadero_id]
+                lista[:] = [entrada for entrada in lista if entrada[1] != vehiculo_id]
+
+            for parqueadero_id, _, normalizada, placa in filas:
+                if normalizada:
+                    self._vehiculos.setdefault(vehiculo_id, set()).add(parqueadero_id)
+                    insort(self._entradas.setdefault(parqueadero_id, []), (normalizada, vehiculo_id, placa))
+
+    def sugerir(self, parqueadero_id, prefijo, limite=10):
+        """
+        Busca los vehículos de un parqueadero cuya placa empieza por un prefijo.
+
+        :param parqueadero_id: Identificador del parqueadero.
+        :param prefijo: Prefijo de la placa tal como se digitó.
+        :param limite: Cantidad máxima de resultados.
+        :return: Lista de tuplas con el id y la placa de cada vehículo, en orden alfabético.
+        """
+        self._asegurar_cargado()
+
+        prefijo = normalizar_placa(prefijo)
+        if not prefijo:
+            return []
+
+        with self._lock:
+            lista = self._entradas.get(parqueadero_id, [])
+            resultado = []
+            i = bisect_left(lista, (prefijo,))
+
+            while i < len(lista) and len(resultado) < limite and lista[i][0].startswith(prefijo):
+                resultado.append((lista[i][1], lista[i][2]))
+                i += 1
+
+        return resultado
+
+
+indice_placas = IndicePlacas()
@@ -0,0 +1,187 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import cast, func, select
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models import Arrendamiento, Cliente, Modulo, Parqueo, Vehiculo
+from app.util.arrendamientos import es_ultimo_periodo
+from app.util.base_datos import segundos_epoca
+
+DIAS_PRONOSTICO = 90
+DIAS_MAXIMOS = 366
+
+EPOCA = datetime(1970, 1, 1)
+
+
+def leer_horizonte(args):
+    """
+    Lee la cantidad de días a pronosticar y la sede de los parámetros de una petición.
+
+    :param args: Parámetros de la petición.
+    :return: Tupla con la cantidad de días y el identificador de la sede (o None).
+    :raises ValueError: Si la cantidad de días no es válida.
+    """
+    dias = args.get('dias', DIAS_PRONOSTICO, type=int)
+
+    if not 1 <= dias <= DIAS_MAXIMOS:
+        raise ValueError(f'Los días deben estar entre 1 y {DIAS_MAXIMOS}')
+
+    return dias, args.get('sedeId', type=int)
+
+
+class PronosticoVencimientos:
+    """
+    Caché por parqueadero de las fechas de fin y de fin de pausa de sus arrendamientos vigentes.
+
+    Las fechas se guardan como segundos desde la época, en listas ordenadas por sede y periodicidad.
+    Así, contar los vencimientos de cada día consiste en ubicar por búsqueda binaria el inicio de cada
+    día en la lista, sin recorrer la tabla de arrendamientos en cada consulta. La sede de un
+    arrendamiento es la del último parqueo de su vehículo; los vehículos que nunca han parqueado
+    quedan sin sede. Los periodos ya renovados no se cuentan, porque el vehículo sigue con el nuevo.
+
+    Las rutas que modifican arrendamientos invalidan el parqueadero; además, cada entrada expira tras
+    `PRONOSTICOS_TTL` segundos para que los cambios hechos por otros procesos terminen por verse.
+    """
+    def __init__(self, ttl=300):
+        """
+        Constructor de la clase.
+
+        :param ttl: Segundos de vigencia por defecto de cada parqueadero.
+        """
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self._ttl = ttl
+
+    def calendario(self, parqueadero_id):
+        """
+        Recupera las fechas de los arrendamientos de un parqueadero, cargándolas si no están en caché.
+
+        :param parqueadero_id: Identificador del parqueadero.
+        :return: Diccionario por `(sede_id, periodicidad_id)` con las listas ordenadas de fechas de fin y de fin de pausa.
+        """
+        ahora = time.monotonic()
+
+        with self._lock:
+            entrada = self._entradas.get(parqueadero_id)
+
+        if entrada is not None and entrada[0] > ahora:
+            return entrada[1]
+
+        calendario = self.cargar(parqueadero_id)
+        ttl = current_app.config.get('PRONOSTICOS_TTL', self._ttl)
+
+        with self._lock:
+            self._entradas[parqueadero_id] = (ahora + ttl, calendario)
+
+        return calendario
+
+    def cargar(self, parqueadero_id):
+        """
+        Consulta las fechas de los arrendamientos de un parqueadero que terminan desde hoy.
+
+        :param parqueadero_id: Identificador del parqueadero.
+        :return: Diccionario por `(sede_id, periodicidad_id)` con las listas ordenadas de fechas de fin y de fin de pausa.
+        """
+        hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        # `parqueo.vehiculo_id` es de texto: sin convertir el id del arrendamiento al mismo tipo, SQLite
+        # compara como números y recorre toda la tabla de parqueos por cada arrendamiento en lugar de
+        # usar el índice por vehículo.
+        parqueos_vehiculo = aliased(Parqueo)
+        ultimo_parqueo = (
+            select(func.max(parqueos_vehiculo.id))
+            .where(parqueos_vehiculo.vehiculo_id == cast(Arrendamiento.vehiculo_id, Parqueo.vehiculo_id.type))
+            .correlate(Arrendamiento)
+            .scalar_subquery()
+        )
+        ultima_sede = (
+            select(Modulo.sede_id)
+            .join(Parqueo, Parqueo.modulo_id == Modulo.id)
+            .where(Parqueo.id == ultimo_parqueo)
+            .scalar_subquery()
+        )
+        consulta = (
+            select(
+                ultima_sede, Arrendamiento.periodicidad_id, segundos_epoca(Arrendamiento.fecha_fin),
+                Arrendamiento.ha_sido_pausado, segundos_epoca(Arrendamiento.fecha_pausa)
+            )
+            .join(Vehiculo, Arrendamiento.vehiculo_id == Vehiculo.id)
+            .join(Cliente, Vehiculo.cliente_id == Cliente.id)
+            .where(Cliente.parqueadero_id == parqueadero_id, Arrendamiento.fecha_fin >= hoy, es_ultimo_periodo())
+        )
+
+        calendario = {}
+        for sede_id, periodicidad_id, fin, pausado, fin_pausa in db.session.execute(consulta):
+            fines, fines_pausa = calendario.setdefault((sede_id, periodicidad_id), ([], []))
+            fines.append(fin)
+            if pausado and fin_pausa is not None:
+                fines_pausa.append(fin_pausa)
+
+        for fines, fines_pausa in calendario.values():
+            fines.sort()
+            fines_pausa.sort()
+
+        return calendario
+
+    def pronosticar(self, parqueadero_id, desde, dias, sede_id=None):
+        """
+        Cuenta por día los arrendamientos que vencen y las pausas que terminan.
+
+        La fecha de fin ya incluye los días de pausa, porque pausar un arrendamiento la aplaza; el fin
+        de la pausa se reporta aparte porque desde ese día el vehículo vuelve a ocupar un módulo.
+
+        :param parqueadero_id: Identificador del parqueadero.
+        :param desde: Primer día del pronóstico, a medianoche.
+        :param dias: Cantidad de días.
+        :param sede_id: Identificador de una sede (opcional).
+        :return: Lista de diccionarios por sede y periodicidad con las listas `vencen` y `finPausa`.
+        """
+        limites = [(desde + timedelta(days=i) - EPOCA).total_seconds() for i in range(dias + 1)]
+        resultado = []
+
+        for (sede, periodicidad_id), (fines, fines_pausa) in sorted(
+            self.calendario(parqueadero_id).items(), key=lambda item: (item[0][0] is None, item[0])
+        ):
+            if sede_id is not None and sede != sede_id:
+                continue
+
+            vencen = contar_por_dia(fines, limites)
+            fin_pausa = contar_por_dia(fines_pausa, limites)
+
+            if any(vencen) or any(fin_pausa):
+                resultado.append({
+                    'sedeId': sede,
+                    'periodicidadId': periodicidad_id,
+                    'vencen': vencen,
+                    'finPausa': fin_pausa,
+                })
+
+        return resultado
+
+    def invalidar(self, parqueadero_id):
+        """
+        Descarta las fechas de un parqueadero para que se recarguen en la siguiente consulta.
+
+        :param parqueadero_id: Identificador del parqueadero.
+        """
+        with self._lock:
+            self._entradas.pop(parqueadero_id, None)
+
+
+def contar_por_dia(valores, limites):
+    """
+    Cuenta los valores de una lista ordenada que caen entre cada par de límites consecutivos.
+
+    :param valores: Lista ordenada.
+    :param limites: Límites ordenados; el día i va de `limites[i]` (incluido) a `limites[i + 1]` (excluido).
+    :return: Lista con `len(limites) - 1` cantidades.
+    """
+    posiciones = [bisect_left(valores, limite) for limite in limites]
+    return [fin - inicio for inicio, fin in zip(posiciones, posiciones[1:])]
+
+
+pronostico_vencimientos = PronosticoVencimientos()
@@ -0,0 +1,80 @@
+from flask import current_app
+from sqlalchemy import func, select, update
+
+from app import db
+from app.models import Cliente, Punto, Redimir
+
+
+def puntos_por_pago(total_pagado):
+    """
+    Calcula los puntos que otorga un pago: uno por cada `PUNTOS_VALOR` pesos completos.
+
+    :param total_pagado: Valor pagado.
+    :return: Cantidad de puntos.
+    """
+    valor = current_app.config.get('PUNTOS_VALOR', 1000)
+    return int(total_pagado or 0) // valor if valor > 0 else 0
+
+
+def acumular_puntos(cliente_id, total_pagado):
+    """
+    Registra dentro de la transacción de la sesión los puntos de un pago y los suma al saldo del cliente.
+
+    :param cliente_id: Identificador del cliente.
+    :param total_pagado: Valor pagado.
+    :return: Puntos otorgados.
+    """
+    cantidad = puntos_por_pago(total_pagado)
+    if cliente_id is None or cantidad <= 0:
+        return 0
+
+    db.session.add(Punto(cliente_id=cliente_id, cantidad=cantidad))
+    db.session.execute(
+        update(Cliente)
+        .where(Cliente.id == cliente_id)
+        .values(puntos_saldo=func.coalesce(Cliente.puntos_saldo, 0) + cantidad),
+        execution_options={'synchronize_session': False}
+    )
+
+    return cantidad
+
+
+def redimir_puntos(cliente_id, cantidad):
+    """
+    Descuenta puntos del saldo de un cliente y registra la redención dentro de la transacción de la sesión.
+
+    El saldo se descuenta con un `UPDATE` condicionado a que alcance, así que dos redenciones
+    simultáneas no pueden dejarlo negativo: la segunda no actualiza ninguna fila.
+
+    :param cliente_id: Identificador del cliente.
+    :param cantidad: Puntos a redimir, mayor que cero.
+    :return: Redención registrada, o None si el saldo no alcanza.
+    """
+    resultado = db.session.execute(
+        update(Cliente)
+        .where(Cliente.id == cliente_id, Cliente.puntos_saldo >= cantidad)
+        .values(puntos_saldo=Cliente.puntos_saldo - cantidad),
+        execution_options={'synchronize_session': False}
+    )
+    if resultado.rowcount == 0:
+        return None
+
+    movimiento = Punto(cliente_id=cliente_id, cantidad=-cantidad)
+    redencion = Redimir(cantidad=cantidad, punto=movimiento)
+    db.session.add_all([movimiento, redencion])
+
+    return redencion
+
+
+def saldo_puntos(documento):
+    """
+    Recupera el saldo de puntos de un cliente.
+
+    :param documento: Documento del cliente.
+    :return: Tupla con el identificador del cliente y su saldo, o None si no existe.
+    """
+    fila = db.session.execute(
+        select(Cliente.id, func.coalesce(Cliente.puntos_saldo, 0)).where(Cliente.documento == documento)
+    ).first()
+
+    return tuple(fila) if fila is not None else None
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, false, func, insert, literal, select, update
+
+from app import db
+from app.models import Arrendamiento, Cliente, Periodicidad, Vehiculo
+from app.util.arrendamientos import COLUMNAS, es_ultimo_periodo
+from app.util.base_datos import fecha_mayor, sumar_dias
+
+ACCIONES = ('renovar', 'ampliar', 'pausar')
+
+
+def leer_seleccion(data):
+    """
+    Lee los criterios con que se eligen los arrendamientos de una operación en lote.
+
+    Se aceptan `ids` (lista de identificadores), `fechaFinDesde` y `fechaFinHasta` (`AAAA-MM-DD`,
+    ambos días incluidos) y `periodicidadId`; se exige al menos los ids o una de las fechas para que
+    una petición incompleta no modifique todos los arrendamientos del parqueadero.
+
+    :param data: Cuerpo JSON de la petición.
+    :return: Diccionario con `ids`, `desde`, `hasta` (exclusivo) y `periodicidad_id`.
+    :raises ValueError: Si los criterios no son válidos.
+    """
+    ids = data.get('ids')
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+        raise ValueError('ids debe ser una lista de números')
+
+    desde = datetime.strptime(data['fechaFinDesde'], '%Y-%m-%d') if data.get('fechaFinDesde') else None
+    hasta = datetime.strptime(data['fechaFinHasta'], '%Y-%m-%d') + timedelta(days=1) if data.get('fechaFinHasta') else None
+
+    if desde and hasta and desde >= hasta:
+        raise ValueError('La fecha inicial debe ser anterior a la final')
+
+    if ids is None and desde is None and hasta is None:
+        raise ValueError('Debe indicar los ids o un rango de fechas de fin')
+
+    return {'ids': ids, 'desde': desde, 'hasta': hasta, 'periodicidad_id': data.get('periodicidadId')}
+
+
+def condiciones(parqueadero_id, ids=None, desde=None, hasta=None, periodicidad_id=None):
+    """
+    Construye los filtros de los arrendamientos de los clientes de un parqueadero.
+
+    :param parqueadero_id: Identificador del parqueadero.
+    :param ids: Identificadores de los arrendamientos (opcional).
+    :param desde: Fecha de fin mínima (opcional).
+    :param hasta: Fecha de fin máxima exclusiva (opcional).
+    :param periodicidad_id: Identificador de la periodicidad (opcional).
+    :return: Lista de condiciones para un `WHERE`.
+    """
+    vehiculos = (
+        select(Vehiculo.id)
+        .join(Cliente, Vehiculo.cliente_id == Cliente.id)
+        .where(Cliente.parqueadero_id == parqueadero_id)
+    )
+    resultado = [Arrendamiento.vehiculo_id.in_(vehiculos)]
+
+    if ids is not None:
+        resultado.append(Arrendamiento.id.in_(ids))
+    if desde is not None:
+        resultado.append(Arrendamiento.fecha_fin >= desde)
+    if hasta is not None:
+        resultado.append(Arrendamiento.fecha_fin < hasta)
+    if periodicidad_id is not None:
+        resultado.append(Arrendamiento.periodicidad_id == periodicidad_id)
+
+    return resultado
+
+
+def dias_periodicidad():
+    """
+    Subconsulta correlacionada con los días de la periodicidad de cada arrendamiento.
+
+    :return: Expresión escalar.
+    """
+    return select(Periodicidad.dias).where(Periodicidad.id == Arrendamiento.periodicidad_id).scalar_subquery()
+
+
+def contar(filtros):
+    """
+    Cuenta los arrendamientos que cumplen unos filtros.
+
+    :param filtros: Condiciones de `condiciones()`.
+    :return: Cantidad de arrendamientos.
+    """
+    return db.session.scalar(select(func.count()).select_from(Arrendamiento).where(*filtros))
+
+
+def actualizar(filtros, valores):
+    """
+    Actualiza en una sola sentencia los arrendamientos que cumplen unos filtros.
+
+    :param filtros: Condiciones del `WHERE`.
+    :param valores: Columnas y expresiones del `SET`.
+    :return: Filas con las columnas de `COLUMNAS` de los arrendamientos actualizados.
+    """
+    sentencia = update(Arrendamiento).where(*filtros).values(**valores).returning(*COLUMNAS)
+    return db.session.execute(sentencia, execution_options={'synchronize_session': False}).all()
+
+
+def renovar(filtros, ahora):
+    """
+    Crea un nuevo periodo, sin pausa y con los días de su periodicidad, para cada arrendamiento
+    seleccionado, en una sola sentencia `INSERT ... SELECT`.
+
+    El periodo anterior se conserva. El nuevo empieza donde terminaba el anterior o, si ya venció,
+    en la fecha actual. Solo se renueva el último arrendamiento de cada vehículo: los que ya tienen
+    un periodo posterior se omiten, para que renovar dos veces no cree periodos superpuestos.
+
+    :param filtros: Condiciones de `condiciones()`.
+    :param ahora: Fecha y hora actual.
+    :return: Filas de los arrendamientos creados.
+    """
+    inicio = fecha_mayor(Arrendamiento.fecha_fin, literal(ahora, DateTime))
+
+    periodos = select(
+        Arrendamiento.descripcion, inicio, sumar_dias(inicio, dias_periodicidad()), false(), literal(0),
+        Arrendamiento.vehiculo_id, Arrendamiento.periodicidad_id, Arrendamiento.medio_pago_id, Arrendamiento.tarifa_id
+    ).where(*filtros, es_ultimo_periodo())
+
+    sentencia = insert(Arrendamiento).from_select([
+        'descripcion', 'fecha_inicio', 'fecha_fin', 'ha_sido_pausado', 'tiempo_pausa',
+        'vehiculo_id', 'periodicidad_id', 'medio_pago_id', 'tarifa_id'
+    ], periodos).returning(*COLUMNAS)
+
+    return db.session.execute(sentencia).all()
+
+
+def ampliar(filtros):
+    """
+    Aplaza la fecha de fin de cada arrendamiento los días de su periodicidad.
+
+    :param filtros: Condiciones de `condiciones()`.
+    :return: Filas de los arrendamientos ampliados.
+    """
+    return actualizar(filtros, {'fecha_fin': sumar_dias(Arrendamiento.fecha_fin, dias_periodicidad())})
+
+
+def pausar(filtros, tiempo_pausa, ahora):
+    """
+    Pausa los arrendamientos con las reglas de la pausa individual: la fecha de fin se aplaza los días
+    de la pausa y se omiten los arrendamientos a los que, contados desde el final de la pausa, les
+    quedan menos días que los de la pausa.
+
+    :param filtros: Condiciones de `condiciones()`.
+    :param tiempo_pausa: Días de pausa.
+    :param ahora: Fecha y hora actual.
+    :return: Filas de los arrendamientos pausados.
+    """
+    fin_pausa = ahora + timedelta(days=tiempo_pausa)
+
+    return actualizar([*filtros, Arrendamiento.fecha_fin >= fin_pausa + timedelta(days=tiempo_pausa)], {
+        'tiempo_pausa': tiempo_pausa,
+        'ha_sido_pausado': True,
+        'fecha_fin': sumar_dias(Arrendamiento.fecha_fin, tiempo_pausa),
+        'fecha_pausa': fin_pausa,
+    })
@@ -0,0 +1,219 @@
+from datetime import date, datetime, timedelta
+import math
+
+from sqlalchemy import delete, insert, select, update
+
+from app import db
+from app.models import Modulo, Parqueo, ParqueoOcupacionHoraria, ParqueoResumenDiario, Vehiculo
+from app.util.base_datos import insert_con_conflictos, segundos_epoca
+
+SEGUNDOS_HORA = 3600
+SEGUNDOS_DIA = 86400
+EPOCA = datetime(1970, 1, 1)
+FECHA_EPOCA = date(1970, 1, 1)
+
+CLAVES_DIARIO = ('fecha', 'sede_id', 'modulo_id', 'vehiculo_tipo_id', 'medio_pago_id')
+VALORES_DIARIO = ('parqueos', 'total_pagado', 'segundos_estancia')
+CLAVES_HORARIO = ('fecha', 'hora', 'sede_id')
+VALORES_HORARIO = ('segundos_ocupados',)
+
+
+def a_segundos(fecha):
+    """
+    Convierte una fecha sin zona horaria en segundos desde la época.
+
+    :param fecha: Fecha y hora.
+    :return: Segundos desde 1970-01-01.
+    """
+    return (fecha - EPOCA).total_seconds()
+
+
+def sumar_filas(conexion, tabla, claves, valores, filas):
+    """
+    Suma en bloque los valores de las filas a las existentes con la misma llave, o las inserta.
+
+    En SQLite y PostgreSQL se usa `INSERT ... ON CONFLICT DO UPDATE`; en otros motores se intenta
+    actualizar cada fila y se inserta si no existía.
+
+    :param conexion: Conexión con una transacción abierta.
+    :param tabla: Tabla de destino.
+    :param claves: Columnas de la llave única.
+    :param valores: Columnas que se acumulan.
+    :param filas: Lista de diccionarios con las claves y los valores.
+    """
+    if not filas:
+        return
+
+    insertar = insert_con_conflictos(conexion)
+
+    if insertar is not None:
+        sentencia = insertar(tabla)
+        sentencia = sentencia.on_conflict_do_update(
+            index_elements=list(claves),
+            set_={valor: tabla.c[valor] + sentencia.excluded[valor] for valor in valores}
+        )
+        conexion.execute(sentencia, filas)
+        return
+
+    for fila in filas:
+        actualizadas = conexion.execute(
+            update(tabla)
+            .where(*[tabla.c[clave] == fila[clave] for clave in claves])
+            .values({valor: tabla.c[valor] + fila[valor] for valor in valores})
+        ).rowcount
+
+        if not actualizadas:
+            conexion.execute(insert(tabla), fila)
+
+
+class AcumuladorResumenes:
+    """
+    Acumula en memoria lo que aportan los parqueos cerrados a los resúmenes y lo guarda en bloque.
+
+    El resumen diario suma cada parqueo al día de su salida; la ocupación horaria reparte su
+    estancia entre las horas que abarca. Se puede limitar a una ventana de tiempo para reconstruir
+    solo una parte de los resúmenes.
+    """
+    def __init__(self, desde=None, hasta=None):
+        """
+        Constructor de la clase.
+
+        :param desde: Inicio de la ventana (opcional).
+        :param hasta: Fin exclusivo de la ventana (opcional).
+        """
+        self.desde = a_segundos(desde) if desde else -math.inf
+        self.hasta = a_segundos(hasta) if hasta else math.inf
+        self.diario = {}
+        self.horario = {}
+
+    def agregar(self, entrada, salida, total, medio_pago_id, modulo_id, sede_id, vehiculo_tipo_id):
+        """
+        Agrega un parqueo cerrado.
+
+        :param entrada: Entrada en segundos desde la época.
+        :param salida: Salida en segundos desde la época.
+        :param total: Valor pagado.
+        :param medio_pago_id: Identificador del medio de pago (o None).
+        :param modulo_id: Identificador del módulo.
+        :param sede_id: Identificador de la sede.
+        :param vehiculo_tipo_id: Identificador del tipo de vehículo (o None).
+        """
+        if self.desde <= salida < self.hasta:
+            clave = (FECHA_EPOCA + timedelta(days=int(salida // SEGUNDOS_DIA)), sede_id, modulo_id,
+                     vehiculo_tipo_id or 0, medio_pago_id or 0)
+            acumulado = self.diario.get(clave)
+            if acumulado is None:
+                self.diario[clave] = [1, total or 0, salida - entrada]
+            else:
+                acumulado[0] += 1
+                acumulado[1] += total or 0
+                acumulado[2] += salida - entrada
+
+        inicio = max(entrada, self.desde)
+        fin = min(salida, self.hasta)
+        hora = int(inicio // SEGUNDOS_HORA)
+
+        while inicio < fin:
+            limite = min((hora + 1) * SEGUNDOS_HORA, fin)
+            clave = (FECHA_EPOCA + timedelta(days=hora // 24), hora % 24, sede_id)
+            self.horario[clave] = self.horario.get(clave, 0) + (limite - inicio)
+            inicio = limite
+            hora += 1
+
+    def agregar_parqueo(self, parqueo, sede_id, vehiculo_tipo_id):
+        """
+        Agrega un parqueo cerrado a partir de su modelo.
+
+        :param parqueo: Parqueo con fecha de salida.
+        :param sede_id: Identificador de la sede del módulo.
+        :param vehiculo_tipo_id: Identificador del tipo de vehículo (o None).
+        """
+        self.agregar(
+            a_segundos(parqueo.fecha_hora_entrada), a_segundos(parqueo.fecha_hora_salida), parqueo.total_pagado,
+            parqueo.medio_pago_id, parqueo.modulo_id, sede_id, vehiculo_tipo_id
+        )
+
+    def guardar(self, conexion):
+        """
+        Suma lo acumulado a las tablas de resumen.
+
+        :param conexion: Conexión con una transacción abierta.
+        :return: Tupla con la cantidad de filas diarias y horarias escritas.
+        """
+        sumar_filas(conexion, ParqueoResumenDiario.__table__, CLAVES_DIARIO, VALORES_DIARIO, [
+            dict(zip(CLAVES_DIARIO, clave), parqueos=parqueos, total_pagado=total, segundos_estancia=round(segundos))
+            for clave, (parqueos, total, segundos) in self.diario.items()
+        ])
+        sumar_filas(conexion, ParqueoOcupacionHoraria.__table__, CLAVES_HORARIO, VALORES_HORARIO, [
+            dict(zip(CLAVES_HORARIO, clave), segundos_ocupados=round(segundos))
+            for clave, segundos in self.horario.items()
+        ])
+
+        return len(self.diario), len(self.horario)
+
+
+def registrar_cierre(parqueo, sede_id, vehiculo_tipo_id):
+    """
+    Suma un parqueo recién cerrado a los resúmenes dentro de la transacción de la sesión.
+
+    Los resúmenes no registran qué parqueos ya sumaron, así que solo debe llamarse después de que la
+    misma transacción cerró el parqueo con un `UPDATE` condicionado a que siguiera abierto.
+
+    :param parqueo: Parqueo con fecha de salida.
+    :param sede_id: Identificador de la sede del módulo.
+    :param vehiculo_tipo_id: Identificador del tipo de vehículo (o None).
+    """
+    acumulador = AcumuladorResumenes()
+    acumulador.agregar_parqueo(parqueo, sede_id, vehiculo_tipo_id)
+    acumulador.guardar(db.session.connection())
+
+
+def reconstruir_resumenes(desde=None, hasta=None, tamano_lote=10000):
+    """
+    Recalcula los resúmenes a partir de los parqueos cerrados, en una sola transacción.
+
+    Borra las filas de la ventana y las vuelve a calcular recorriendo los parqueos por lotes. Sin
+    ventana se reconstruyen por completo.
+
+    :param desde: Inicio de la ventana (opcional).
+    :param hasta: Fin exclusivo de la ventana (opcional).
+    :param tamano_lote: Filas leídas por lote.
+    :return: Tupla con los parqueos leídos y las filas diarias y horarias escritas.
+    """
+    consulta = (
+        select(
+            segundos_epoca(Parqueo.fecha_hora_entrada), segundos_epoca(Parqueo.fecha_hora_salida),
+            Parqueo.total_pagado, Parqueo.medio_pago_id, Parqueo.modulo_id, Modulo.sede_id, Vehiculo.vehiculo_tipo_id
+        )
+        .join(Modulo, Parqueo.modulo_id == Modulo.id)
+        .outerjoin(Vehiculo, Parqueo.vehiculo)
+        .where(Parqueo.fecha_hora_salida != None)
+    )
+
+    borrar_diario = delete(ParqueoResumenDiario)
+    borrar_horario = delete(ParqueoOcupacionHoraria)
+
+    if desde is not None:
+        consulta = consulta.where(Parqueo.fecha_hora_salida >= desde)
+        borrar_diario = borrar_diario.where(ParqueoResumenDiario.fecha >= desde.date())
+        borrar_horario = borrar_horario.where(ParqueoOcupacionHoraria.fecha >= desde.date())
+
+    if hasta is not None:
+        consulta = consulta.where(Parqueo.fecha_hora_entrada < hasta)
+        borrar_diario = borrar_diario.where(ParqueoResumenDiario.fecha < hasta.date())
+        borrar_horario = borrar_horario.where(ParqueoOcupacionHoraria.fecha < hasta.date())
+
+    acumulador = AcumuladorResumenes(desde, hasta)
+    leidos = 0
+
+    with db.engine.begin() as conexion:
+        conexion.execute(borrar_diario)
+        conexion.execute(borrar_horario)
+
+        for fila in conexion.execution_options(yield_per=tamano_lote).execute(consulta):
+            acumulador.agregar(*fila)
+            leidos += 1
+
+        filas_diarias, filas_horarias = acumulador.guardar(conexion)
+
+    return leidos, filas_diarias, filas_horarias
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy.orm import Session
+
+from app import db
+
+
+class CacheUsuarios:
+    """
+    Caché en memoria de los usuarios autenticados, con sus roles y sedes ya cargados.
+
+    Cada usuario se carga una vez en una sesión propia y se conserva desacoplado de la base de
+    datos; en cada petición se incorpora a la sesión actual sin consultas. Las rutas que modifican
+    un usuario, sus roles o sus sedes lo invalidan, y cada entrada expira tras `USUARIOS_TTL`
+    segundos para que los cambios hechos por otros procesos terminen por verse.
+    """
+    def __init__(self, ttl=60):
+        """
+        Constructor de la clase.
+
+        :param ttl: Segundos de vigencia por defecto de cada usuario.
+        """
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self._ttl = ttl
+
+    def obtener(self, usuario_id, cargar):
+        """
+        Recupera un usuario, cargándolo si no está en la caché o si su entrada expiró.
+
+        :param usuario_id: Identificador del usuario.
+        :param cargar: Función que recibe una sesión y el identificador y retorna el usuario con sus relaciones cargadas.
+        :return: Usuario asociado a la sesión actual o None si no existe.
+        """
+        ahora = time.monotonic()
+
+        with self._lock:
+            entrada = self._entradas.get(usuario_id)
+
+        if entrada is None or entrada[0] <= ahora:
+            with Session(db.engine, expire_on_commit=False) as sesion:
+                usuario = cargar(sesion, usuario_id)
+
+            if usuario is None:
+                return None
+
+            ttl = current_app.config.get('USUARIOS_TTL', self._ttl)
+            entrada = (ahora + ttl, usuario)
+
+            with self._lock:
+                self._entradas[usuario_id] = entrada
+
+        return db.session.merge(entrada[1], load=False)
+
+    def invalidar(self, *usuario_ids):
+        """
+        Descarta uno o varios usuarios para que se recarguen en la siguiente petición.
+
+        :param usuario_ids: Identificadores de los usuarios a invalidar.
+        """
+        with self._lock:
+            for usuario_id in usuario_ids:
+                self._entradas.pop(usuario_id, None)
+
+
+cache_usuarios = CacheUsuarios()
@@ -0,0 +1,266 @@
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import threading
+
+# ReportLab y qrcode se importan al generar el primer ticket para no cargarlos al arrancar cada
+# proceso. Un centímetro en puntos PDF, igual a `reportlab.lib.units.cm`.
+cm = 72 / 2.54
+
+TICKET_ANCHO = 8 * cm
+TICKET_ALTO = 12 * cm
+INTERLINEADO = 12
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'images', 'logo-generico.png')
+CONDICIONES_SERVICIO = "Este servicio no se hace responsable por objetos dejados dentro del vehículo."
+
+DatosTicket = namedtuple('DatosTicket', ['placa', 'fecha_ingreso', 'costo_servicio', 'atendido_por'])
+
+
+class PlantillaTicket:
+    """
+    Partes estáticas del ticket de un parqueadero: logo, encabezado y condiciones del servicio.
+
+    Se construye una sola vez por parqueadero; cada ticket solo estampa los campos variables.
+    """
+    _logo = None
+    _logo_lock = threading.Lock()
+
+    def __init__(self, nombre, rut):
+        """
+        Constructor de la clase.
+
+        :param nombre: Nombre del parqueadero.
+        :param rut: Registro comercial del parqueadero.
+        """
+        self.nombre = nombre
+        self.rut = rut
+        self.registro_comercial = f'Registro comercial: {rut}'
+        from reportlab.lib.utils import simpleSplit
+
+        self.logo = self.obtener_logo()
+        self.lineas_condiciones = simpleSplit(CONDICIONES_SERVICIO, 'Helvetica', 7, TICKET_ANCHO - 20)
+
+    @classmethod
+    def obtener_logo(cls):
+        """
+        Lee y decodifica el logo una única vez por proceso.
+
+        :return: Imagen del logo.
+        """
+        from reportlab.lib.utils import ImageReader
+
+        with cls._logo_lock:
+            if cls._logo is None:
+                with open(LOGO_PATH, 'rb') as archivo:
+                    cls._logo = ImageReader(io.BytesIO(archivo.read()))
+                cls._logo.getRGBData()
+            return cls._logo
+
+    def dibujar(self, c, datos):
+        """
+        Dibuja un ticket en la página actual del lienzo.
+
+        :param c: Lienzo de ReportLab.
+        :param datos: Campos variables del ticket.
+        """
+        ancho, alto = TICKET_ANCHO, TICKET_ALTO
+
+        c.drawImage(self.logo, (ancho - 64) / 2, alto - 64, width=64, height=64, mask='auto')
+
+        c.setFont("Helvetica-Bold", 12)
+        c.drawCentredString(ancho / 2, alto - 85, self.nombre)
+
+        c.setFont("Helvetica", 9)
+        y_position = alto - 100
+
+        c.drawString(0.5 * cm, y_position, f"Registro Comercial: {self.registro_comercial}")
+        y_position -= INTERLINEADO
+        c.drawString(0.5 * cm, y_position, f"Fecha/Hora de Ingreso: {datos.fecha_ingreso.strftime('%Y-%m-%d %H:%M:%S')}")
+        y_position -= INTERLINEADO
+        c.drawString(0.5 * cm, y_position, f"Placa del Vehículo: {datos.placa}")
+
+        y_position -= INTERLINEADO * 1.5
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(0.5 * cm, y_position, "Detalles del Servicio")
+        y_position -= INTERLINEADO
+        c.setFont("Helvetica", 9)
+        c.drawString(0.5 * cm, y_position, f"Costo: ${datos.costo_servicio}")
+        y_position -= INTERLINEADO
+        c.drawString(0.5 * cm, y_position, f"Atendido por: {datos.atendido_por}")
+
+        self.dibujar_qr(c, datos)
+
+        y_position -= INTERLINEADO * 2
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(0.5 * cm, y_position, "Condiciones del Servicio:")
+        y_position -= INTERLINEADO
+
+        c.setFont("Helvetica", 7)
+        for linea in self.lineas_condiciones:
+            y_position -= 10
+            c.drawString(0.5 * cm, y_position, linea)
+
+    def payload_qr(self, datos):
+        """
+        Construye el contenido compacto del código QR.
+
+        El formato es `PQ1:<registro comercial>:<placa>:<AAAAMMDDHHMMSS>`, en mayúsculas para que el
+        código se codifique en modo alfanumérico y resulte de la menor versión posible.
+
+        :param datos: Campos variables del ticket.
+        :return: Contenido del código QR.
+        """
+        return f"PQ1:{self.rut}:{datos.placa}:{datos.fecha_ingreso.strftime('%Y%m%d%H%M%S')}".upper()
+
+    def dibujar_qr(self, c, datos):
+        """
+        Dibuja el código QR del ticket como módulos vectoriales, sin generar imágenes intermedias.
+
+        :param c: Lienzo de ReportLab.
+        :param datos: Campos variables del ticket.
+        """
+        import qrcode
+
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=0)
+        qr.add_data(self.payload_qr(datos))
+        qr.make(fit=True)
+        matriz = qr.get_matrix()
+
+        lado = 2 * cm
+        modulo = lado / len(matriz)
+        x_origen = TICKET_ANCHO - 2.5 * cm
+        y_origen = TICKET_ALTO - 11.5 * cm + lado
+
+        path = c.beginPath()
+        for fila, celdas in enumerate(matriz):
+            y = y_origen - (fila + 1) * modulo
+            inicio = None
+            for columna, oscuro in enumerate(celdas + [False]):
+                if oscuro and inicio is None:
+                    inicio = columna
+                elif not oscuro and inicio is not None:
+                    path.rect(x_origen + inicio * modulo, y, (columna - inicio) * modulo, modulo)
+                    inicio = None
+
+        c.drawPath(path, stroke=0, fill=1)
+
+
+class GeneradorTickets:
+    """
+    Genera los tickets en PDF reutilizando la plantilla cacheada de cada parqueadero.
+
+    Los tickets también pueden generarse en segundo plano con un pool de hilos; el PDF queda
+    cacheado por el identificador del parqueo hasta que se solicita.
+    """
+    def __init__(self, max_pdfs=256):
+        """
+        Constructor de la clase.
+
+        :param max_pdfs: Cantidad máxima de PDFs pregenerados que se conservan en memoria.
+        """
+        self._lock = threading.Lock()
+        self._plantillas = {}
+        self._pdfs = OrderedDict()
+        self._max_pdfs = max_pdfs
+        self._pool = None
+
+    def plantilla(self, parqueadero):
+        """
+        Obtiene la plantilla de un parqueadero, construyéndola si no existe o si sus datos cambiaron.
+
+        :param parqueadero: Parqueadero.
+        :return: Plantilla del ticket.
+        """
+        with self._lock:
+            plantilla = self._plantillas.get(parqueadero.id)
+
+            if plantilla is None or (plantilla.nombre, plantilla.rut) != (parqueadero.nombre, parqueadero.rut):
+                plantilla = PlantillaTicket(parqueadero.nombre, parqueadero.rut)
+                self._plantillas[parqueadero.id] = plantilla
+
+            return plantilla
+
+    def generar(self, parqueadero, datos):
+        """
+        Genera el PDF de un ticket.
+
+        :param parqueadero: Parqueadero que emite el ticket.
+        :param datos: Campos variables del ticket.
+        :return: Contenido del PDF.
+        """
+        return self.generar_lote(parqueadero, [datos])
+
+    def generar_lote(self, parqueadero, lista_datos):
+        """
+        Genera un único PDF con un ticket por página.
+
+        :param parqueadero: Parqueadero que emite los tickets.
+        :param lista_datos: Campos variables de cada ticket.
+        :return: Contenido del PDF.
+        """
+        return self._renderizar(self.plantilla(parqueadero), lista_datos)
+
+    def _renderizar(self, plantilla, lista_datos):
+        """
+        Dibuja los tickets sobre un lienzo nuevo.
+
+        :param plantilla: Plantilla del parqueadero.
+        :param lista_datos: Campos variables de cada ticket.
+        :return: Contenido del PDF.
+        """
+        from reportlab.pdfgen import canvas
+
+        pdf_buffer = io.BytesIO()
+        c = canvas.Canvas(pdf_buffer, pagesize=(TICKET_ANCHO, TICKET_ALTO))
+
+        for datos in lista_datos:
+            plantilla.dibujar(c, datos)
+            c.showPage()
+
+        c.save()
+
+        return pdf_buffer.getvalue()
+
+    def encolar(self, parqueo_id, parqueadero, datos, hilos=2):
+        """
+        Encola la generación del ticket de un parqueo en el pool de hilos.
+
+        :param parqueo_id: Identificador del parqueo.
+        :param parqueadero: Parqueadero que emite el ticket.
+        :param datos: Campos variables del ticket.
+        :param hilos: Cantidad de hilos del pool, usada solo al crearlo.
+        """
+        plantilla = self.plantilla(parqueadero)
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='tickets')
+
+            self._pdfs[parqueo_id] = self._pool.submit(self._renderizar, plantilla, [datos])
+
+            while len(self._pdfs) > self._max_pdfs:
+                self._pdfs.popitem(last=False)
+
+    def obtener(self, parqueo_id, timeout=5):
+        """
+        Recupera y retira de la caché el ticket pregenerado de un parqueo.
+
+        :param parqueo_id: Identificador del parqueo.
+        :param timeout: Segundos máximos de espera si el ticket aún se está generando.
+        :return: Contenido del PDF o None si no fue pregenerado.
+        """
+        with self._lock:
+            futuro = self._pdfs.pop(parqueo_id, None)
+
+        if futuro is None:
+            return None
+
+        try:
+            return futuro.result(timeout=timeout)
+        except Exception:
+            return None
+
+
+generador_tickets = GeneradorTickets()
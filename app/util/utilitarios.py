@@ -1,4 +1,5 @@
 import json
+import re
 from sqlalchemy.inspection import inspect
 from datetime import datetime
 
@@ -39,3 +40,18 @@ def to_json(instance):
     
     # Convert the dictionary to a JSON string
     return instance_dict
+
+
+def normalizar_placa(placa):
+    """
+    Normaliza una placa para compararla: mayúsculas y solo letras y números.
+
+    Así "abc123", "ABC-123" y "ABC 123" corresponden al mismo vehículo.
+
+    :param placa: Placa tal como se digitó.
+    :return: Placa normalizada, o None si no se indicó.
+    """
+    if placa is None:
+        return None
+
+    return re.sub(r'[^0-9A-Z]', '', placa.upper())
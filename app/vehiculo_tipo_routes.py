@@ -6,6 +6,7 @@ from app.models import Tarifa
 
 from app import db
 from app.routes import propietario_admin_permission
+from app.util.catalogos import catalogos
 from app.models import VehiculoTipo
 
 
@@ -33,8 +34,8 @@ class VehiculoTipoRoutes:
             """
             g.template_name = 'base.html'
             
-            tipos_vehiculo = VehiculoTipo.query.all()
-            tarifas = Tarifa.query.all()
+            tipos_vehiculo = catalogos.obtener(VehiculoTipo)
+            tarifas = catalogos.obtener(Tarifa)
             return render_template("vehiculo-tipo.html", titulo='Tipo de Vehículo', tipos_vehiculo=tipos_vehiculo, tarifas=tarifas)
 
         @self.blueprint.route('/vehiculo-tipo/<int:id>', methods=['DELETE'])
@@ -54,6 +55,7 @@ class VehiculoTipoRoutes:
 
                 db.session.delete(vehiculo_tipo)
                 db.session.commit()
+                catalogos.invalidar(VehiculoTipo)
 
                 return jsonify({'status': 'success', 'message': 'Tipo de vehículo eliminado'}), 200
 
@@ -77,6 +79,7 @@ class VehiculoTipoRoutes:
 
                 db.session.add(vehiculo_tipo)
                 db.session.commit()
+                catalogos.invalidar(VehiculoTipo)
 
                 return jsonify({'status': 'success', 'message': 'Tipo de vehículo creado', 'data': {
                     'id': vehiculo_tipo.id,
@@ -109,6 +112,7 @@ class VehiculoTipoRoutes:
                 vehiculo_tipo.updated_at = db.func.current_timestamp()
 
                 db.session.commit()
+                catalogos.invalidar(VehiculoTipo)
 
                 return jsonify({'status': 'success', 'message': 'Tipo de vehículo actualizado', 'data': {
                     'id': vehiculo_tipo.id,
@@ -0,0 +1,93 @@
+"""
+Mide el tiempo de arranque de un proceso de la aplicación y falla si retrocede.
+
+Cada repetición ejecuta `create_app()` en un intérprete nuevo con `python -X importtime`, así que se
+mide el arranque en frío de un worker. El script termina con código 1 si la mediana supera el
+límite o si al arrancar se importa alguno de los módulos que solo deben cargarse al generar el
+primer ticket.
+
+Uso:
+
+    python benchmarks/arranque.py [--repeticiones 5] [--limite-ms 1000] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencias de los tickets: no deben importarse hasta que se genera uno.
+MODULOS_DIFERIDOS = ('reportlab', 'qrcode', 'PIL')
+
+CODIGO = 'from app import create_app; create_app()'
+
+
+def medir_arranque():
+    """
+    Arranca la aplicación en un intérprete nuevo y lee el reporte de `-X importtime`.
+
+    :return: Tupla con el tiempo total en milisegundos y la lista de (módulo, acumulado en ms, profundidad).
+    """
+    directorio = tempfile.mkdtemp(prefix='benchmark_arranque_')
+    entorno = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(directorio, 'arranque.db'))
+    salida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CODIGO],
+        env=entorno, cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+
+    modulos = []
+    total = 0
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        profundidad = (len(nombre) - len(nombre.lstrip())) // 2
+        acumulado = int(acumulado) / 1000
+        if profundidad == 0:
+            total += acumulado
+        modulos.append((nombre.strip(), acumulado, profundidad))
+
+    return total, modulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--limite-ms', type=float, default=1000)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    tiempos = []
+    modulos = []
+    for _ in range(args.repeticiones):
+        total, modulos = medir_arranque()
+        tiempos.append(total)
+
+    mediana = statistics.median(tiempos)
+
+    print(f'Importación de la aplicación: mediana {mediana:.0f} ms, mínimo {min(tiempos):.0f} ms ({args.repeticiones} repeticiones)\n')
+    print(f"{'Módulo':<48}{'acumulado ms':>14}")
+    for nombre, acumulado, _ in sorted(modulos, key=lambda modulo: modulo[1], reverse=True)[:args.top]:
+        print(f'{nombre:<48}{acumulado:>14.1f}')
+
+    errores = []
+
+    diferidos = sorted({nombre for nombre, _, _ in modulos if nombre.split('.')[0] in MODULOS_DIFERIDOS})
+    if diferidos:
+        errores.append(f"Se importaron al arrancar módulos que deben cargarse con el primer ticket: {', '.join(diferidos)}")
+
+    if mediana > args.limite_ms:
+        errores.append(f'La mediana ({mediana:.0f} ms) supera el límite de {args.limite_ms:.0f} ms')
+
+    for error in errores:
+        print(f'\nERROR: {error}')
+
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Mide el rendimiento de escritura concurrente de la base de datos con cada configuración.
+
+Cada escenario se ejecuta en un proceso aparte que importa la aplicación con `APP_CONFIG` y
+`DATABASE_URL` propios, de modo que se miden el motor, el pool y los PRAGMA reales de la
+configuración. Varios hilos simulan las porterías: cada operación registra una fila y la actualiza
+en dos transacciones, como un ingreso seguido de un retiro.
+
+Uso:
+
+    python benchmarks/escrituras_bd.py [--hilos 8] [--operaciones 200]
+
+Para incluir PostgreSQL se define `BENCHMARK_POSTGRES_URL` con la URI de una base de datos de pruebas.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ejecutar_escenario(hilos, operaciones):
+    """
+    Ejecuta la carga de escritura con la aplicación configurada por las variables de entorno.
+
+    :param hilos: Cantidad de hilos concurrentes.
+    :param operaciones: Operaciones por hilo.
+    :return: Diccionario con los resultados.
+    """
+    sys.path.insert(0, RAIZ)
+
+    from sqlalchemy import Column, DateTime, Integer, MetaData, Table, func, insert, update
+    from sqlalchemy.exc import OperationalError
+
+    from app import create_app, db
+
+    app = create_app()
+
+    metadata = MetaData()
+    tabla = Table(
+        'benchmark_escritura', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('hilo', Integer, nullable=False),
+        Column('entrada', DateTime, nullable=False, server_default=func.current_timestamp()),
+        Column('salida', DateTime),
+    )
+
+    with app.app_context():
+        engine = db.engine
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+
+    latencias = []
+    errores = [0]
+    lock = threading.Lock()
+
+    def trabajar(hilo):
+        propias = []
+        fallidas = 0
+        for _ in range(operaciones):
+            inicio = time.perf_counter()
+            try:
+                with engine.begin() as conexion:
+                    fila_id = conexion.execute(insert(tabla).values(hilo=hilo)).inserted_primary_key[0]
+                with engine.begin() as conexion:
+                    conexion.execute(update(tabla).where(tabla.c.id == fila_id).values(salida=func.current_timestamp()))
+            except OperationalError:
+                fallidas += 1
+                continue
+            propias.append(time.perf_counter() - inicio)
+
+        with lock:
+            latencias.extend(propias)
+            errores[0] += fallidas
+
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=trabajar, args=(hilo,)) for hilo in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+
+    with app.app_context():
+        metadata.drop_all(engine)
+
+    return {
+        'operaciones': len(latencias),
+        'errores': errores[0],
+        'segundos': round(duracion, 2),
+        'ops_por_segundo': round(len(latencias) / duracion, 1),
+        'p50_ms': round(statistics.median(latencias) * 1000, 1) if latencias else None,
+        'p95_ms': round(latencias[int(len(latencias) * 0.95) - 1] * 1000, 1) if latencias else None,
+    }
+
+
+def escenarios():
+    """
+    Define los escenarios a medir.
+
+    :return: Lista de tuplas con el nombre, la configuración y la URI de la base de datos.
+    """
+    directorio = tempfile.mkdtemp(prefix='benchmark_bd_')
+    lista = [
+        ('SQLite (desarrollo)', 'development', 'sqlite:///' + os.path.join(directorio, 'desarrollo.db')),
+        ('SQLite WAL (producción)', 'production', 'sqlite:///' + os.path.join(directorio, 'produccion.db')),
+    ]
+
+    if os.environ.get('BENCHMARK_POSTGRES_URL'):
+        lista.append(('PostgreSQL (producción)', 'production', os.environ['BENCHMARK_POSTGRES_URL']))
+
+    return lista
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hilos', type=int, default=8)
+    parser.add_argument('--operaciones', type=int, default=200)
+    parser.add_argument('--escenario', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.escenario:
+        print(json.dumps(ejecutar_escenario(args.hilos, args.operaciones)))
+        return
+
+    print(f'{args.hilos} hilos x {args.operaciones} operaciones (ingreso + retiro)\n')
+    print(f"{'Escenario':<26}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errores':>10}")
+
+    for nombre, configuracion, uri in escenarios():
+        entorno = dict(os.environ, APP_CONFIG=configuracion, DATABASE_URL=uri, SECRET_KEY=os.environ.get('SECRET_KEY', 'benchmark'))
+        salida = subprocess.run(
+            [sys.executable, __file__, '--escenario', '--hilos', str(args.hilos), '--operaciones', str(args.operaciones)],
+            env=entorno, cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        print(f"{nombre:<26}{resultado['ops_por_segundo']:>10}{resultado['p50_ms']:>10}{resultado['p95_ms']:>10}{resultado['errores']:>10}")
+
+
+if __name__ == '__main__':
+    main()
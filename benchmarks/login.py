@@ -0,0 +1,116 @@
+"""
+Mide cuántos inicios de sesión por segundo atiende un núcleo con cada método de hash de contraseñas.
+
+Cada escenario se ejecuta en un proceso aparte con su propio `PASSWORD_METODO` y una base SQLite
+temporal con un usuario. Las peticiones se hacen en un solo hilo con el cliente de pruebas de
+Flask, así que el resultado equivale a lo que atiende un worker síncrono en un núcleo. Al final se
+mide también cuántos intentos por segundo rechaza el limitador una vez bloqueada la cuenta.
+
+Uso:
+
+    python benchmarks/login.py [--intentos 20] [--metodos scrypt:32768:8:1 scrypt:16384:8:1 pbkdf2:sha256]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+METODOS = ('scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256')
+
+EMAIL = 'benchmark@parqueadero.co'
+PASSWORD = 'benchmark123'
+
+
+def medir(cliente, cuerpo, intentos, estado):
+    """
+    Envía varios intentos de inicio de sesión y mide su latencia.
+
+    :param cliente: Cliente de pruebas de Flask sin cookies.
+    :param cuerpo: Cuerpo JSON de cada intento.
+    :param intentos: Cantidad de intentos.
+    :param estado: Código HTTP esperado.
+    :return: Diccionario con los intentos por segundo y la mediana en milisegundos.
+    """
+    latencias = []
+
+    for _ in range(intentos):
+        inicio = time.perf_counter()
+        respuesta = cliente.post('/login', json=cuerpo)
+        latencias.append(time.perf_counter() - inicio)
+        assert respuesta.status_code == estado, respuesta.get_data(as_text=True)
+
+    return {
+        'por_segundo': round(len(latencias) / sum(latencias), 1),
+        'p50_ms': round(statistics.median(latencias) * 1000, 1),
+    }
+
+
+def ejecutar_escenario(intentos):
+    """
+    Mide los inicios de sesión con la aplicación configurada por las variables de entorno.
+
+    :param intentos: Intentos por medición.
+    :return: Diccionario con los resultados.
+    """
+    sys.path.insert(0, RAIZ)
+
+    from app import create_app, db
+    from app.models import Usuario
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+
+    with app.app_context():
+        db.create_all()
+        usuario = Usuario(documento='1', nombres='Benchmark', apellidos='Login', telefono='0', email=EMAIL)
+        usuario.set_password(PASSWORD)
+        db.session.add(usuario)
+        db.session.commit()
+
+    cliente = app.test_client(use_cookies=False)
+    correctos = medir(cliente, {'email': EMAIL, 'password': PASSWORD}, intentos, 200)
+
+    for _ in range(app.config['LOGIN_INTENTOS_CUENTA']):
+        cliente.post('/login', json={'email': EMAIL, 'password': 'incorrecta'})
+    rechazados = medir(cliente, {'email': EMAIL, 'password': 'incorrecta'}, intentos, 429)
+
+    return {'correctos': correctos, 'rechazados': rechazados}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--intentos', type=int, default=20)
+    parser.add_argument('--metodos', nargs='+', default=list(METODOS))
+    parser.add_argument('--escenario', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.escenario:
+        print(json.dumps(ejecutar_escenario(args.intentos)))
+        return
+
+    print(f'{args.intentos} intentos por medición, 1 hilo\n')
+    print(f"{'Método':<24}{'logins/s':>10}{'p50 ms':>10}{'rechazos/s':>12}")
+
+    for metodo in args.metodos:
+        directorio = tempfile.mkdtemp(prefix='benchmark_login_')
+        entorno = dict(
+            os.environ, PASSWORD_METODO=metodo, SECRET_KEY=os.environ.get('SECRET_KEY', 'benchmark'),
+            DATABASE_URL='sqlite:///' + os.path.join(directorio, 'login.db')
+        )
+        salida = subprocess.run(
+            [sys.executable, __file__, '--escenario', '--intentos', str(args.intentos)],
+            env=entorno, cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+        resultado = json.loads(salida.stdout.strip().splitlines()[-1])
+        correctos, rechazados = resultado['correctos'], resultado['rechazados']
+        print(f"{metodo:<24}{correctos['por_segundo']:>10}{correctos['p50_ms']:>10}{rechazados['por_segundo']:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,76 @@ import os
 
 base_dir = os.path.abspath(os.path.dirname(__file__))
 
+
+def opciones_motor(uri):
+    """
+    Construye las opciones del motor de SQLAlchemy según la base de datos configurada.
+
+    Para PostgreSQL se usa un pool de conexiones configurable por variables de entorno; para
+    SQLite se fija el tiempo de espera del controlador ante bloqueos de escritura.
+
+    :param uri: URI de conexión a la base de datos.
+    :return: Diccionario para `SQLALCHEMY_ENGINE_OPTIONS`.
+    """
+    if uri.startswith('postgresql'):
+        return {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        }
+
+    if uri.startswith('sqlite'):
+        return {
+            'connect_args': {'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)) / 1000},
+        }
+
+    return {}
+
+
 class ConfigDevelopment:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'my-extremely-secret-key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///' + os.path.join(base_dir, 'app.db')
+    SQLITE_PRAGMAS = {}
+    TICKETS_HILOS = int(os.environ.get('TICKETS_HILOS', 2))
+    CATALOGOS_TTL = int(os.environ.get('CATALOGOS_TTL', 300))
+    USUARIOS_TTL = int(os.environ.get('USUARIOS_TTL', 60))
+    EVENTOS_BACKEND = os.environ.get('EVENTOS_BACKEND')
+    EVENTOS_LATIDO = int(os.environ.get('EVENTOS_LATIDO', 15))
+    ARRENDAMIENTOS_RECARGA = int(os.environ.get('ARRENDAMIENTOS_RECARGA', 300))
+    PRONOSTICOS_TTL = int(os.environ.get('PRONOSTICOS_TTL', 300))
+    OCUPACION_TTL = int(os.environ.get('OCUPACION_TTL', 30))
+    PLACAS_TTL = int(os.environ.get('PLACAS_TTL', 60))
+    PUNTOS_VALOR = int(os.environ.get('PUNTOS_VALOR', 1000))
+    PASSWORD_METODO = os.environ.get('PASSWORD_METODO', 'scrypt:16384:8:1')
+    LOGIN_INTENTOS_IP = int(os.environ.get('LOGIN_INTENTOS_IP', 30))
+    LOGIN_INTENTOS_CUENTA = int(os.environ.get('LOGIN_INTENTOS_CUENTA', 10))
+    LOGIN_VENTANA = int(os.environ.get('LOGIN_VENTANA', 300))
+
+
+class ConfigProduction(ConfigDevelopment):
+    SECRET_KEY = os.environ.get('SECRET_KEY')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///' + os.path.join(base_dir, 'app.db')
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_motor(SQLALCHEMY_DATABASE_URI)
+    # Se aplican a cada conexión nueva del pool cuando la base de datos es SQLite.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    }
+
+
+configuraciones = {
+    'development': ConfigDevelopment,
+    'production': ConfigProduction,
+}
+
+
+def obtener_configuracion():
+    """
+    Selecciona la clase de configuración a partir de la variable de entorno `APP_CONFIG`.
+
+    :return: Clase de configuración; por defecto, la de desarrollo.
+    """
+    return configuraciones[os.environ.get('APP_CONFIG', 'development')]